@@ -1,72 +1,115 @@
-import os
-from langgraph.graph import StateGraph, START, END
-from typing import List, TypedDict, Annotated
-from langchain_core.messages import BaseMessage, HumanMessage, AIMessage
-from langchain_groq import ChatGroq
-from langgraph.graph.message import add_messages
-from langgraph.checkpoint.memory import MemorySaver
-from dotenv import load_dotenv
-
-load_dotenv()
-
-GROQ_API_KEY = os.getenv("GROQ_API_KEY")
-
-llm = ChatGroq(model="llama-3.3-70b-versatile", temperature=0.2, api_key=GROQ_API_KEY)
-
-class ChatBot(TypedDict):
-    messages: Annotated[List[BaseMessage], add_messages]
-    
-    
-def chat_node(state: ChatBot) -> ChatBot:
-    messages = state["messages"]
-    
-    response = llm.invoke(messages)
-    
-    return {
-        "messages": [response]
-    }
-
-checkpointer = MemorySaver()
-graph = StateGraph(ChatBot)
-
-graph.add_node('chat_node', chat_node)
-
-graph.add_edge(START, 'chat_node')
-graph.add_edge('chat_node', END)
-
-app = graph.compile(checkpointer=checkpointer)
-
-thread_id = '1'
-
-while True:
-    user_input = input("You: ")
-    
-    print("You entered:", user_input)
-    print("Processing...")
-    print("Bot is typing...")
-    
-    if user_input.strip().lower() in ['exit', 'quit', 'bye']:
-        print("Exiting chat. Goodbye!")
-        break
-    
-    config = {
-        'configurable': {
-            'thread_id': thread_id
-        }
-    }
-    
-    result = app.invoke({
-        "messages": [HumanMessage(content=user_input)]
-    }, config=config)
-    
-    print("Bot:", result['messages'][-1].content)
-    print("-" * 50)
-    print(app.get_state(config=config))
-
-
-
-
-    
-
-    
-    
+import os
+import sys
+import asyncio
+from pathlib import Path
+from langgraph.graph import StateGraph, START, END
+from typing import List, TypedDict, Annotated
+from langchain_core.messages import BaseMessage, HumanMessage, AIMessage
+from langgraph.graph.message import add_messages
+from langgraph.checkpoint.memory import MemorySaver
+from dotenv import load_dotenv
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from utils.llm import get_llm
+from utils.history import make_summarize_node, with_summary
+from utils.response_cache import ResponseCache
+
+load_dotenv()
+
+GROQ_API_KEY = os.getenv("GROQ_API_KEY")
+
+llm = get_llm(model="llama-3.3-70b-versatile", temperature=0.2, api_key=GROQ_API_KEY)
+
+response_cache = ResponseCache()
+
+class ChatBot(TypedDict):
+    messages: Annotated[List[BaseMessage], add_messages]
+    summary: str
+    
+    
+async def chat_node(state: ChatBot) -> ChatBot:
+    messages = with_summary(state["messages"], state.get("summary", ""))
+    
+    # ainvoke keeps the event loop free; the "messages" stream mode still
+    # picks up every token through the callback system
+    response = await response_cache.ainvoke(llm, messages)
+    
+    return {
+        "messages": [response]
+    }
+
+checkpointer = MemorySaver()
+graph = StateGraph(ChatBot)
+
+graph.add_node('summarize_history', make_summarize_node(llm))
+graph.add_node('chat_node', chat_node)
+
+graph.add_edge(START, 'summarize_history')
+graph.add_edge('summarize_history', 'chat_node')
+graph.add_edge('chat_node', END)
+
+app = graph.compile(checkpointer=checkpointer)
+
+thread_id = '1'
+
+EXIT_COMMANDS = ['exit', 'quit', 'bye']
+STATE_COMMAND = '/state'
+CACHE_COMMAND = '/cache'
+
+
+async def stream_reply(user_input: str, config: dict) -> str:
+    '''
+    Streams the bot's reply token by token and returns the full text.
+    '''
+    reply = ""
+    async for message_chunk, metadata in app.astream(
+        {"messages": [HumanMessage(content=user_input)]},
+        config=config,
+        stream_mode="messages",
+    ):
+        # Only print assistant tokens coming out of chat_node
+        if message_chunk.content and metadata["langgraph_node"] == "chat_node":
+            print(message_chunk.content, end="", flush=True)
+            reply += message_chunk.content
+    print()
+    return reply
+
+
+async def main():
+    config = {
+        'configurable': {
+            'thread_id': thread_id
+        }
+    }
+
+    print(f"Type '{STATE_COMMAND}' to dump the current state, '{CACHE_COMMAND}' for cache stats, or 'exit' to quit.")
+
+    while True:
+        # input() blocks, so read stdin on a worker thread
+        user_input = await asyncio.to_thread(input, "You: ")
+        command = user_input.strip().lower()
+
+        if command in EXIT_COMMANDS:
+            print("Exiting chat. Goodbye!")
+            break
+
+        if command == STATE_COMMAND:
+            print(await app.aget_state(config=config))
+            print("-" * 50)
+            continue
+
+        if command == CACHE_COMMAND:
+            print(response_cache.stats())
+            print("-" * 50)
+            continue
+
+        if not command:
+            continue
+
+        print("Bot: ", end="", flush=True)
+        await stream_reply(user_input, config)
+        print("-" * 50)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
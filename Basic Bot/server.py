@@ -0,0 +1,176 @@
+# ============================================================
+# Multi-Session Chat Server — ChatBot graph over HTTP/WebSocket
+# ============================================================
+# `chatbot.py` serves one user through `input()`. This server
+# hosts the SAME compiled graph for many `thread_id`s at once:
+#
+#   POST /chat/{thread_id}   {"message": "..."} → {"reply": "..."}
+#   WS   /ws/{thread_id}     send text → receive tokens, then {"type": "end"}
+#   GET  /threads/{thread_id}  → messages + summary from the checkpointer
+#   GET  /health             → concurrency / backpressure counters
+#
+# How load is handled:
+#   - Per-thread lock       → two requests on the same thread_id run
+#                             one after another, so they never race
+#                             on the same checkpoint.
+#   - Global semaphore      → at most MAX_CONCURRENCY graph runs are
+#                             talking to the LLM at the same time.
+#   - Bounded admission     → once MAX_PENDING requests are in flight
+#                             (running + waiting) new ones are rejected
+#                             with 503 + Retry-After instead of piling
+#                             up until the LLM times out.
+#
+# Run:
+#   uvicorn server:api --app-dir "Basic Bot" --port 8000
+# ============================================================
+
+import asyncio
+import os
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
+from langchain_core.messages import HumanMessage
+from pydantic import BaseModel
+
+from chatbot import app as chat_app
+
+MAX_CONCURRENCY = int(os.getenv("CHAT_MAX_CONCURRENCY", "8"))
+MAX_PENDING = int(os.getenv("CHAT_MAX_PENDING", "64"))
+RETRY_AFTER_SECONDS = 1
+
+
+class ServerBusy(Exception):
+    '''
+    Raised when the server is already holding MAX_PENDING requests.
+    '''
+
+
+class ChatService:
+    '''
+    Drives one compiled chat graph for many threads concurrently.
+    '''
+
+    def __init__(self, graph_app, max_concurrency: int = MAX_CONCURRENCY, max_pending: int = MAX_PENDING):
+        self.app = graph_app
+        self.max_pending = max_pending
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.thread_locks = {}     # thread_id -> [lock, number of users]
+        self.pending = 0
+        self.running = 0
+        self.completed = 0
+        self.rejected = 0
+
+    @asynccontextmanager
+    async def session(self, thread_id: str):
+        '''
+        Admission control + per-thread serialization + global concurrency limit.
+        '''
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise ServerBusy()
+
+        self.pending += 1
+        entry = self.thread_locks.setdefault(thread_id, [asyncio.Lock(), 0])
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                async with self.semaphore:
+                    self.running += 1
+                    try:
+                        yield {'configurable': {'thread_id': thread_id}}
+                    finally:
+                        self.running -= 1
+            self.completed += 1
+        finally:
+            self.pending -= 1
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self.thread_locks[thread_id]
+
+    async def chat(self, thread_id: str, message: str) -> str:
+        async with self.session(thread_id) as config:
+            result = await self.app.ainvoke({"messages": [HumanMessage(content=message)]}, config=config)
+        return result["messages"][-1].content
+
+    async def stream(self, thread_id: str, message: str):
+        '''
+        Async generator yielding the reply token by token.
+        '''
+        async with self.session(thread_id) as config:
+            async for message_chunk, metadata in self.app.astream(
+                {"messages": [HumanMessage(content=message)]},
+                config=config,
+                stream_mode="messages",
+            ):
+                if message_chunk.content and metadata["langgraph_node"] == "chat_node":
+                    yield message_chunk.content
+
+    async def history(self, thread_id: str) -> dict:
+        state = await self.app.aget_state({'configurable': {'thread_id': thread_id}})
+        return {
+            "messages": [{"role": m.type, "content": m.content} for m in state.values.get("messages", [])],
+            "summary": state.values.get("summary", ""),
+        }
+
+    def stats(self) -> dict:
+        return {
+            "running": self.running,
+            "pending": self.pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "active_threads": len(self.thread_locks),
+        }
+
+
+class ChatRequest(BaseModel):
+    message: str
+
+
+def create_api(service: ChatService) -> FastAPI:
+    '''
+    Builds the FastAPI app around a ChatService (pass a fake-LLM graph in tests).
+    '''
+    api = FastAPI(title="LangGraph Chat Server")
+
+    @api.post("/chat/{thread_id}")
+    async def chat(thread_id: str, request: ChatRequest):
+        try:
+            reply = await service.chat(thread_id, request.message)
+        except ServerBusy:
+            raise HTTPException(status_code=503, detail="Server busy, retry later",
+                                headers={"Retry-After": str(RETRY_AFTER_SECONDS)})
+        return {"thread_id": thread_id, "reply": reply}
+
+    @api.websocket("/ws/{thread_id}")
+    async def chat_ws(websocket: WebSocket, thread_id: str):
+        await websocket.accept()
+        try:
+            while True:
+                message = await websocket.receive_text()
+                try:
+                    async for token in service.stream(thread_id, message):
+                        await websocket.send_json({"type": "token", "content": token})
+                    await websocket.send_json({"type": "end"})
+                except ServerBusy:
+                    await websocket.send_json({"type": "busy", "retry_after": RETRY_AFTER_SECONDS})
+        except WebSocketDisconnect:
+            pass
+
+    @api.get("/threads/{thread_id}")
+    async def thread_history(thread_id: str):
+        return await service.history(thread_id)
+
+    @api.get("/health")
+    async def health():
+        return service.stats()
+
+    return api
+
+
+api = create_api(ChatService(chat_app))
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run(api, host="127.0.0.1", port=int(os.getenv("PORT", "8000")))
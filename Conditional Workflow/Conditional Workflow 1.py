@@ -19,17 +19,22 @@
 
 from typing import TypedDict
 from langgraph.graph import StateGraph, START, END
-from langchain_groq import ChatGroq
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from utils.llm import get_llm
+from voter_ids import default_index, format_voter_id
 from dotenv import load_dotenv
 import os
 
 load_dotenv()
 
-llm = ChatGroq(model_name="llama-3.3-70b-versatile", temperature=0.2, api_key=os.getenv("GROQ_API_KEY"))
+llm = get_llm(model_name="llama-3.3-70b-versatile", temperature=0.2, api_key=os.getenv("GROQ_API_KEY"))
 
 
 # --- State Definition ---
 class VoterState(TypedDict):
+    record_id: int       # Unique electoral roll record (voter IDs are keyed on it)
     name: str
     age: int
     is_citizen: bool
@@ -129,9 +134,9 @@ def reject_criminal(state: VoterState):
 def approve_voter(state: VoterState):
     """
     Approval Node: Voter has passed all checks.
-    A voter ID is generated and the voter is approved.
+    A voter ID is allocated (stable across runs, see voter_ids.py) and the voter is approved.
     """
-    voter_id = f"VOTE-2026-{abs(hash(state['name'])) % 100000:05d}"
+    voter_id = format_voter_id(default_index().assign(state['record_id']))
     print(f"✅ No criminal record found")
     print(f"\n🎉 APPROVED! {state['name']} is eligible to vote!")
     print(f"   Voter ID: {voter_id}")
@@ -238,6 +243,7 @@ app = graph.compile()
 
 
 result1 = app.invoke({
+    "record_id": 1,
     "name": "Shafi Amirulla",
     "age": 25,
     "is_citizen": True,
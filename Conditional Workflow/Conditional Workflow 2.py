@@ -1,14 +1,18 @@
 from typing import TypedDict, Literal
 from langgraph.graph import StateGraph, START, END
 from pydantic import BaseModel, Field
-from langchain_groq import ChatGroq
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from utils.llm import get_llm
+from utils.cascade import Cascade, LexicalSentimentClassifier
 from langchain_core.messages import SystemMessage, HumanMessage
 from dotenv import load_dotenv
 import os
 
 load_dotenv()
 
-llm = ChatGroq(model_name="llama-3.3-70b-versatile", temperature=0.2, api_key=os.getenv("GROQ_API_KEY"))
+llm = get_llm(model_name="llama-3.3-70b-versatile", temperature=0.2, api_key=os.getenv("GROQ_API_KEY"))
 
 class SentimentSchema(BaseModel):
     sentiment: Literal['positive', 'negative', 'neutral'] = Field(description="Sentiment of the report")
@@ -41,6 +45,11 @@ def find_sentiment(state: ReviewState):
     
     return {"sentiment": response.sentiment}
 
+# Cheap-first: a local lexical classifier decides clear-cut reports; the
+# structured LLM call above only runs when its confidence is below the
+# threshold (CASCADE_THRESHOLD, default 0.75)
+sentiment_cascade = Cascade(LexicalSentimentClassifier(), find_sentiment, key="sentiment")
+
 def check_sentiment(state: ReviewState):
     if state['sentiment'] == 'positive':
         return "positive_report"
@@ -98,7 +107,7 @@ def negative_report(state: ReviewState):
     return {"response": response.content}
 
 graph = StateGraph(ReviewState)
-graph.add_node("find_sentiment", find_sentiment)
+graph.add_node("find_sentiment", sentiment_cascade)
 graph.add_node("positive_report", positive_report)
 graph.add_node("run_diagnosis", run_diagnosis)
 graph.add_node("neutral_report", neutral_report)
@@ -122,4 +131,5 @@ app = graph.compile()
 response = app.invoke({"review": report})
 print(response['response'])
 print(response['diagnosis'])
+print(sentiment_cascade.stats())
 
@@ -0,0 +1,147 @@
+# ============================================================
+# Conditional Workflow — Early Routing Benchmark
+# ============================================================
+# How much sooner can a conditional edge fire if the structured
+# reply is parsed while it streams (utils/early_route.py)?
+#
+# 1. Route latency per schema / route field: seconds until the
+#    route field is parsed vs until the whole object is. The gain
+#    is the time spent generating the fields AFTER the route field,
+#    so field order in the schema matters.
+#
+#      sentiment   SentimentSchema (one field, only the closing "}")
+#      issue_type  DiagnosisSchema, first field
+#      urgency     DiagnosisSchema, last field
+#      evaluation  Evaluation from Iterative Workflow 1.py, followed
+#                  by a free-text `feedback`
+#
+# 2. A tweet-review graph run both ways (plain structured node vs
+#    EarlyRoute):
+#
+#      START → evaluate →(approved)          publish → collect → END
+#                        (needs_improvement) optimize → END
+#
+#    `publish` does not read the feedback, so it runs while the
+#    feedback is still streaming; `collect` / `optimize` are
+#    join() nodes that merge it into state.
+#
+# Usage:
+#   LLM_BACKEND=fake python "Conditional Workflow/early_routing.py" --calls 20
+# ============================================================
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Literal, Optional, TypedDict
+
+from langchain_core.messages import HumanMessage
+from langgraph.graph import StateGraph, START, END
+from pydantic import BaseModel, Field
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from utils.early_route import EarlyRoute
+from report_graph import DiagnosisSchema, SentimentSchema, diagnosis_prompt, llm, sentiment_messages
+from sentiment_cascade import synthetic_reports
+
+
+class Evaluation(BaseModel):
+    evaluation: Literal["approved", "needs_improvement"] = Field(..., description="Evaluation of the tweet")
+    feedback: str = Field(..., description="Feedback on the tweet")
+
+
+class TweetState(TypedDict):
+    tweet: str
+    evaluation: Literal["approved", "needs_improvement"]
+    feedback: str
+    response: str
+    pending: Optional[str]
+
+
+def evaluation_messages(state: TweetState):
+    return [HumanMessage(content=f"Evaluate this tweet, approved or needs_improvement, with feedback: {state['tweet']}")]
+
+
+def route_latency(calls: int):
+    reports = [review for review, _ in synthetic_reports(calls)]
+    cases = {
+        "sentiment": (SentimentSchema, lambda s: sentiment_messages(s["review"])),
+        "issue_type": (DiagnosisSchema, lambda s: diagnosis_prompt(s["review"])),
+        "urgency": (DiagnosisSchema, lambda s: diagnosis_prompt(s["review"])),
+        "evaluation": (Evaluation, lambda s: evaluation_messages({"tweet": s["review"]})),
+    }
+    print(f"{'route field':>12} | {'route (s)':>9} | {'complete (s)':>12} | saved")
+    print("-" * 50)
+    for field, (schema, build_input) in cases.items():
+        node = EarlyRoute(llm, schema, build_input, route_on=(field,))
+        for review in reports:
+            node.rest(node({"review": review}))
+        time.sleep(0.1)  # let the last background stream finish
+        stats = node.stats()
+        saved = 100 * stats["saved_per_call_s"] / stats["complete_s"]
+        print(f"{field:>12} | {stats['route_s']:>9.3f} | {stats['complete_s']:>12.3f} | {saved:>4.0f}%")
+
+
+def build_tweet_graph(early: bool):
+    '''
+    Returns (app, EarlyRoute or None).
+    '''
+    structured_llm = llm.with_structured_output(schema=Evaluation)
+    evaluator = EarlyRoute(llm, Evaluation, evaluation_messages, route_on=("evaluation",)) if early else None
+
+    def evaluate(state: TweetState):
+        return structured_llm.invoke(evaluation_messages(state)).model_dump()
+
+    def publish(state: TweetState):
+        return {"response": llm.invoke(f"Write a one-line announcement for this tweet: {state['tweet']}").content}
+
+    def optimize(state: TweetState):
+        return {"response": llm.invoke(f"Improve the tweet using this feedback: {state['feedback']}\n\n"
+                                       f"{state['tweet']}").content}
+
+    def collect(state: TweetState):
+        return {}
+
+    graph = StateGraph(TweetState)
+    graph.add_node("evaluate", evaluator if early else evaluate)
+    graph.add_node("publish", publish)
+    graph.add_node("collect", evaluator.join() if early else collect)
+    graph.add_node("optimize", evaluator.join(optimize) if early else optimize)
+    graph.add_edge(START, "evaluate")
+    graph.add_conditional_edges("evaluate", lambda state: state["evaluation"],
+                                {"approved": "publish", "needs_improvement": "optimize"})
+    graph.add_edge("publish", "collect")
+    graph.add_edge("collect", END)
+    graph.add_edge("optimize", END)
+    return graph.compile(), evaluator
+
+
+def graph_latency(calls: int):
+    tweets = [f"Tweet #{i}: my code works and I have no idea why" for i in range(calls)]
+    timings = {}
+    for early in (False, True):
+        app, evaluator = build_tweet_graph(early)
+        per_route = {"approved": [], "needs_improvement": []}
+        for tweet in tweets:
+            start = time.perf_counter()
+            result = app.invoke({"tweet": tweet})
+            per_route[result["evaluation"]].append(time.perf_counter() - start)
+            assert result["feedback"] and not result.get("pending"), result
+        timings["early" if early else "plain"] = per_route
+    print(f"\n{'route':>18} | {'runs':>4} | {'plain (s)':>9} | {'early (s)':>9}")
+    print("-" * 50)
+    for route in ("approved", "needs_improvement"):
+        plain, early = timings["plain"][route], timings["early"][route]
+        if plain:
+            print(f"{route:>18} | {len(plain):>4} | {sum(plain) / len(plain):>9.3f} | {sum(early) / len(early):>9.3f}")
+    print(json.dumps(evaluator.stats(), indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Route latency with incremental structured-output parsing")
+    parser.add_argument("--calls", type=int, default=20)
+    args = parser.parse_args()
+
+    route_latency(args.calls)
+    graph_latency(args.calls)
@@ -0,0 +1,68 @@
+# ============================================================
+# Conditional Workflow — Fast Path vs app.invoke
+# ============================================================
+# Compiles the pure-Python graphs of this repo into flat decision
+# functions with utils/fast_path.py, checks them against
+# `app.invoke` on every route, and reports invocations/sec:
+#
+#   voter      → voter_graph.py        (3 routers, 8 nodes)
+#   quadratic  → quadratic_pipeline.py (discriminant router)
+#   bmi        → bmi_batch.py row graph (2 sequential nodes)
+#
+# Usage:
+#   python "Conditional Workflow/fast_path_bench.py"
+#   python "Conditional Workflow/fast_path_bench.py" --graphs voter --seconds 3
+# ============================================================
+
+import argparse
+import random
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+sys.path.append(str(ROOT / "Sequential Workflow"))
+from utils.fast_path import benchmark_fast_path, compile_fast_path, verify_fast_path
+
+
+def voter_cases(n: int, rng: random.Random):
+    from voter_graph import app
+    from voter_ids import VoterIdIndex, use_index
+    use_index(VoterIdIndex(":memory:"))   # keep the synthetic voters out of voter_ids.db
+    cases = [{"record_id": i, "name": f"Voter {i}", "age": rng.randint(10, 90), "is_citizen": rng.random() < 0.8,
+              "has_criminal_record": rng.random() < 0.1} for i in range(n)]
+    return app, cases
+
+
+def quadratic_cases(n: int, rng: random.Random):
+    from quadratic_pipeline import app
+    cases = [{"a": rng.choice([-3, -2, -1, 1, 2, 3]), "b": rng.randint(-10, 10), "c": rng.randint(-10, 10)}
+             for _ in range(n)]
+    return app, cases
+
+
+def bmi_cases(n: int, rng: random.Random):
+    from bmi_batch import build_row_graph
+    cases = [{"weight": rng.uniform(40, 120), "height": rng.uniform(1.4, 2.0)} for _ in range(n)]
+    return build_row_graph(), cases
+
+
+GRAPHS = {"voter": voter_cases, "quadratic": quadratic_cases, "bmi": bmi_cases}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark compiled fast paths against app.invoke")
+    parser.add_argument("--graphs", nargs="+", choices=list(GRAPHS), default=list(GRAPHS))
+    parser.add_argument("--cases", type=int, default=500, help="random inputs per graph")
+    parser.add_argument("--seconds", type=float, default=1.0, help="minimum timing per side")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    print(f"{'graph':>10} | {'verified':>8} | {'app.invoke /s':>13} | {'fast path /s':>12} | {'speedup':>7}")
+    print("-" * 64)
+    for name in args.graphs:
+        app, cases = GRAPHS[name](args.cases, rng)
+        fast = compile_fast_path(app)
+        checked = verify_fast_path(app, fast, cases)
+        r = benchmark_fast_path(app, fast, cases, args.seconds)
+        print(f"{name:>10} | {checked:>8} | {r['invoke_per_s']:>13,.0f} | {r['fast_per_s']:>12,.0f} | {r['speedup']:>6.0f}x")
@@ -0,0 +1,192 @@
+# ============================================================
+# Conditional Workflow — Vectorized Quadratic Solver
+# ============================================================
+# `Conditional Workflow.py` solves ONE equation per `app.invoke()`
+# and routes it with `check_d` to real_roots / repeated_roots /
+# no_real_roots. For millions of equations the state carries
+# NumPy coefficient arrays instead, and the three-way routing
+# becomes three boolean MASKS over the discriminant:
+#
+#   d > 0   → real      x = (-b ± √d) / 2a
+#   d == 0  → repeated  x = -b / 2a           (x1 == x2)
+#   d < 0   → complex   x = -b / 2a ± i·√-d / 2a
+#   a == 0  → not quadratic (roots are NaN)
+#
+# Every row gets BOTH roots as complex128 (`root1`, `root2`);
+# real roots simply have a zero imaginary part, so nothing is
+# reduced to the string "not real". `branch` holds the route code
+# per row and `branch_counts` how many rows took each route.
+#
+# Flow (one superstep per node, no matter how many rows):
+#   START → calculate_d → partition_d → solve_roots → END
+#
+# Benchmark (looping app.invoke vs one batched invoke):
+#   python "Conditional Workflow/quadratic_batch.py" --sizes 1000 100000 1000000
+# ============================================================
+
+import argparse
+import re
+import time
+from typing import Any, TypedDict
+
+import numpy as np
+from langgraph.graph import StateGraph, START, END
+
+# Route codes, in the order of the original graph's branches
+BRANCHES = np.array(["real_roots", "repeated_roots", "no_real_roots", "not_quadratic"])
+REAL, REPEATED, COMPLEX, NOT_QUADRATIC = range(4)
+
+
+class QBatchState(TypedDict):
+    a: Any               # np.ndarray coefficients
+    b: Any
+    c: Any
+    d: Any               # np.ndarray discriminants
+    branch: Any          # np.ndarray[uint8], index into BRANCHES
+    branch_counts: dict  # {"real_roots": n, ...}
+    root1: Any           # np.ndarray[complex128]
+    root2: Any           # np.ndarray[complex128]
+
+
+def calculate_d(state: QBatchState) -> dict:
+    '''
+    d = b² - 4ac for every equation at once.
+    '''
+    a, b, c = (np.asarray(state[k]) for k in "abc")
+    return {"d": b * b - 4 * a * c}
+
+
+def partition_d(state: QBatchState) -> dict:
+    '''
+    The `check_d` router as masks: one route code per row instead of one edge.
+    '''
+    d = state["d"]
+    branch = np.full(d.shape, COMPLEX, dtype=np.uint8)
+    branch[d > 0] = REAL
+    branch[d == 0] = REPEATED
+    branch[np.asarray(state["a"]) == 0] = NOT_QUADRATIC
+    counts = np.bincount(branch, minlength=len(BRANCHES))
+    return {"branch": branch, "branch_counts": dict(zip(BRANCHES.tolist(), counts.tolist()))}
+
+
+def solve_roots(state: QBatchState) -> dict:
+    '''
+    Fills both roots for each partition using only that partition's rows.
+    '''
+    a = np.asarray(state["a"], dtype=np.float64)
+    b = np.asarray(state["b"], dtype=np.float64)
+    d = np.asarray(state["d"], dtype=np.float64)
+    branch = state["branch"]
+    root1 = np.full(d.shape, np.nan, dtype=np.complex128)
+    root2 = np.full(d.shape, np.nan, dtype=np.complex128)
+
+    real = branch == REAL
+    sqrt_d = np.sqrt(d[real])
+    root1[real] = (-b[real] + sqrt_d) / (2 * a[real])
+    root2[real] = (-b[real] - sqrt_d) / (2 * a[real])
+
+    repeated = branch == REPEATED
+    root1[repeated] = root2[repeated] = -b[repeated] / (2 * a[repeated])
+
+    cplx = branch == COMPLEX
+    real_part = -b[cplx] / (2 * a[cplx])
+    imag_part = np.sqrt(-d[cplx]) / (2 * np.abs(a[cplx]))
+    root1[cplx] = real_part + 1j * imag_part
+    root2[cplx] = real_part - 1j * imag_part
+
+    return {"root1": root1, "root2": root2}
+
+
+def build_batch_graph():
+    graph = StateGraph(QBatchState)
+    graph.add_node("calculate_d", calculate_d)
+    graph.add_node("partition_d", partition_d)
+    graph.add_node("solve_roots", solve_roots)
+    graph.add_edge(START, "calculate_d")
+    graph.add_edge("calculate_d", "partition_d")
+    graph.add_edge("partition_d", "solve_roots")
+    graph.add_edge("solve_roots", END)
+    return graph.compile()
+
+
+batch_app = build_batch_graph()
+
+
+def solve_quadratics(a, b, c) -> dict:
+    '''
+    Batch entry point: coefficient arrays (or lists) of equal length.
+    '''
+    return batch_app.invoke({"a": a, "b": b, "c": c})
+
+
+def branch_labels(codes) -> np.ndarray:
+    return BRANCHES[codes]
+
+
+# ============================================================
+# BENCHMARK — against the per-equation graph
+# ============================================================
+
+NUMBER = re.compile(r"-?\d+(?:\.\d+)?(?:e[-+]?\d+)?|nan|-?inf")
+
+
+def make_equations(n: int, seed: int = 0):
+    '''
+    Small integer coefficients (a != 0), so all three branches occur.
+    '''
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, 6, n) * rng.choice([-1, 1], n)
+    b = rng.integers(-10, 11, n)
+    c = rng.integers(-10, 11, n)
+    return a, b, c
+
+
+def check_row(row: dict, result: dict, i: int):
+    '''
+    Asserts the batched answer for row `i` matches the per-equation graph.
+    '''
+    branch = BRANCHES[result["branch"][i]]
+    if branch == "no_real_roots":
+        assert row["result"] == "The roots are not real"
+        return
+    expected = [float(x) for x in NUMBER.findall(row["result"])]
+    got = [result["root1"][i].real] if branch == "repeated_roots" else [result["root1"][i].real, result["root2"][i].real]
+    assert np.allclose(expected, got), (row, got)
+
+
+def benchmark(sizes, row_sample: int):
+    '''
+    Looping `app.invoke` is timed on at most `row_sample` equations and
+    extrapolated, because 10^6 invokes take several minutes.
+    '''
+    from quadratic_pipeline import app as row_app
+
+    print(f"{'equations':>10} | {'loop invoke (s)':>17} | {'batched invoke (s)':>18} | {'speedup':>9} | branches")
+    print("-" * 100)
+
+    for n in sizes:
+        a, b, c = make_equations(n)
+
+        start = time.perf_counter()
+        result = solve_quadratics(a, b, c)
+        batched = time.perf_counter() - start
+
+        sample = min(n, row_sample)
+        start = time.perf_counter()
+        for i in range(sample):
+            row = row_app.invoke({"a": int(a[i]), "b": int(b[i]), "c": int(c[i])})
+            check_row(row, result, i)
+        looped = (time.perf_counter() - start) * n / sample
+
+        note = "" if sample == n else " (est.)"
+        print(f"{n:>10,} | {looped:>10.3f}{note:>7} | {batched:>18.4f} | {looped / batched:>8.0f}x | {result['branch_counts']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark looped vs batched quadratic solving")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10**3, 10**4, 10**5, 10**6])
+    parser.add_argument("--row-sample", type=int, default=2000,
+                        help="max equations to push through app.invoke before extrapolating")
+    args = parser.parse_args()
+
+    benchmark(args.sizes, args.row_sample)
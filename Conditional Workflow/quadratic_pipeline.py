@@ -0,0 +1,99 @@
+# ============================================================
+# Conditional Workflow — Chunked Quadratic Solver Pipeline
+# ============================================================
+# Runs the quadratic `QState` graph from `Conditional Workflow.py`
+# (show_equation → calculate_d → real / repeated / no_real roots)
+# over a CSV / Parquet / .npy file with `a`, `b`, `c` columns,
+# using the shared chunked driver in utils/chunked_pipeline.py.
+#
+# The graph is per-row, so each chunk goes through `app.batch()`.
+#
+# Usage:
+#   python "Conditional Workflow/quadratic_pipeline.py" equations.csv roots.csv
+# ============================================================
+
+import argparse
+import sys
+from pathlib import Path
+from typing import TypedDict
+
+from langgraph.graph import StateGraph, START, END
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from utils.chunked_pipeline import graph_batch_processor, run_pipeline
+
+
+class QState(TypedDict):
+    a: int
+    b: int
+    c: int
+    equation: str
+    d: float
+    result: str
+
+
+def show_equation(state: QState):
+    return {"equation": f"{state['a']}x^2 + {state['b']}x + {state['c']}"}
+
+
+def calculate_d(state: QState):
+    return {"d": state['b']**2 - 4*state['a']*state['c']}
+
+
+def real_roots(state: QState):
+    x1 = (-state['b'] + state['d']**0.5) / (2*state['a'])
+    x2 = (-state['b'] - state['d']**0.5) / (2*state['a'])
+    return {"result": f"The roots are {x1} and {x2}"}
+
+
+def repeated_roots(state: QState):
+    x = -state['b'] / (2*state['a'])
+    return {"result": f"The root is {x}"}
+
+
+def no_real_roots(state: QState):
+    return {"result": "The roots are not real"}
+
+
+def check_d(state: QState):
+    if state['d'] > 0:
+        return "real_roots"
+    elif state['d'] == 0:
+        return "repeated_roots"
+    else:
+        return "no_real_roots"
+
+
+graph = StateGraph(QState)
+graph.add_node("show_equation", show_equation)
+graph.add_node("calculate_d", calculate_d)
+graph.add_node("real_roots", real_roots)
+graph.add_node("repeated_roots", repeated_roots)
+graph.add_node("no_real_roots", no_real_roots)
+
+graph.add_edge(START, "show_equation")
+graph.add_edge("show_equation", "calculate_d")
+graph.add_conditional_edges("calculate_d", check_d, ["real_roots", "repeated_roots", "no_real_roots"])
+graph.add_edge("real_roots", END)
+graph.add_edge("repeated_roots", END)
+graph.add_edge("no_real_roots", END)
+
+app = graph.compile()
+
+INPUT_COLUMNS = ['a', 'b', 'c']
+OUTPUT_COLUMNS = ['d', 'result']
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Chunked quadratic solving for large coefficient files")
+    parser.add_argument("input")
+    parser.add_argument("output")
+    parser.add_argument("--chunk-rows", type=int, default=10_000)
+    parser.add_argument("--mmap", action="store_true", help="memory-map the input file")
+    parser.add_argument("--no-resume", action="store_true", help="start over instead of resuming")
+    args = parser.parse_args()
+
+    stats = run_pipeline(args.input, args.output, graph_batch_processor(app, INPUT_COLUMNS, OUTPUT_COLUMNS),
+                         INPUT_COLUMNS, chunk_rows=args.chunk_rows, mmap_input=args.mmap,
+                         resume=not args.no_resume)
+    print(stats)
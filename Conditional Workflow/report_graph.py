@@ -0,0 +1,242 @@
+# ============================================================
+# Conditional Workflow — Medical Report Graph (importable)
+# ============================================================
+# The same graph as `Conditional Workflow 2.py` without the example
+# run, so batch and benchmark tools can import it:
+#
+#   from report_graph import app, baseline_app, speculative_app, sentiment_cascade
+#
+#   app           find_sentiment behind the cheap-first cascade
+#                 (utils/cascade.py): the structured LLM call only
+#                 runs when the local classifier is unsure
+#   baseline_app  find_sentiment always calls the LLM
+#   async_app     `app` with async nodes (same flow, use `ainvoke`)
+#   speculative_app  (async, opt-in) run_diagnosis starts at the
+#                 same time as find_sentiment (utils/speculation.py);
+#                 negative reports skip the run_diagnosis hop,
+#                 other reports cancel / discard the speculation
+#
+# In every variant the LLM find_sentiment streams its structured
+# reply and routes as soon as `sentiment` is parsed
+# (utils/early_route.py).
+#
+# Flow:
+#   START → find_sentiment →
+#       (positive) → positive_report → END
+#       (negative) → run_diagnosis → negative_report → END
+#       (neutral)  → neutral_report → END
+#
+# Speculative flow (use `await speculative_app.ainvoke(...)`):
+#   START → find_sentiment ∥ run_diagnosis →
+#       (negative, diagnosis ready) → negative_report → END
+#       (positive / neutral)        → positive_report / neutral_report → END
+# ============================================================
+
+import os
+import sys
+from pathlib import Path
+from typing import Literal, TypedDict
+
+from langchain_core.messages import HumanMessage, SystemMessage
+from langgraph.graph import StateGraph, START, END
+from pydantic import BaseModel, Field
+from dotenv import load_dotenv
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from utils.cascade import Cascade, LexicalSentimentClassifier
+from utils.early_route import EarlyRoute
+from utils.speculation import Speculate
+from utils.llm import get_llm
+
+load_dotenv()
+
+llm = get_llm(model_name="llama-3.3-70b-versatile", temperature=0.2, api_key=os.getenv("GROQ_API_KEY"))
+
+
+class SentimentSchema(BaseModel):
+    sentiment: Literal['positive', 'negative', 'neutral'] = Field(description="Sentiment of the report")
+
+
+class DiagnosisSchema(BaseModel):
+    issue_type: Literal['acute', 'chronic', 'acute_chronic', 'other'] = Field(description="Type of issue")
+    tone: Literal['angry', 'happy', 'sad', 'neutral'] = Field(description="Emotion of the report")
+    urgency: Literal['low', 'medium', 'high'] = Field(description="Urgency of the report")
+
+
+diagnosis_structred_llm = llm.with_structured_output(schema=DiagnosisSchema)
+
+
+class ReviewState(TypedDict):
+    review: str
+    sentiment: Literal['positive', 'negative', 'neutral']
+    diagnosis: dict
+    response: str
+
+
+# --- Prompts (same wording as Conditional Workflow 2.py) ---
+
+def sentiment_messages(review: str):
+    return [
+        SystemMessage(content="You are a expert in medical field and you have to classify the sentiment of the following report"),
+        HumanMessage(content=f"Classify the sentiment of the following report: {review}")
+    ]
+
+
+def diagnosis_prompt(review: str) -> str:
+    return f'''
+        write a diagnosis for this report:
+        \n\n
+        {review}
+        Return the issue_type, tone and urgency.
+    '''
+
+
+def positive_prompt(review: str) -> str:
+    return f'''
+        write a warm thank you message in response to this report:
+        \n\n
+        {review}. Give healthy lifestyle recommendations in a simple and easy to understand way.
+    '''
+
+
+def neutral_prompt(review: str) -> str:
+    return f'''
+        write a neutral message in response to this report:
+        \n\n
+        {review}
+    '''
+
+
+def negative_prompt(review: str, diagnosis: dict) -> str:
+    return f'''
+        write a negative message in response to this report. Suggest medications and lifestyle changes.
+        \n\n
+        {review}
+        the user had a {diagnosis['issue_type']} issue.
+        the user is feeling {diagnosis['tone']}.
+        the user is {diagnosis['urgency']}.
+
+        Write an empathetic message to the user.
+    '''
+
+
+# --- Nodes ---
+
+def sentiment_input(state: ReviewState):
+    return sentiment_messages(state['review'])
+
+
+# Streams the structured reply and returns as soon as `sentiment` is
+# parsed, instead of after the whole object (utils/early_route.py)
+early_sentiment = EarlyRoute(llm, SentimentSchema, sentiment_input, route_on=("sentiment",))
+
+
+def find_sentiment(state: ReviewState):
+    return early_sentiment(state)
+
+
+def check_sentiment(state: ReviewState):
+    if state['sentiment'] == 'positive':
+        return "positive_report"
+    elif state['sentiment'] == 'negative':
+        return "run_diagnosis"
+    else:
+        return "neutral_report"
+
+
+def positive_report(state: ReviewState):
+    return {"response": llm.invoke(positive_prompt(state['review'])).content}
+
+
+def run_diagnosis(state: ReviewState):
+    return {"diagnosis": diagnosis_structred_llm.invoke(diagnosis_prompt(state['review'])).model_dump()}
+
+
+def neutral_report(state: ReviewState):
+    return {"response": llm.invoke(neutral_prompt(state['review'])).content}
+
+
+def negative_report(state: ReviewState):
+    return {"response": llm.invoke(negative_prompt(state['review'], state['diagnosis'])).content}
+
+
+# --- Async nodes (same prompts) for the speculative graph ---
+
+async def afind_sentiment(state: ReviewState):
+    return await early_sentiment.acall(state)
+
+
+async def apositive_report(state: ReviewState):
+    return {"response": (await llm.ainvoke(positive_prompt(state['review']))).content}
+
+
+async def arun_diagnosis(state: ReviewState):
+    return {"diagnosis": (await diagnosis_structred_llm.ainvoke(diagnosis_prompt(state['review']))).model_dump()}
+
+
+async def aneutral_report(state: ReviewState):
+    return {"response": (await llm.ainvoke(neutral_prompt(state['review']))).content}
+
+
+async def anegative_report(state: ReviewState):
+    return {"response": (await llm.ainvoke(negative_prompt(state['review'], state['diagnosis']))).content}
+
+
+def check_sentiment_speculative(state: ReviewState):
+    '''
+    Like check_sentiment, but skips run_diagnosis when the speculation already ran it.
+    '''
+    route = check_sentiment(state)
+    if route == "run_diagnosis" and state.get('diagnosis'):
+        return "negative_report"
+    return route
+
+
+sentiment_cascade = Cascade(LexicalSentimentClassifier(), find_sentiment, key="sentiment",
+                            allm_node=afind_sentiment)
+speculative_diagnosis = Speculate(sentiment_cascade.acall, arun_diagnosis,
+                                  use_if=lambda result: result["sentiment"] == "negative")
+
+
+def build_graph(cascade: bool = True, speculative: bool = False, asynchronous: bool = False):
+    '''
+    `speculative=True` (or `asynchronous=True`) builds the async graph; run it with `ainvoke`.
+    '''
+    graph = StateGraph(ReviewState)
+    if speculative or asynchronous:
+        if speculative and cascade:
+            graph.add_node("find_sentiment", speculative_diagnosis)
+        elif speculative:
+            graph.add_node("find_sentiment", Speculate(afind_sentiment, arun_diagnosis,
+                                                       use_if=speculative_diagnosis.use_if))
+        else:
+            graph.add_node("find_sentiment", sentiment_cascade.acall if cascade else afind_sentiment)
+        graph.add_node("positive_report", apositive_report)
+        graph.add_node("run_diagnosis", arun_diagnosis)
+        graph.add_node("neutral_report", aneutral_report)
+        graph.add_node("negative_report", anegative_report)
+    else:
+        graph.add_node("find_sentiment", sentiment_cascade if cascade else find_sentiment)
+        graph.add_node("positive_report", positive_report)
+        graph.add_node("run_diagnosis", run_diagnosis)
+        graph.add_node("neutral_report", neutral_report)
+        graph.add_node("negative_report", negative_report)
+
+    graph.add_edge(START, "find_sentiment")
+    graph.add_conditional_edges("find_sentiment", check_sentiment_speculative if speculative else check_sentiment, {
+        'positive_report': 'positive_report',
+        'run_diagnosis': 'run_diagnosis',
+        'neutral_report': 'neutral_report',
+        **({'negative_report': 'negative_report'} if speculative else {})
+    })
+    graph.add_edge("positive_report", END)
+    graph.add_edge("run_diagnosis", "negative_report")
+    graph.add_edge("negative_report", END)
+    graph.add_edge("neutral_report", END)
+    return graph.compile()
+
+
+app = build_graph(cascade=True)
+baseline_app = build_graph(cascade=False)
+async_app = build_graph(cascade=True, asynchronous=True)
+speculative_app = build_graph(cascade=True, speculative=True)
@@ -0,0 +1,252 @@
+# ============================================================
+# Conditional Workflow — Batch Report Triage
+# ============================================================
+# `Conditional Workflow 2.py` runs the sentiment / diagnosis graph
+# on ONE hard-coded report. This command streams a whole directory
+# (one report per .txt / .md file) or a JSONL file through the same
+# graph (`report_graph.async_app`):
+#
+#   reports ─→ [bounded queue] ─→ N async workers ─→ graph.ainvoke
+#                                                        │
+#     output JSONL ←─ writer ←─ [priority queue: urgency] ┘
+#
+#   - At most `--concurrency` reports are in flight, and the input
+#     is read lazily, so a directory of any size works.
+#   - Finished reports go through a priority queue before they are
+#     written. High-urgency diagnoses are written at once; the
+#     others are held for up to `--window` seconds and written
+#     most urgent first (medium, low, then non-negative reports).
+#   - Every `--checkpoint-every` records the output is fsync'ed and
+#     `<output>.progress` records its size. After an interruption
+#     the output is truncated back to that size and every report
+#     already in it is skipped. Reports recorded with an "error"
+#     are retried, and their old error lines are dropped.
+#
+# Report: reports/sec, mean latency, failures, and the per-branch
+# distribution (sentiment, and urgency for negative reports).
+#
+# Usage:
+#   LLM_BACKEND=fake python "Conditional Workflow/report_triage.py" --demo 500 --output triage.jsonl
+#   python "Conditional Workflow/report_triage.py" reports/ --output triage.jsonl --concurrency 4
+#   python "Conditional Workflow/report_triage.py" reports.jsonl --output triage.jsonl   # resumes if interrupted
+# ============================================================
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Iterator, Optional, Tuple
+
+from report_graph import async_app, build_graph
+from sentiment_cascade import synthetic_reports
+
+URGENCY_RANK = {"high": 0, "medium": 1, "low": 2}
+REPORT_SUFFIXES = (".txt", ".md")
+
+_DONE = object()
+
+
+# ============================================================
+# INPUT — yields (report id, report text)
+# ============================================================
+
+def read_reports(source: str) -> Iterator[Tuple[str, str]]:
+    '''
+    A directory (one report per file, id = relative path) or a JSONL / text file.
+    '''
+    path = Path(source)
+    if path.is_dir():
+        for file in sorted(p for p in path.rglob("*") if p.suffix in REPORT_SUFFIXES):
+            yield str(file.relative_to(path)), file.read_text()
+        return
+    with open(path) as f:
+        for n, line in enumerate(f):
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line) if line.startswith("{") else {"review": line}
+            yield str(record.get("id", f"line-{n}")), record.get("review") or record["report"]
+
+
+def demo_reports(n: int) -> Iterator[Tuple[str, str]]:
+    for i, (review, _) in enumerate(synthetic_reports(n)):
+        yield f"demo-{i}", review
+
+
+# ============================================================
+# CHECKPOINT — output size in <output>.progress
+# ============================================================
+
+def progress_path(output: str) -> str:
+    return output + ".progress"
+
+
+def load_progress(output: str) -> Optional[set]:
+    '''
+    Truncates the output to the last checkpoint and drops error records; returns the ids of
+    the reports that succeeded (None: fresh run).
+    '''
+    if not os.path.exists(output) or not os.path.exists(progress_path(output)):
+        return None
+    with open(progress_path(output)) as f:
+        size = json.load(f)["output_bytes"]
+    with open(output, "rb") as f:
+        lines = [line for line in f.read(size).splitlines(keepends=True) if line.strip()]
+    records = [json.loads(line) for line in lines]
+    kept = [line for line, record in zip(lines, records) if "error" not in record]
+    # Rewrite without the failed reports so their retries don't leave duplicate ids
+    tmp = output + ".tmp"
+    with open(tmp, "wb") as f:
+        f.writelines(kept)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, output)
+    # The checkpoint must match the rewritten file, or the next resume cuts a record in half
+    write_progress(output, sum(len(line) for line in kept), len(kept))
+    return {record["id"] for record in records if "error" not in record}
+
+
+def write_progress(output: str, output_bytes: int, written: int):
+    tmp = progress_path(output) + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump({"output_bytes": output_bytes, "written": written}, f)
+    os.replace(tmp, progress_path(output))
+
+
+def save_progress(output: str, out, written: int):
+    out.flush()
+    os.fsync(out.fileno())
+    write_progress(output, out.tell(), written)
+
+
+def priority(result: dict) -> int:
+    diagnosis = result.get("diagnosis") or {}
+    return URGENCY_RANK.get(diagnosis.get("urgency"), len(URGENCY_RANK))
+
+
+# ============================================================
+# RUNNER
+# ============================================================
+
+async def triage(reports, output: str, graph=async_app, concurrency: int = 8, window: float = 1.0,
+                 checkpoint_every: int = 20, verbose: bool = True) -> dict:
+    '''
+    Runs every report through `graph`; appends results to `output` (JSONL), most urgent first.
+    '''
+    done_ids = load_progress(output)
+    out = open(output, "w" if done_ids is None else "a")
+    done_ids = done_ids or set()
+    queue = asyncio.Queue(maxsize=concurrency * 2)
+    results = asyncio.PriorityQueue()
+    branches, urgency = Counter(), Counter()
+    latencies, failed, written, sequence = [], 0, len(done_ids), 0
+
+    async def worker():
+        nonlocal failed, sequence
+        while True:
+            item = await queue.get()
+            if item is _DONE:
+                return
+            report_id, review, enqueued_at = item
+            record = {"id": report_id}
+            try:
+                result = await graph.ainvoke({"review": review})
+                record.update(sentiment=result["sentiment"], diagnosis=result.get("diagnosis"),
+                              response=result.get("response"))
+                branches[result["sentiment"]] += 1
+                if record["diagnosis"]:
+                    urgency[record["diagnosis"]["urgency"]] += 1
+            except Exception as e:
+                failed += 1
+                record["error"] = f"{type(e).__name__}: {e}"
+            latency = time.perf_counter() - enqueued_at
+            latencies.append(latency)
+            record["latency_s"] = round(latency, 3)
+            sequence += 1
+            await results.put((priority(record), sequence, record))
+
+    def write(record: dict):
+        nonlocal written
+        out.write(json.dumps(record) + "\n")
+        written += 1
+        if written % checkpoint_every == 0:
+            save_progress(output, out, written)
+        if verbose and written % 100 == 0:
+            print(f"  {written} written · {len(latencies) / (time.perf_counter() - start):.2f} reports/s")
+
+    async def writer():
+        held, deadline, finished = [], 0.0, False
+        while not finished:
+            timeout = max(0.0, deadline - time.perf_counter()) if held else None
+            try:
+                items = [await asyncio.wait_for(results.get(), timeout)]
+            except asyncio.TimeoutError:
+                items = []
+            while not results.empty():
+                items.append(results.get_nowait())
+            for rank, seq, record in items:
+                if record is _DONE:
+                    finished = True
+                elif rank == 0:
+                    write(record)
+                else:
+                    if not held:
+                        deadline = time.perf_counter() + window
+                    held.append((rank, seq, record))
+            if held and (finished or time.perf_counter() >= deadline):
+                for _, _, record in sorted(held, key=lambda item: item[:2]):
+                    write(record)
+                held.clear()
+
+    start = time.perf_counter()
+    workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+    writer_task = asyncio.create_task(writer())
+    skipped = total = 0
+    for report_id, review in reports:
+        if report_id in done_ids:
+            skipped += 1
+            continue
+        await queue.put((report_id, review, time.perf_counter()))
+        total += 1
+    for _ in workers:
+        await queue.put(_DONE)
+    await asyncio.gather(*workers)
+    await results.put((len(URGENCY_RANK) + 1, sequence + 1, _DONE))
+    await writer_task
+    save_progress(output, out, written)
+    out.close()
+    elapsed = time.perf_counter() - start
+
+    return {
+        "reports": total,
+        "skipped_resumed": skipped,
+        "failed": failed,
+        "written": written,
+        "seconds": round(elapsed, 3),
+        "reports_per_s": round(total / elapsed, 2) if elapsed else 0.0,
+        "mean_latency_s": round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+        "sentiment": dict(branches),
+        "urgency": dict(urgency),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Batch triage of medical reports through the sentiment/diagnosis graph")
+    parser.add_argument("source", nargs="?", help="directory of .txt/.md reports, or a JSONL / text file")
+    parser.add_argument("--demo", type=int, help="generate N synthetic reports instead of reading a source")
+    parser.add_argument("--output", default="triage.jsonl", help="JSONL output, one result per report")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--window", type=float, default=1.0, help="seconds non-urgent results may be held")
+    parser.add_argument("--checkpoint-every", type=int, default=20)
+    parser.add_argument("--no-cascade", action="store_true", help="always call the LLM for sentiment")
+    args = parser.parse_args()
+    if not args.source and not args.demo:
+        parser.error("give a source directory / file or --demo N")
+
+    reports = demo_reports(args.demo) if args.demo else read_reports(args.source)
+    graph = build_graph(cascade=False, asynchronous=True) if args.no_cascade else async_app
+    report = asyncio.run(triage(reports, args.output, graph, args.concurrency, args.window, args.checkpoint_every))
+    print(json.dumps(report, indent=2))
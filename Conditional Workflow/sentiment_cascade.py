@@ -0,0 +1,110 @@
+# ============================================================
+# Conditional Workflow — Cascade Sentiment Evaluation
+# ============================================================
+# Measures the cheap-first cascade in front of `find_sentiment`
+# (utils/cascade.py, wired into report_graph.py) on a batch of
+# reports:
+#
+#   baseline  every report → structured LLM call
+#   cascade   local lexical classifier; LLM only below --threshold
+#
+# Reported: escalation rate, agreement between the local label and
+# the LLM (escalations + --audit-rate sample), local accuracy on
+# the labelled synthetic reports, and first-hop latency both ways.
+#
+# Usage:
+#   LLM_BACKEND=fake python "Conditional Workflow/sentiment_cascade.py" --reports 300
+#   python "Conditional Workflow/sentiment_cascade.py" --reports-file reports.jsonl --threshold 0.8 --audit-rate 0.1
+# ============================================================
+
+import argparse
+import json
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from report_graph import find_sentiment, sentiment_cascade
+
+NEGATIVE_FINDINGS = [
+    "persistent chest pain and shortness of breath", "a malignant lesion in the left lung",
+    "acute kidney failure with elevated creatinine", "severe pneumonia with high fever",
+    "a displaced fracture of the right femur with swelling", "worsening heart failure",
+    "elevated blood sugar and blood pressure; hypertensive and pre-diabetic",
+]
+POSITIVE_FINDINGS = [
+    "all blood values within normal limits", "a healthy heart with normal ECG",
+    "no abnormalities detected on the CT scan", "blood pressure well-controlled and stable",
+    "the infection has resolved and the patient has recovered", "excellent lung function, chest clear",
+]
+NEUTRAL_FINDINGS = [
+    "a request for a copy of previous records", "a scheduled follow-up to review medication timing",
+    "mild pain in the knee but otherwise improving", "a vaccination appointment",
+]
+
+
+def synthetic_reports(n: int, seed: int = 0):
+    '''
+    (report, label) pairs: mostly clear-cut, some mixed or non-clinical.
+    '''
+    rng = random.Random(seed)
+    reports = []
+    for i in range(n):
+        label = rng.choices(["negative", "positive", "neutral"], weights=[0.45, 0.4, 0.15])[0]
+        findings = {"negative": NEGATIVE_FINDINGS, "positive": POSITIVE_FINDINGS, "neutral": NEUTRAL_FINDINGS}[label]
+        picked = rng.sample(findings, k=min(2, len(findings)))
+        reports.append((f"Patient #{i}, age {rng.randint(18, 90)}. Examination showed {picked[0]}. "
+                        f"Notes: {picked[1]}.", label))
+    return reports
+
+
+def read_reports(path: str):
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                record = json.loads(line) if line.startswith("{") else {"review": line}
+                yield record["review"], record.get("label")
+
+
+def timed(fn, reports, workers: int):
+    def one(review):
+        start = time.perf_counter()
+        fn({"review": review})
+        return time.perf_counter() - start
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        latencies = list(pool.map(one, [r for r, _ in reports]))
+    return time.perf_counter() - start, sum(latencies) / len(latencies)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Evaluate the cascade in front of find_sentiment")
+    parser.add_argument("--reports", type=int, default=200, help="number of synthetic reports")
+    parser.add_argument("--reports-file", help="text / JSONL file of reports (JSONL may carry a 'label')")
+    parser.add_argument("--threshold", type=float, default=sentiment_cascade.threshold)
+    parser.add_argument("--audit-rate", type=float, default=sentiment_cascade.audit_rate)
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    reports = list(read_reports(args.reports_file)) if args.reports_file else synthetic_reports(args.reports)
+    sentiment_cascade.threshold = args.threshold
+    sentiment_cascade.audit_rate = args.audit_rate
+
+    labelled = [(r, l) for r, l in reports if l]
+    if labelled:
+        hits = confident = 0
+        for review, label in labelled:
+            guess, confidence = sentiment_cascade.classifier(review)
+            if confidence >= args.threshold:
+                confident += 1
+                hits += guess == label
+        print(f"local classifier: {confident}/{len(labelled)} confident, "
+              f"accuracy on those {hits / confident if confident else 0:.1%}")
+
+    base_total, base_mean = timed(find_sentiment, reports, args.workers)
+    casc_total, casc_mean = timed(sentiment_cascade, reports, args.workers)
+    print(f"baseline first hop: mean {base_mean * 1000:.1f} ms · {len(reports)} reports in {base_total:.2f}s")
+    print(f"cascade first hop:  mean {casc_mean * 1000:.1f} ms · {len(reports)} reports in {casc_total:.2f}s "
+          f"({100 * (1 - casc_mean / base_mean):.0f}% lower)")
+    print(json.dumps(sentiment_cascade.stats(), indent=2))
@@ -0,0 +1,79 @@
+# ============================================================
+# Conditional Workflow — Speculative Diagnosis Benchmark
+# ============================================================
+# Negative reports pay three LLM round trips in a row:
+#
+#   find_sentiment → run_diagnosis → negative_report
+#
+# `report_graph.speculative_app` starts run_diagnosis together with
+# find_sentiment (utils/speculation.py). Negative reports then go
+# straight to negative_report; for the others the speculative call
+# is cancelled (counted as wasted if it had already started).
+#
+# This script runs the same reports through `report_graph.async_app`
+# (sequential) and `report_graph.speculative_app`, and reports the
+# mean latency per sentiment, wasted calls and latency saved.
+#
+# `--escalate-all` forces every report past the local cascade, so
+# the sentiment hop is always an LLM call (the worst case).
+#
+# Usage:
+#   LLM_BACKEND=fake python "Conditional Workflow/speculative_diagnosis.py" --reports 60 --escalate-all
+# ============================================================
+
+import argparse
+import asyncio
+import json
+import time
+from collections import defaultdict
+
+from report_graph import async_app, sentiment_cascade, speculative_app, speculative_diagnosis
+from sentiment_cascade import synthetic_reports
+
+
+async def run_all(graph, reports, concurrency: int):
+    '''
+    Returns {sentiment: [latency, ...]} for every report.
+    '''
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = defaultdict(list)
+
+    async def one(review):
+        async with semaphore:
+            start = time.perf_counter()
+            result = await graph.ainvoke({"review": review})
+            latencies[result["sentiment"]].append(time.perf_counter() - start)
+
+    await asyncio.gather(*(one(review) for review, _ in reports))
+    return latencies
+
+
+def mean(values):
+    return sum(values) / len(values) if values else 0.0
+
+
+async def main(args):
+    if args.escalate_all:
+        sentiment_cascade.threshold = 1.01
+    reports = synthetic_reports(args.reports)
+
+    sequential = await run_all(async_app, reports, args.concurrency)
+    speculative = await run_all(speculative_app, reports, args.concurrency)
+
+    print(f"{'sentiment':>10} | {'reports':>7} | {'sequential (s)':>14} | {'speculative (s)':>15} | saved")
+    print("-" * 66)
+    for label in ("negative", "positive", "neutral"):
+        seq, spec = mean(sequential[label]), mean(speculative[label])
+        saved = f"{100 * (1 - spec / seq):>4.0f}%" if seq else "  -"
+        print(f"{label:>10} | {len(speculative[label]):>7} | {seq:>14.3f} | {spec:>15.3f} | {saved}")
+    print(json.dumps(speculative_diagnosis.stats(), indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sequential vs speculative run_diagnosis")
+    parser.add_argument("--reports", type=int, default=60)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--escalate-all", action="store_true", help="always call the LLM for sentiment")
+    args = parser.parse_args()
+
+    asyncio.run(main(args))
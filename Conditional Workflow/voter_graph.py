@@ -0,0 +1,123 @@
+# ============================================================
+# Conditional Workflow — Voter Eligibility Graph (importable)
+# ============================================================
+# The same graph as `Conditional Workflow 1.py` without the prints
+# and the example run, so batch tools can import it. Voter IDs come
+# from the persisted allocator in voter_ids.py (VOTER_ID_DB):
+#
+#   from voter_graph import app, VoterState
+#
+# Flow:
+#   START → collect_info → verify_age →
+#       (if age < 18)         → reject_underage → END
+#       (if age >= 18)        → verify_citizenship →
+#           (if not citizen)  → reject_non_citizen → END
+#           (if citizen)      → verify_criminal_record →
+#               (if criminal) → reject_criminal → END
+#               (if clean)    → approve_voter → END
+# ============================================================
+
+from typing import TypedDict
+
+from langgraph.graph import StateGraph, START, END
+
+from voter_ids import default_index, format_voter_id
+
+
+class VoterState(TypedDict):
+    record_id: int       # Unique electoral roll record (voter IDs are keyed on it)
+    name: str
+    age: int
+    is_citizen: bool
+    has_criminal_record: bool
+    status: str          # "pending", "approved", "rejected"
+    reason: str          # Reason for approval or rejection
+    voter_id: str        # Voter ID (assigned if approved)
+
+
+# --- Nodes ---
+
+def collect_info(state: VoterState):
+    return {"status": "pending"}
+
+
+def verify_age(state: VoterState):
+    return {}
+
+
+def reject_underage(state: VoterState):
+    years_left = 18 - state['age']
+    return {
+        "status": "rejected",
+        "reason": f"Underage — must be at least 18 years old. Currently {state['age']}, need to wait {years_left} more year(s).",
+        "voter_id": "N/A"
+    }
+
+
+def verify_citizenship(state: VoterState):
+    return {}
+
+
+def reject_non_citizen(state: VoterState):
+    return {
+        "status": "rejected",
+        "reason": "Not an Indian citizen — only Indian citizens can vote in Indian elections.",
+        "voter_id": "N/A"
+    }
+
+
+def verify_criminal_record(state: VoterState):
+    return {}
+
+
+def reject_criminal(state: VoterState):
+    return {
+        "status": "rejected",
+        "reason": "Has a criminal record — voters with criminal convictions are disqualified.",
+        "voter_id": "N/A"
+    }
+
+
+def approve_voter(state: VoterState):
+    return {
+        "status": "approved",
+        "reason": "All eligibility criteria met — age, citizenship, and clean record verified.",
+        "voter_id": format_voter_id(default_index().assign(state['record_id']))
+    }
+
+
+# --- Routers ---
+
+def check_age(state: VoterState):
+    return "verify_citizenship" if state['age'] >= 18 else "reject_underage"
+
+
+def check_citizenship(state: VoterState):
+    return "verify_criminal_record" if state['is_citizen'] else "reject_non_citizen"
+
+
+def check_criminal_record(state: VoterState):
+    return "approve_voter" if not state['has_criminal_record'] else "reject_criminal"
+
+
+graph = StateGraph(VoterState)
+graph.add_node("collect_info", collect_info)
+graph.add_node("verify_age", verify_age)
+graph.add_node("reject_underage", reject_underage)
+graph.add_node("verify_citizenship", verify_citizenship)
+graph.add_node("reject_non_citizen", reject_non_citizen)
+graph.add_node("verify_criminal_record", verify_criminal_record)
+graph.add_node("reject_criminal", reject_criminal)
+graph.add_node("approve_voter", approve_voter)
+
+graph.add_edge(START, "collect_info")
+graph.add_edge("collect_info", "verify_age")
+graph.add_conditional_edges("verify_age", check_age, ["verify_citizenship", "reject_underage"])
+graph.add_conditional_edges("verify_citizenship", check_citizenship, ["verify_criminal_record", "reject_non_citizen"])
+graph.add_conditional_edges("verify_criminal_record", check_criminal_record, ["approve_voter", "reject_criminal"])
+graph.add_edge("reject_underage", END)
+graph.add_edge("reject_non_citizen", END)
+graph.add_edge("reject_criminal", END)
+graph.add_edge("approve_voter", END)
+
+app = graph.compile()
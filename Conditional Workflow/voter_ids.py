@@ -0,0 +1,216 @@
+# ============================================================
+# Conditional Workflow — Deterministic Voter ID Allocation
+# ============================================================
+# `approve_voter` used to build IDs as
+#
+#   VOTE-2026-{abs(hash(name)) % 100000:05d}
+#
+# which breaks at scale:
+#   - `hash()` of a str depends on PYTHONHASHSEED, so every process
+#     (and every run) gives a different ID for the same voter.
+#   - 100,000 slots: by the birthday bound two voters share an ID
+#     after only a few hundred approvals.
+#   - it is keyed on the NAME, so two voters with the same name
+#     would get the same ID however many slots there are.
+#
+# IDs are keyed on the roll's unique `record_id` (an integer in
+# [0, 10^12)) and come from a keyed PERMUTATION of that range:
+#
+#   number = 4-round Feistel network over the two base-10^6 halves
+#            of record_id, round keys derived from VOTER_ID_KEY
+#            → same in every process and every run
+#            → a bijection, so two records can never share a number
+#
+# With no collisions there is nothing to resolve: the number does
+# not depend on which records arrive first, in which batch or in
+# which run. It looks random but cannot be guessed without the key.
+#
+# The SQLite index (record_id ↔ number, both UNIQUE) is the
+# registry of issued IDs. Keep VOTER_ID_KEY fixed for the lifetime
+# of an index: a stored ID never changes, so numbers computed with
+# another key would no longer match it.
+#
+# Parallel allocation: worker processes compute the numbers for
+# their partition of records (the CPU-bound part); the parent
+# registers each partition in one transaction.
+#
+# Usage:
+#   python "Conditional Workflow/voter_ids.py" --benchmark 5000000 --processes 8 --db voter_ids.db
+# ============================================================
+
+import argparse
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Sequence
+
+import numpy as np
+
+VOTER_ID_KEY = os.getenv("VOTER_ID_KEY", "langgraph-voter-ids").encode("utf-8")
+ID_SPACE = 10**12
+_HALF = np.uint64(10**6)     # ID_SPACE = _HALF², so a number is two base-10^6 halves
+_ROUND_KEYS = [np.uint64(int.from_bytes(hashlib.blake2b(VOTER_ID_KEY + bytes([r]), digest_size=8).digest(), "big"))
+               for r in range(4)]
+
+
+def _mix(x: np.ndarray) -> np.ndarray:
+    '''
+    splitmix64 finalizer, elementwise on uint64.
+    '''
+    with np.errstate(over="ignore"):
+        x = x ^ (x >> np.uint64(30))
+        x = x * np.uint64(0xBF58476D1CE4E5B9)
+        x = x ^ (x >> np.uint64(27))
+        x = x * np.uint64(0x94D049BB133111EB)
+        return x ^ (x >> np.uint64(31))
+
+
+def voter_numbers(record_ids: Sequence[int]) -> np.ndarray:
+    '''
+    Voter numbers for a batch of record ids; fully vectorized so bulk
+    screening can call it on millions of records.
+    '''
+    ids = np.asarray(record_ids)
+    if ids.dtype.kind not in "iu":
+        raise TypeError(f"record ids must be integers, got {ids.dtype}")
+    if ids.size and (ids.min() < 0 or ids.max() >= ID_SPACE):
+        raise ValueError(f"record ids must be in [0, {ID_SPACE:,})")
+    ids = ids.astype(np.uint64)
+    left, right = ids // _HALF, ids % _HALF
+    for key in _ROUND_KEYS:
+        left, right = right, (left + _mix(right ^ key) % _HALF) % _HALF
+    return left * _HALF + right
+
+
+def voter_number(record_id: int) -> int:
+    return int(voter_numbers([record_id])[0])
+
+
+def format_voter_id(number: int) -> str:
+    return f"VOTE-2026-{number:012d}"
+
+
+class VoterIdIndex:
+    '''
+    Persisted registry of issued voter numbers, keyed on record_id.
+    '''
+
+    def __init__(self, path: str = "voter_ids.db"):
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA cache_size=-262144")   # 256 MB page cache for bulk loads
+        self.conn.execute("CREATE TABLE IF NOT EXISTS voter_ids (record_id INTEGER PRIMARY KEY, number INTEGER UNIQUE NOT NULL)")
+        self.conn.commit()
+
+    @classmethod
+    def from_env(cls) -> "VoterIdIndex":
+        return cls(os.getenv("VOTER_ID_DB", "voter_ids.db"))
+
+    def lookup(self, record_id: int) -> Optional[int]:
+        with self.lock:
+            row = self.conn.execute("SELECT number FROM voter_ids WHERE record_id = ?", (record_id,)).fetchone()
+        return row[0] if row else None
+
+    def assign(self, record_id: int) -> int:
+        '''
+        The voter number for `record_id`, registering it on first use.
+        '''
+        number = self.lookup(record_id)
+        if number is not None:
+            return number
+        number = voter_number(record_id)
+        with self.lock:
+            self.conn.execute("INSERT OR IGNORE INTO voter_ids (record_id, number) VALUES (?, ?)", (record_id, number))
+            self.conn.commit()
+        return number
+
+    def assign_many(self, record_ids: Sequence[int], numbers: Optional[Sequence[int]] = None) -> int:
+        '''
+        Bulk registration in one transaction. `numbers` are precomputed
+        voter numbers (e.g. from worker processes). Returns how many
+        records were new.
+        '''
+        if numbers is None:
+            numbers = voter_numbers(record_ids)
+        rows = zip((int(r) for r in record_ids), (int(n) for n in numbers))
+        with self.lock:
+            before = self.conn.total_changes
+            self.conn.executemany("INSERT OR IGNORE INTO voter_ids (record_id, number) VALUES (?, ?)", rows)
+            self.conn.commit()
+            return self.conn.total_changes - before
+
+    def count(self) -> int:
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM voter_ids").fetchone()[0]
+
+
+_default_index: Optional[VoterIdIndex] = None
+
+
+def default_index() -> VoterIdIndex:
+    '''
+    Shared index used by `approve_voter` (VOTER_ID_DB, default voter_ids.db).
+    '''
+    global _default_index
+    if _default_index is None:
+        _default_index = VoterIdIndex.from_env()
+    return _default_index
+
+
+def use_index(index: VoterIdIndex):
+    global _default_index
+    _default_index = index
+
+
+# ============================================================
+# PARALLEL ALLOCATION BENCHMARK
+# ============================================================
+
+def _number_partition(start: int, stop: int) -> np.ndarray:
+    return voter_numbers(np.arange(start, stop))
+
+
+def benchmark(n: int, processes: int, db: str, partition_rows: int = 500_000):
+    # The old scheme: how many of n voters would share an ID?
+    sample = min(n, 1_000_000)
+    old = np.array([abs(hash(f"Citizen {i}")) % 100000 for i in range(sample)])
+    old_shared = sample - len(np.unique(old))
+
+    index = VoterIdIndex(db)
+    partitions = [(a, min(a + partition_rows, n)) for a in range(0, n, partition_rows)]
+    number_s = write_s = 0.0
+    registered = shared = 0
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        futures = [pool.submit(_number_partition, a, b) for a, b in partitions]
+        for (a, b), future in zip(partitions, futures):
+            t = time.perf_counter()
+            numbers = future.result()
+            number_s += time.perf_counter() - t
+            shared += len(numbers) - len(np.unique(numbers))
+            t = time.perf_counter()
+            registered += index.assign_many(range(a, b), numbers)
+            write_s += time.perf_counter() - t
+    elapsed = time.perf_counter() - start
+
+    print(f"old hash() % 100000 scheme: {old_shared:,} of {sample:,} voters share an ID")
+    print(f"allocated {n:,} voter IDs with {processes} processes in {elapsed:.2f}s "
+          f"({n / elapsed:,.0f} approvals/s)")
+    print(f"  waiting for numbers {number_s:.2f}s · index writes {write_s:.2f}s · "
+          f"newly registered {registered:,} · shared within a partition {shared} · index size {index.count():,}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Deterministic voter ID allocation benchmark")
+    parser.add_argument("--benchmark", type=int, default=1_000_000, metavar="N", help="approvals to allocate")
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--db", default="voter_ids.db")
+    args = parser.parse_args()
+
+    benchmark(args.benchmark, args.processes, args.db)
@@ -0,0 +1,298 @@
+# ============================================================
+# Conditional Workflow — Columnar Bulk Voter Screening
+# ============================================================
+# `Conditional Workflow 1.py` screens ONE citizen per
+# `app.invoke()`. For an electoral roll of tens of millions of
+# records the same three rules run column-wise instead:
+#
+#   reason = UNDERAGE     where age < 18
+#          | NON_CITIZEN  where not is_citizen      (and age ok)
+#          | CRIMINAL     where has_criminal_record (and the rest ok)
+#          | APPROVED     otherwise
+#
+# `np.select` evaluates the conditions in the graph's order, so a
+# record gets the rejection of the FIRST check it fails, exactly
+# like verify_age → verify_citizenship → verify_criminal_record.
+#
+# Input (memory-mapped, never fully loaded):
+#   - structured .npy with fields record_id (unique, uint64), name
+#     (bytes), age, is_citizen, has_criminal_record
+#   - Arrow IPC / Feather (.arrow / .feather) with the same columns
+#     (needs pyarrow)
+#
+# Output: a structured .npy of 10 bytes per record
+#   status (uint8)        0 approved, 1 rejected
+#   reason_code (uint8)   index into REASONS
+#   voter_number (uint64) the digits of VOTE-2026-xxxxxxxxxxxx
+#                         (voter_ids.py), or NO_VOTER_ID if rejected
+# `decode()` turns one row back into the graph's status / reason /
+# voter_id strings.
+#
+# Parallelism: the roll is cut into partitions; each worker
+# process maps the input, screens its rows and writes its slice of
+# the (pre-allocated, memory-mapped) output file in place.
+# Workers write each approval's voter number, a keyed permutation
+# of its record_id, so no two records share one; with
+# `--id-index voter_ids.db` the parent then registers every
+# approval in the persisted ID index.
+#
+# Usage:
+#   python "Conditional Workflow/voter_screening.py" --make-sample 20000000 roll.npy
+#   python "Conditional Workflow/voter_screening.py" roll.npy decisions.npy --processes 8 --verify 20000
+#   python "Conditional Workflow/voter_screening.py" roll.npy decisions.npy --id-index voter_ids.db
+# ============================================================
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from voter_ids import VoterIdIndex, format_voter_id, use_index, voter_numbers
+
+ROLL_DTYPE = np.dtype([("record_id", "u8"), ("name", "S32"), ("age", "i2"), ("is_citizen", "?"), ("has_criminal_record", "?")])
+RESULT_DTYPE = np.dtype([("status", "u1"), ("reason_code", "u1"), ("voter_number", "u8")])
+
+STATUSES = np.array(["approved", "rejected"])
+APPROVED, UNDERAGE, NON_CITIZEN, CRIMINAL = range(4)
+REASONS = np.array([
+    "All eligibility criteria met — age, citizenship, and clean record verified.",
+    "Underage — must be at least 18 years old. Currently {age}, need to wait {years_left} more year(s).",
+    "Not an Indian citizen — only Indian citizens can vote in Indian elections.",
+    "Has a criminal record — voters with criminal convictions are disqualified.",
+])
+NO_VOTER_ID = np.iinfo(np.uint64).max
+MIN_AGE = 18
+
+
+# ============================================================
+# RULES
+# ============================================================
+
+def screen_columns(age, is_citizen, has_criminal_record, record_ids) -> np.ndarray:
+    '''
+    Applies the three eligibility rules to whole columns; returns RESULT_DTYPE rows.
+    '''
+    age = np.asarray(age)
+    reason = np.select(
+        [age < MIN_AGE, ~np.asarray(is_citizen, dtype=bool), np.asarray(has_criminal_record, dtype=bool)],
+        [UNDERAGE, NON_CITIZEN, CRIMINAL],
+        default=APPROVED,
+    ).astype(np.uint8)
+
+    out = np.empty(len(age), dtype=RESULT_DTYPE)
+    out["reason_code"] = reason
+    out["status"] = reason != APPROVED
+    approved = reason == APPROVED
+    out["voter_number"] = NO_VOTER_ID
+    out["voter_number"][approved] = voter_numbers(np.asarray(record_ids)[approved])
+    return out
+
+
+def decode(row, age: int) -> dict:
+    '''
+    The graph's status / reason / voter_id for one output row.
+    '''
+    code = int(row["reason_code"])
+    reason = str(REASONS[code])
+    if code == UNDERAGE:
+        reason = reason.format(age=age, years_left=MIN_AGE - age)
+    number = int(row["voter_number"])
+    return {
+        "status": str(STATUSES[row["status"]]),
+        "reason": reason,
+        "voter_id": "N/A" if number == NO_VOTER_ID else format_voter_id(number),
+    }
+
+
+# ============================================================
+# COLUMNAR INPUT + PARTITIONED OUTPUT
+# ============================================================
+
+def open_roll(path: str):
+    '''
+    Memory-maps the roll; returns (n_rows, slice_fn) where slice_fn(start, stop)
+    gives (age, is_citizen, has_criminal_record, record_ids, names) arrays.
+    '''
+    suffix = Path(path).suffix
+    if suffix == ".npy":
+        data = np.load(path, mmap_mode="r")
+        return len(data), lambda a, b: (data["age"][a:b], data["is_citizen"][a:b],
+                                        data["has_criminal_record"][a:b], data["record_id"][a:b], data["name"][a:b])
+    if suffix in (".arrow", ".feather"):
+        try:
+            import pyarrow as pa
+            import pyarrow.ipc as ipc
+        except ImportError as e:
+            raise ImportError("Reading Arrow files needs pyarrow: pip install pyarrow") from e
+        table = ipc.open_file(pa.memory_map(path, "r")).read_all()
+
+        def slice_arrow(a, b):
+            part = table.slice(a, b - a)
+            column = lambda c: part.column(c).to_numpy()
+            names = part.column("name").to_numpy(zero_copy_only=False)
+            return column("age"), column("is_citizen"), column("has_criminal_record"), column("record_id"), names
+        return table.num_rows, slice_arrow
+    raise ValueError(f"Unsupported roll format: {suffix} (use .npy, .arrow or .feather)")
+
+
+def screen_partition(roll_path: str, output_path: str, start: int, stop: int, chunk_rows: int) -> np.ndarray:
+    '''
+    Worker: screens rows [start, stop) into the shared output file.
+    Returns the reason-code counts for the partition.
+    '''
+    _, rows = open_roll(roll_path)
+    out = np.load(output_path, mmap_mode="r+")
+    counts = np.zeros(len(REASONS), dtype=np.int64)
+    for a in range(start, stop, chunk_rows):
+        b = min(a + chunk_rows, stop)
+        result = screen_columns(*rows(a, b)[:4])
+        out[a:b] = result
+        counts += np.bincount(result["reason_code"], minlength=len(REASONS))
+    out.flush()
+    return counts
+
+
+def register_ids(roll_path: str, output_path: str, start: int, stop: int, index: VoterIdIndex) -> int:
+    '''
+    Adds the partition's approvals to the ID index. Returns how many were new.
+    '''
+    _, rows = open_roll(roll_path)
+    part = np.load(output_path, mmap_mode="r")[start:stop]
+    approved = part["voter_number"] != NO_VOTER_ID
+    record_ids = np.asarray(rows(start, stop)[3])[approved]
+    return index.assign_many(record_ids, part["voter_number"][approved])
+
+
+def screen_roll(roll_path: str, output_path: str, processes: int = os.cpu_count() or 1,
+                partition_rows: int = 2_000_000, chunk_rows: int = 250_000,
+                id_index: Optional[str] = None) -> dict:
+    '''
+    Screens the whole roll, one partition per task across `processes` workers.
+    With `id_index`, approvals are registered in that persisted voter ID index.
+    '''
+    start_time = time.perf_counter()
+    n, _ = open_roll(roll_path)
+    np.lib.format.open_memmap(output_path, mode="w+", dtype=RESULT_DTYPE, shape=(n,)).flush()
+
+    partitions = [(a, min(a + partition_rows, n)) for a in range(0, n, partition_rows)]
+    counts = np.zeros(len(REASONS), dtype=np.int64)
+    if processes <= 1:
+        for a, b in partitions:
+            counts += screen_partition(roll_path, output_path, a, b, chunk_rows)
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            futures = [pool.submit(screen_partition, roll_path, output_path, a, b, chunk_rows) for a, b in partitions]
+            for future in futures:
+                counts += future.result()
+
+    screened = time.perf_counter() - start_time
+    registered = 0
+    if id_index:
+        index = VoterIdIndex(id_index)
+        for a, b in partitions:
+            registered += register_ids(roll_path, output_path, a, b, index)
+
+    elapsed = time.perf_counter() - start_time
+    return {
+        "records": n,
+        "partitions": len(partitions),
+        "processes": processes,
+        "screen_seconds": round(screened, 3),
+        "seconds": round(elapsed, 3),
+        "records_per_s": round(n / elapsed) if elapsed else 0,
+        "ids_registered": registered,
+        "reasons": dict(zip(["approved", "underage", "non_citizen", "criminal"], counts.tolist())),
+    }
+
+
+# ============================================================
+# VERIFICATION against the graph
+# ============================================================
+
+def _text(name) -> str:
+    # S32 names may end in a UTF-8 character cut in half
+    return name.decode("utf-8", "ignore") if isinstance(name, bytes) else str(name)
+
+
+def verify(roll_path: str, output_path: str, sample: int, seed: int = 0) -> int:
+    '''
+    Checks the screening against the voter graph:
+      1. every (age, is_citizen, has_criminal_record) combination for ages 0-130
+      2. `sample` random records of the roll against their output rows
+    Voter IDs are compared exactly. The graph allocates from a throwaway
+    in-memory index, so the synthetic grid voters never reach a persisted
+    one; numbers depend only on record_id, so they match any index. The
+    graph runs through its fast path (utils/fast_path.py), which is itself
+    verified against `app.invoke`.
+    '''
+    from voter_graph import app
+    from utils.fast_path import compile_fast_path
+
+    use_index(VoterIdIndex(":memory:"))
+    graph = compile_fast_path(app)
+
+    def check(record, row):
+        expected = {k: graph(record)[k] for k in ("status", "reason", "voter_id")}
+        got = decode(row, record["age"])
+        assert got == expected, (record, expected, got)
+
+    ages = np.repeat(np.arange(131), 4)
+    citizen = np.tile([True, True, False, False], 131)
+    criminal = np.tile([True, False, True, False], 131)
+    record_ids = np.arange(len(ages))
+    grid = screen_columns(ages, citizen, criminal, record_ids)
+    for i in range(len(ages)):
+        check({"record_id": int(record_ids[i]), "name": f"Grid Voter {i}", "age": int(ages[i]),
+               "is_citizen": bool(citizen[i]), "has_criminal_record": bool(criminal[i])}, grid[i])
+
+    n, rows = open_roll(roll_path)
+    out = np.load(output_path, mmap_mode="r")
+    rng = np.random.default_rng(seed)
+    for i in rng.choice(n, size=min(sample, n), replace=False):
+        age, is_citizen, criminal_record, record_id, name = (col[0] for col in rows(int(i), int(i) + 1))
+        check({"record_id": int(record_id), "name": _text(name), "age": int(age), "is_citizen": bool(is_citizen),
+               "has_criminal_record": bool(criminal_record)}, out[i])
+    return len(ages) + min(sample, n)
+
+
+def make_sample(n: int, path: str, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    roll = np.lib.format.open_memmap(path, mode="w+", dtype=ROLL_DTYPE, shape=(n,))
+    for a in range(0, n, 1_000_000):
+        b = min(a + 1_000_000, n)
+        roll["record_id"][a:b] = np.arange(a, b)
+        roll["name"][a:b] = np.char.add(b"Citizen ", np.arange(a, b).astype("S12"))
+        roll["age"][a:b] = rng.integers(0, 100, b - a)
+        roll["is_citizen"][a:b] = rng.random(b - a) < 0.95
+        roll["has_criminal_record"][a:b] = rng.random(b - a) < 0.02
+    roll.flush()
+    print(f"Wrote {n:,} records to {path}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Columnar bulk voter screening")
+    parser.add_argument("roll", nargs="?", help="structured .npy or Arrow/Feather electoral roll")
+    parser.add_argument("output", nargs="?", help="output .npy (status, reason_code, voter_number)")
+    parser.add_argument("--make-sample", type=int, metavar="N", help="write N random records to ROLL and exit")
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--partition-rows", type=int, default=2_000_000)
+    parser.add_argument("--chunk-rows", type=int, default=250_000)
+    parser.add_argument("--id-index", help="SQLite voter ID index to register approvals in")
+    parser.add_argument("--verify", type=int, default=0, metavar="N",
+                        help="check the rule grid and N sampled records against the graph")
+    args = parser.parse_args()
+
+    if args.make_sample:
+        make_sample(args.make_sample, args.roll)
+    else:
+        if not args.roll or not args.output:
+            parser.error("give ROLL and OUTPUT paths")
+        print(screen_roll(args.roll, args.output, args.processes, args.partition_rows, args.chunk_rows, args.id_index))
+        if args.verify:
+            print(f"Verified {verify(args.roll, args.output, args.verify)} records against the graph")
@@ -1,6 +1,9 @@
 from langgraph.graph import StateGraph, START, END
 from langgraph.graph.message import add_messages
-from langchain_groq import ChatGroq
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from utils.llm import get_llm
 from langchain_core.messages import HumanMessage, BaseMessage, SystemMessage
 from typing import TypedDict, Annotated, Literal
 from langgraph.checkpoint.memory import MemorySaver
@@ -11,7 +14,7 @@ import dotenv
 
 dotenv.load_dotenv()
 
-llm = ChatGroq(model="llama-3.3-70b-versatile", temperature=0.2, api_key=os.getenv("GROQ_API_KEY"))
+llm = get_llm(model="llama-3.3-70b-versatile", temperature=0.2, api_key=os.getenv("GROQ_API_KEY"))
 
 class Evaluation(BaseModel):
     evaluation: Literal["approved", "needs_improvement"] = Field(..., description="Evaluation of the tweet")
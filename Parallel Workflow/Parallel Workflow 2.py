@@ -1,6 +1,10 @@
 from langgraph.graph import StateGraph, START, END
 from langgraph.graph.message import add_messages
-from langchain_groq import ChatGroq
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from utils.llm import get_llm
+from utils.hedging import Hedge
 from langchain_core.messages import HumanMessage, BaseMessage, SystemMessage
 from typing import TypedDict, Annotated, List
 from langgraph.checkpoint.memory import MemorySaver
@@ -11,7 +15,7 @@ import dotenv
 
 dotenv.load_dotenv()
 
-llm = ChatGroq(model="llama-3.3-70b-versatile", api_key=os.getenv("GROQ_API_KEY"))
+llm = get_llm(model="llama-3.3-70b-versatile", api_key=os.getenv("GROQ_API_KEY"))
 
 essay = """
 Artificial Intelligence (AI) in India plays a transformative role across multiple sectors, driving innovation, efficiency, and inclusive growth. In healthcare, AI enables early disease detection, telemedicine, and affordable diagnostics, while in agriculture it supports farmers with crop monitoring, soil analysis, and weather forecasting. Education benefits from AI-powered personalized learning and language translation tools that bridge rural gaps, and governance uses AI for digital services, fraud detection, and policy-making. Industries such as manufacturing, finance, and IT leverage AI for automation, risk management, and global competitiveness, contributing significantly to India’s GDP. However, challenges like job displacement, ethical concerns, lack of infrastructure, and skill shortages remain. To address these, the government has launched initiatives such as the National AI Strategy and the India AI Mission, focusing on safe, trusted, and inclusive AI development. Overall, AI is not just a technological advancement but a socio-economic enabler, positioning India to achieve its vision of “AI for All” and emerge as a global leader in innovation.
@@ -23,6 +27,17 @@ class ResponseState(BaseModel):
 
 structured_llm = llm.with_structured_output(schema=ResponseState)
 
+# Opt-in request hedging: set ESSAY_HEDGE_DELAY (seconds) and a branch whose
+# call runs longer than that (later: the p95 of its recent calls) sends a
+# duplicate request; the first reply wins. One Hedge per node.
+hedge_delay = os.getenv("ESSAY_HEDGE_DELAY")
+if hedge_delay:
+    language_llm, analysis_llm, thought_llm = (
+        Hedge(structured_llm, name=name, initial_delay=float(hedge_delay))
+        for name in ("evaluate_language", "evaluate_analysis", "evaluate_thought"))
+else:
+    language_llm = analysis_llm = thought_llm = structured_llm
+
 class UPSEState(TypedDict):
     essay: str
     language_feedback: str
@@ -40,7 +55,7 @@ def evaluate_language(state: UPSEState) -> UPSEState:
         HumanMessage(content=f"Essay: {state['essay']}")
     ]
     
-    response = structured_llm.invoke(prompt)
+    response = language_llm.invoke(prompt)
     
     return {'language_feedback': response.feedback, 'individual_scores': [response.score]}
 
@@ -51,7 +66,7 @@ def evaluate_analysis(state: UPSEState) -> UPSEState:
         HumanMessage(content=f"Essay: {state['essay']}")
     ]
     
-    response = structured_llm.invoke(prompt)
+    response = analysis_llm.invoke(prompt)
     
     return {'analysis_feedback': response.feedback, 'individual_scores': [response.score]}
 
@@ -62,7 +77,7 @@ def evaluate_thought(state: UPSEState) -> UPSEState:
         HumanMessage(content=f"Essay: {state['essay']}")
     ]
     
-    response = structured_llm.invoke(prompt)
+    response = thought_llm.invoke(prompt)
     
     return {'clarity_feedback': response.feedback, 'individual_scores': [response.score]}
 
@@ -105,6 +120,9 @@ response = app.invoke({
 
 print("Overall Feedback: ", response['overall_feedback'])
 print("Overall Score: ", response['overall_score'])
+if hedge_delay:
+    for hedged in (language_llm, analysis_llm, thought_llm):
+        print(hedged.stats())
 
 
 
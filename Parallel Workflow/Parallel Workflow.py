@@ -1,6 +1,9 @@
 from langgraph.graph import StateGraph, START, END
 from langgraph.graph.message import add_messages
-from langchain_groq import ChatGroq
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from utils.llm import get_llm
 from langchain_core.messages import HumanMessage, BaseMessage, SystemMessage
 from typing import TypedDict, Annotated
 import os
@@ -8,7 +11,7 @@ import dotenv
 
 dotenv.load_dotenv()
 
-llm = ChatGroq(model="llama-3.3-70b-versatile", api_key=os.getenv("GROQ_API_KEY"))
+llm = get_llm(model="llama-3.3-70b-versatile", api_key=os.getenv("GROQ_API_KEY"))
 
 class PlayerState(TypedDict):
     runs: int
@@ -22,17 +25,19 @@ class PlayerState(TypedDict):
 
 def strike_rate(state: PlayerState) -> dict:
     print(f'Calculating strike rate...')
-    sr = (state['runs'] / state['balls']) * 100
+    # No balls faced (or no boundaries / no runs below): the ratio is undefined, not an error
+    sr = (state['runs'] / state['balls']) * 100 if state['balls'] else None
     return {'sr': sr}
 
 def balls_per_boundary(state: PlayerState) -> dict:
     print(f'Calculating balls per boundary...')
-    bpb = state['balls'] / (state['fours'] + state['sixes'])
+    boundaries = state['fours'] + state['sixes']
+    bpb = state['balls'] / boundaries if boundaries else None
     return {'bpb': bpb}
 
 def boundary_percentage(state: PlayerState) -> dict:
     print(f'Calculating boundary percentage...')
-    bp = ((state['fours'] + state['sixes']) / state['runs']) * 100
+    bp = ((state['fours'] + state['sixes']) / state['runs']) * 100 if state['runs'] else None
     return {'bp': bp}
 
 def player_summary(state: PlayerState) -> dict:
@@ -0,0 +1,104 @@
+# ============================================================
+# Parallel Workflow — Chunked Cricket Stats Pipeline
+# ============================================================
+# Runs the cricket `PlayerState` graph from `Parallel Workflow.py`
+# (strike_rate ‖ balls_per_boundary ‖ boundary_percentage →
+# player_summary) over a CSV / Parquet / .npy file of player
+# innings, using the shared chunked driver in
+# utils/chunked_pipeline.py.
+#
+# The graph is per-row, so each chunk goes through `app.batch()`.
+# A ratio with a zero denominator (no balls, no boundaries, no
+# runs) is undefined: it is left empty and shown as "-" in the
+# summary. Rows whose graph run still fails keep the error in the
+# `error` column.
+#
+# Usage:
+#   python "Parallel Workflow/cricket_pipeline.py" innings.csv innings_stats.csv
+# ============================================================
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Optional, TypedDict
+
+from langgraph.graph import StateGraph, START, END
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from utils.chunked_pipeline import graph_batch_processor, run_pipeline
+
+
+class PlayerState(TypedDict):
+    runs: int
+    balls: int
+    fours: int
+    sixes: int
+    sr: float
+    bpb: float
+    bp: float
+    summary: str
+
+
+def ratio(numerator: float, denominator: float, scale: float = 1.0) -> Optional[float]:
+    '''
+    numerator / denominator * scale, or None when the denominator is zero.
+    '''
+    return numerator / denominator * scale if denominator else None
+
+
+def fmt(value: Optional[float], digits: int) -> str:
+    return "-" if value is None or value != value else f"{value:.{digits}f}"
+
+
+def strike_rate(state: PlayerState) -> dict:
+    return {'sr': ratio(state['runs'], state['balls'], 100)}
+
+
+def balls_per_boundary(state: PlayerState) -> dict:
+    return {'bpb': ratio(state['balls'], state['fours'] + state['sixes'])}
+
+
+def boundary_percentage(state: PlayerState) -> dict:
+    return {'bp': ratio(state['fours'] + state['sixes'], state['runs'], 100)}
+
+
+def player_summary(state: PlayerState) -> dict:
+    return {'summary': f"SR {fmt(state['sr'], 1)} | BPB {fmt(state['bpb'], 2)} | BP {fmt(state['bp'], 1)}"}
+
+
+graph = StateGraph(PlayerState)
+
+graph.add_node('strike_rate', strike_rate)
+graph.add_node('balls_per_boundary', balls_per_boundary)
+graph.add_node('boundary_percentage', boundary_percentage)
+graph.add_node('player_summary', player_summary)
+
+graph.add_edge(START, 'strike_rate')
+graph.add_edge(START, 'balls_per_boundary')
+graph.add_edge(START, 'boundary_percentage')
+
+graph.add_edge('strike_rate', 'player_summary')
+graph.add_edge('balls_per_boundary', 'player_summary')
+graph.add_edge('boundary_percentage', 'player_summary')
+
+graph.add_edge('player_summary', END)
+
+app = graph.compile()
+
+INPUT_COLUMNS = ['runs', 'balls', 'fours', 'sixes']
+OUTPUT_COLUMNS = ['sr', 'bpb', 'bp', 'summary']
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Chunked cricket stats for large innings files")
+    parser.add_argument("input")
+    parser.add_argument("output")
+    parser.add_argument("--chunk-rows", type=int, default=10_000)
+    parser.add_argument("--mmap", action="store_true", help="memory-map the input file")
+    parser.add_argument("--no-resume", action="store_true", help="start over instead of resuming")
+    args = parser.parse_args()
+
+    stats = run_pipeline(args.input, args.output, graph_batch_processor(app, INPUT_COLUMNS, OUTPUT_COLUMNS),
+                         INPUT_COLUMNS, chunk_rows=args.chunk_rows, mmap_input=args.mmap,
+                         resume=not args.no_resume)
+    print(stats)
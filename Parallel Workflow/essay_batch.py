@@ -0,0 +1,334 @@
+# ============================================================
+# Parallel Workflow — Exam-Scale Essay Grading (Send map-reduce)
+# ============================================================
+# `Parallel Workflow 2.py` grades ONE hard-coded essay. This runner
+# grades a whole batch (tens of thousands of essays) with a
+# map-reduce graph built on dynamic `Send` dispatch:
+#
+#   START ──Send("evaluate", branch) × 3──→ evaluate ─→ final_evaluation → END
+#            map: one task per branch         reduce: scores + overall feedback
+#
+#   - Every essay is its own graph run (thread `essay-<id>`), so
+#     its result does not wait for other essays. `--essays-in-flight`
+#     runs go at once.
+#   - ALL LLM calls, from every run, share one concurrency limit
+#     (`--concurrency`) and one `RateLimiter` (`--rpm`, `--tpm`).
+#     429 / 5xx errors are retried with backoff (utils/rate_limit.py).
+#   - Each essay's result is appended to the output JSONL as soon as
+#     its `final_evaluation` finishes.
+#   - Progress lives in a SQLite checkpointer
+#     (`<output>.checkpoints.sqlite`). After an interruption, the
+#     same command resumes:
+#       essays in the output   are skipped
+#       finished runs          are written from the checkpoint
+#       interrupted runs       continue from their last step; the
+#                              evaluator calls that already
+#                              finished are not made again
+#       failed runs            (an LLM error after all retries) are
+#                              resumed the same way on the next run
+#
+# Report: essays/min, tokens, and cost per essay, priced at
+# GROQ_INPUT_PRICE_PER_M / GROQ_OUTPUT_PRICE_PER_M (USD per million).
+#
+# Usage:
+#   LLM_BACKEND=fake python "Parallel Workflow/essay_batch.py" --demo 2000 --rpm 6000 --tpm 10000000 --concurrency 32
+#   python "Parallel Workflow/essay_batch.py" essays/ --output grades.jsonl --concurrency 4
+#   python "Parallel Workflow/essay_batch.py" essays.jsonl --output grades.jsonl   # resumes if interrupted
+# ============================================================
+
+import argparse
+import asyncio
+import json
+import operator
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Annotated, Iterable, Iterator, List, Optional, Tuple, TypedDict
+
+from langchain_core.messages import HumanMessage, SystemMessage
+from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+from langgraph.graph import StateGraph, START, END
+from langgraph.types import Send
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from utils.rate_limit import RateLimiter, with_backoff
+from essay_graph import BRANCHES, ESSAY, ResponseState, llm
+
+# Groq free-tier limits for llama-3.3-70b-versatile; override per account
+DEFAULT_RPM = float(os.getenv("GROQ_RPM", "30"))
+DEFAULT_TPM = float(os.getenv("GROQ_TPM", "12000"))
+# Groq list prices for llama-3.3-70b-versatile, USD per million tokens
+INPUT_PRICE_PER_M = float(os.getenv("GROQ_INPUT_PRICE_PER_M", "0.59"))
+OUTPUT_PRICE_PER_M = float(os.getenv("GROQ_OUTPUT_PRICE_PER_M", "0.79"))
+# Reply tokens reserved with the rate limiter before each call
+ESTIMATED_REPLY_TOKENS = 400
+
+ESSAY_SUFFIXES = (".txt", ".md")
+FINAL_SYSTEM = "You are a final evaluation expert and Based on the following feedback, provide an overall feedback."
+LABELS = {"language": "Language", "analysis": "Analysis", "thought": "Clarity of Thought"}
+
+_DONE = object()
+
+
+class GradeState(TypedDict):
+    essay_id: str
+    essay: str
+    evaluations: Annotated[List[dict], operator.add]
+    result: dict
+
+
+class EvaluationTask(TypedDict):
+    essay_id: str
+    essay: str
+    branch: str
+
+
+
+def cost_usd(input_tokens: int, output_tokens: int) -> float:
+    return (input_tokens * INPUT_PRICE_PER_M + output_tokens * OUTPUT_PRICE_PER_M) / 1_000_000
+
+
+# ============================================================
+# GRAPH — map (one Send per branch) → reduce (final_evaluation)
+# ============================================================
+
+def dispatch_branches(state: GradeState) -> List[Send]:
+    return [Send("evaluate", {"essay_id": state["essay_id"], "essay": state["essay"], "branch": branch})
+            for branch in BRANCHES]
+
+
+def build_app(limiter: RateLimiter, semaphore: asyncio.Semaphore, checkpointer=None, stats: Optional[dict] = None):
+    '''
+    Map-reduce grading graph; every LLM call goes through `semaphore` and `limiter`.
+    '''
+    structured_llm = llm.with_structured_output(schema=ResponseState, include_raw=True)
+    stats = stats if stats is not None else {}
+
+    async def call_llm(model, messages) -> Tuple[object, dict]:
+        estimate = sum(len(m.content) for m in messages) // 4 + ESTIMATED_REPLY_TOKENS
+
+        async def call():
+            async with semaphore:
+                await limiter.acquire(estimate)
+                stats["llm_calls"] = stats.get("llm_calls", 0) + 1
+                try:
+                    response = await model.ainvoke(messages)
+                except Exception:
+                    # A rejected request used no tokens; keep the request slot spent
+                    limiter.settle(estimate, 0)
+                    raise
+            raw = response["raw"] if isinstance(response, dict) else response
+            usage = raw.usage_metadata or {}
+            limiter.settle(estimate, usage.get("total_tokens"))
+            return response, usage
+
+        def on_retry(error, delay):
+            stats["retries"] = stats.get("retries", 0) + 1
+
+        return await with_backoff(call, on_retry=on_retry)
+
+    async def evaluate(task: EvaluationTask) -> dict:
+        system, _ = BRANCHES[task["branch"]]
+        messages = [SystemMessage(content=system), HumanMessage(content=f"Essay: {task['essay']}")]
+        response, usage = await call_llm(structured_llm, messages)
+        if response["parsed"] is None:
+            raise ValueError(f"unparsable {task['branch']} evaluation: {response['parsing_error']}")
+        return {"evaluations": [{
+            "essay_id": task["essay_id"],
+            "branch": task["branch"],
+            "feedback": response["parsed"].feedback,
+            "score": response["parsed"].score,
+            "input_tokens": usage.get("input_tokens", 0),
+            "output_tokens": usage.get("output_tokens", 0),
+        }]}
+
+    async def final_evaluation(state: GradeState) -> dict:
+        evaluations = sorted(state["evaluations"], key=lambda e: list(BRANCHES).index(e["branch"]))
+        feedback = "\n".join(f"{LABELS[e['branch']]} Feedback: {e['feedback']}" for e in evaluations)
+        response, usage = await call_llm(llm, [SystemMessage(content=FINAL_SYSTEM), HumanMessage(content=feedback)])
+
+        scores = [e["score"] for e in evaluations]
+        input_tokens = usage.get("input_tokens", 0) + sum(e["input_tokens"] for e in evaluations)
+        output_tokens = usage.get("output_tokens", 0) + sum(e["output_tokens"] for e in evaluations)
+        return {"result": {
+            "id": state["essay_id"],
+            "scores": {e["branch"]: e["score"] for e in evaluations},
+            "overall_score": sum(scores) / len(scores),
+            "feedback": {e["branch"]: e["feedback"] for e in evaluations},
+            "overall_feedback": response.content,
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "cost_usd": round(cost_usd(input_tokens, output_tokens), 6),
+        }}
+
+    graph = StateGraph(GradeState)
+    graph.add_node("evaluate", evaluate)
+    graph.add_node("final_evaluation", final_evaluation)
+    graph.add_conditional_edges(START, dispatch_branches, ["evaluate"])
+    # Runs once, after all three evaluate tasks have written their evaluations
+    graph.add_edge("evaluate", "final_evaluation")
+    graph.add_edge("final_evaluation", END)
+    return graph.compile(checkpointer=checkpointer)
+
+
+# ============================================================
+# INPUT — yields {"id", "essay"}
+# ============================================================
+
+def read_essays(source: str) -> Iterator[dict]:
+    '''
+    A directory (one essay per file, id = relative path) or a JSONL file with "id" and "essay".
+    '''
+    path = Path(source)
+    if path.is_dir():
+        for file in sorted(p for p in path.rglob("*") if p.suffix in ESSAY_SUFFIXES):
+            yield {"id": str(file.relative_to(path)), "essay": file.read_text()}
+        return
+    with open(path) as f:
+        for n, line in enumerate(f):
+            line = line.strip()
+            if line:
+                record = json.loads(line)
+                yield {"id": str(record.get("id", f"line-{n}")), "essay": record["essay"]}
+
+
+def demo_essays(n: int) -> Iterator[dict]:
+    topics = ["Artificial Intelligence", "Renewable Energy", "Digital Payments", "Urbanisation", "Space Research"]
+    for i in range(n):
+        topic = topics[i % len(topics)]
+        yield {"id": f"demo-{i}", "essay": ESSAY.replace("Artificial Intelligence (AI)", topic) + f"\n(Candidate {i})"}
+
+
+# ============================================================
+# OUTPUT / CHECKPOINTS
+# ============================================================
+
+def checkpoint_path(output: str) -> str:
+    return output + ".checkpoints.sqlite"
+
+
+def load_written(output: str) -> set:
+    '''
+    Ids already in the output; drops a trailing line cut off by an interruption.
+    '''
+    if not os.path.exists(output):
+        return set()
+    ids = set()
+    with open(output, "r+b") as f:
+        good = 0
+        for line in f:
+            try:
+                ids.add(json.loads(line)["id"])
+            except (ValueError, KeyError):
+                break
+            good += len(line)
+        f.truncate(good)
+    return ids
+
+
+# ============================================================
+# RUNNER
+# ============================================================
+
+async def grade(essays: Iterable[dict], output: str, concurrency: int = 16, essays_in_flight: int = 16,
+                rpm: float = DEFAULT_RPM, tpm: float = DEFAULT_TPM, verbose: bool = True) -> dict:
+    '''
+    Grades every essay into `output` (JSONL); resumes from the checkpointer next to it.
+    '''
+    written_ids = load_written(output)
+    out = open(output, "a")
+    limiter = RateLimiter(rpm, tpm)
+    semaphore = asyncio.Semaphore(concurrency)
+    stats = {"llm_calls": 0, "retries": 0}
+    counts = {"essays": 0, "skipped": 0, "resumed": 0, "failed": 0}
+    graded, input_tokens, output_tokens, cost = 0, 0, 0, 0.0
+
+    def write(record: dict):
+        nonlocal graded, input_tokens, output_tokens, cost
+        out.write(json.dumps(record) + "\n")
+        out.flush()
+        written_ids.add(record["id"])
+        graded += 1
+        input_tokens += record["input_tokens"]
+        output_tokens += record["output_tokens"]
+        cost += record["cost_usd"]
+        if verbose and graded % 100 == 0:
+            print(f"  {graded} graded · {graded / (time.perf_counter() - start) * 60:.0f} essays/min · "
+                  f"throttled {limiter.throttled_seconds:.1f}s")
+
+    async def run_essay(app, essay: dict):
+        config = {"configurable": {"thread_id": f"essay-{essay['id']}"}}
+        snapshot = await app.aget_state(config)
+        if snapshot.values and snapshot.values["essay"] != essay["essay"]:
+            raise ValueError(f"checkpoint for essay {essay['id']!r} holds a different text; delete "
+                             f"{checkpoint_path(output)} (and {output}) to start over")
+        if snapshot.values and not snapshot.next:
+            write(snapshot.values["result"])
+            return
+        if snapshot.next:
+            counts["resumed"] += 1
+        inputs = None if snapshot.next else {"essay_id": essay["id"], "essay": essay["essay"]}
+        try:
+            async for update in app.astream(inputs, config, stream_mode="updates"):
+                if update.get("final_evaluation"):
+                    write(update["final_evaluation"]["result"])
+        except Exception as e:
+            counts["failed"] += 1
+            print(f"  essay {essay['id']!r} failed ({type(e).__name__}: {e}); rerun to resume it")
+
+    async def worker(app, queue: asyncio.Queue):
+        while True:
+            essay = await queue.get()
+            if essay is _DONE:
+                return
+            await run_essay(app, essay)
+
+    start = time.perf_counter()
+    async with AsyncSqliteSaver.from_conn_string(checkpoint_path(output)) as checkpointer:
+        app = build_app(limiter, semaphore, checkpointer, stats)
+        queue = asyncio.Queue(maxsize=essays_in_flight)
+        workers = [asyncio.create_task(worker(app, queue)) for _ in range(essays_in_flight)]
+        for essay in essays:
+            counts["essays"] += 1
+            if essay["id"] in written_ids:
+                counts["skipped"] += 1
+                continue
+            await queue.put(essay)
+        for _ in workers:
+            await queue.put(_DONE)
+        await asyncio.gather(*workers)
+    out.close()
+    elapsed = time.perf_counter() - start
+
+    return {
+        **counts,
+        "graded": graded,
+        "llm_calls": stats["llm_calls"],
+        "retries": stats["retries"],
+        "seconds": round(elapsed, 3),
+        "essays_per_min": round(graded / elapsed * 60, 1) if elapsed else 0.0,
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "cost_usd": round(cost, 4),
+        "cost_per_essay_usd": round(cost / graded, 6) if graded else 0.0,
+        "throttled_s": round(limiter.throttled_seconds, 3),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Batch UPSC essay grading with a Send map-reduce graph")
+    parser.add_argument("source", nargs="?", help="directory of .txt/.md essays, or a JSONL file (id, essay)")
+    parser.add_argument("--demo", type=int, help="grade N generated essays instead of reading a source")
+    parser.add_argument("--output", default="grades.jsonl", help="JSONL output, one result per essay")
+    parser.add_argument("--concurrency", type=int, default=16, help="LLM calls in flight, across all essays")
+    parser.add_argument("--essays-in-flight", type=int, default=16, help="graph runs at once")
+    parser.add_argument("--rpm", type=float, default=DEFAULT_RPM, help="requests per minute")
+    parser.add_argument("--tpm", type=float, default=DEFAULT_TPM, help="tokens per minute")
+    args = parser.parse_args()
+    if not args.source and not args.demo:
+        parser.error("give a source directory / file or --demo N")
+
+    essays = demo_essays(args.demo) if args.demo else read_essays(args.source)
+    report = asyncio.run(grade(essays, args.output, args.concurrency, args.essays_in_flight, args.rpm, args.tpm))
+    print(json.dumps(report, indent=2))
@@ -0,0 +1,75 @@
+# ============================================================
+# Parallel Workflow — Async Fan-Out Benchmark
+# ============================================================
+# Runs `essay_graph.app` (three async evaluators with deadlines)
+# and checks, per run, that the fan-out phase takes about as long
+# as the SLOWEST branch, not the SUM of the three:
+#
+#   fan-out wall   first evaluator start → last evaluator end
+#   slowest        max(branch wall)
+#   sum            Σ branch wall  (what running them one by one costs)
+#
+# Branch timings come from utils/tracing.py.
+#
+# With `--slow-branch analysis --slow-seconds 5 --timeout 1` (fake
+# LLM only) one evaluator gets a 5 s model. It is cut off at its
+# 1 s deadline, flagged in `timed_out`, left out of
+# `individual_scores`, and the graph finishes without waiting for it.
+#
+# Usage:
+#   LLM_BACKEND=fake FAKE_LLM_JITTER=0.5 python "Parallel Workflow/essay_fanout.py" --runs 10
+#   LLM_BACKEND=fake python "Parallel Workflow/essay_fanout.py" --runs 3 --slow-branch analysis --slow-seconds 5 --timeout 1
+# ============================================================
+
+import argparse
+import asyncio
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from utils.llm import FakeChatModel, llm_backend
+from utils.tracing import tracing
+from essay_graph import BRANCHES, ESSAY, build_graph
+
+
+async def main(args):
+    timeouts = {branch: args.timeout for branch in BRANCHES}
+    models = {}
+    if args.slow_branch:
+        if llm_backend() != "fake":
+            raise SystemExit("--slow-branch needs LLM_BACKEND=fake")
+        models[args.slow_branch] = FakeChatModel(ttft=args.slow_seconds)
+    app = build_graph(timeouts, models)
+
+    with tracing() as tracer:
+        for i in range(args.runs):
+            start = time.perf_counter()
+            result = await app.ainvoke({"essay": ESSAY})
+            wall = time.perf_counter() - start
+            print(f"run {i}: {wall:.3f}s · scores {result['individual_scores']} · "
+                  f"overall {result['overall_score']} · timed out {result.get('timed_out', [])}")
+
+    # Evaluator spans grouped per graph run
+    runs = defaultdict(list)
+    for span in tracer.spans:
+        if span["kind"] == "node" and span["name"].startswith("evaluate_"):
+            runs[span["root"]].append(span)
+    print(f"\n{'run':>3} | {'fan-out (s)':>11} | {'slowest (s)':>11} | {'sum (s)':>8} | fan-out / slowest")
+    print("-" * 62)
+    for i, spans in enumerate(runs.values()):
+        fan_out = max(s["end"] for s in spans) - min(s["start"] for s in spans)
+        walls = [s["end"] - s["start"] for s in spans]
+        print(f"{i:>3} | {fan_out:>11.3f} | {max(walls):>11.3f} | {sum(walls):>8.3f} | {fan_out / max(walls):.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Async essay evaluators: fan-out wall time and deadlines")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--timeout", type=float, default=30.0, help="per-branch deadline in seconds")
+    parser.add_argument("--slow-branch", choices=list(BRANCHES), help="give this branch a slow fake model")
+    parser.add_argument("--slow-seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    asyncio.run(main(args))
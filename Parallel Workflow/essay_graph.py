@@ -0,0 +1,149 @@
+# ============================================================
+# Parallel Workflow — Async Essay Evaluator (importable)
+# ============================================================
+# The UPSC essay graph from `Parallel Workflow 2.py` with the three
+# evaluators as native async nodes:
+#
+#   START ─┬→ evaluate_language ─┐
+#          ├→ evaluate_analysis ─┼→ final_evaluation → END
+#          └→ evaluate_thought  ─┘
+#
+#   - Each evaluator awaits `structured_llm.ainvoke(...)`, so the
+#     three calls overlap on the event loop (no worker threads).
+#   - Each branch has a DEADLINE (`ESSAY_BRANCH_TIMEOUT`, default
+#     30s, or per branch via `build_graph(timeouts=...)`). A branch
+#     that misses it degrades instead of stalling the graph: no
+#     score in `individual_scores`, empty feedback, and its name
+#     in `timed_out`.
+#   - `final_evaluation` averages the scores that arrived and tells
+#     the LLM which evaluations are missing.
+#   - `hedged_llms()` wraps each evaluator's structured LLM in a
+#     `Hedge` (utils/hedging.py); pass it as `build_graph(llms=...)`
+#     to duplicate straggler calls.
+#
+#   from essay_graph import app, ESSAY
+#   result = await app.ainvoke({"essay": ESSAY})
+# ============================================================
+
+import asyncio
+import operator
+import os
+import sys
+from pathlib import Path
+from typing import Annotated, Dict, List, Optional, TypedDict
+
+from langchain_core.messages import HumanMessage, SystemMessage
+from langgraph.graph import StateGraph, START, END
+from pydantic import BaseModel, Field
+import dotenv
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from utils.hedging import Hedge
+from utils.llm import get_llm
+
+dotenv.load_dotenv()
+
+llm = get_llm(model="llama-3.3-70b-versatile", api_key=os.getenv("GROQ_API_KEY"))
+
+DEFAULT_TIMEOUT = float(os.getenv("ESSAY_BRANCH_TIMEOUT", "30"))
+
+ESSAY = """
+Artificial Intelligence (AI) in India plays a transformative role across multiple sectors, driving innovation, efficiency, and inclusive growth. In healthcare, AI enables early disease detection, telemedicine, and affordable diagnostics, while in agriculture it supports farmers with crop monitoring, soil analysis, and weather forecasting. Education benefits from AI-powered personalized learning and language translation tools that bridge rural gaps, and governance uses AI for digital services, fraud detection, and policy-making. Industries such as manufacturing, finance, and IT leverage AI for automation, risk management, and global competitiveness, contributing significantly to India’s GDP. However, challenges like job displacement, ethical concerns, lack of infrastructure, and skill shortages remain. To address these, the government has launched initiatives such as the National AI Strategy and the India AI Mission, focusing on safe, trusted, and inclusive AI development. Overall, AI is not just a technological advancement but a socio-economic enabler, positioning India to achieve its vision of “AI for All” and emerge as a global leader in innovation.
+"""
+
+
+class ResponseState(BaseModel):
+    feedback: str = Field(description="Detailed feedback for the essay")
+    score: int = Field(description="Score out of 10", ge=0, le=10)
+
+
+class UPSEState(TypedDict):
+    essay: str
+    language_feedback: str
+    analysis_feedback: str
+    clarity_feedback: str
+    individual_scores: Annotated[List[int], operator.add]
+    timed_out: Annotated[List[str], operator.add]
+    overall_feedback: str
+    overall_score: Optional[float]
+
+
+# branch → (system prompt, state key for its feedback); same prompts as Parallel Workflow 2.py
+BRANCHES = {
+    "language": ("You are a language expert and you will evaluate the language quality of the following essay "
+                 "and provide a feedback and score out of 10.", "language_feedback"),
+    "analysis": ("You are an analysis expert and you will evaluate the analysis quality of the following essay "
+                 "and provide a feedback and score out of 10.", "analysis_feedback"),
+    "thought": ("You are a clarity of thought expert and you will evaluate the clarity of thought quality of the "
+                "following essay and provide a feedback and score out of 10.", "clarity_feedback"),
+}
+
+
+def evaluator_llm(model=None):
+    return (model or llm).with_structured_output(schema=ResponseState)
+
+
+def hedged_llms(models: Optional[Dict[str, object]] = None, **options) -> Dict[str, Hedge]:
+    '''
+    One `Hedge` per branch (each adapts to its own latencies); `options` go to `Hedge`.
+    '''
+    models = models or {}
+    return {branch: Hedge(evaluator_llm(models.get(branch)), name=f"evaluate_{branch}", **options)
+            for branch in BRANCHES}
+
+
+def make_evaluator(branch: str, model=None, timeout: float = DEFAULT_TIMEOUT, structured_llm=None):
+    '''
+    Async evaluator node for one branch, cancelled after `timeout` seconds.
+    '''
+    system, key = BRANCHES[branch]
+    structured_llm = structured_llm or evaluator_llm(model)
+
+    async def evaluate(state: UPSEState) -> dict:
+        messages = [SystemMessage(content=system), HumanMessage(content=f"Essay: {state['essay']}")]
+        try:
+            response = await asyncio.wait_for(structured_llm.ainvoke(messages), timeout)
+        except asyncio.TimeoutError:
+            return {key: "", "timed_out": [branch]}
+        return {key: response.feedback, "individual_scores": [response.score]}
+
+    evaluate.__name__ = f"evaluate_{branch}"
+    return evaluate
+
+
+async def final_evaluation(state: UPSEState) -> dict:
+    timed_out = state.get('timed_out', [])
+    feedback = "\n".join(f"{label} Feedback: {state[key]}" for label, key in (
+        ("Language", "language_feedback"), ("Analysis", "analysis_feedback"),
+        ("Clarity of Thought", "clarity_feedback")) if state.get(key))
+    if timed_out:
+        feedback += f"\n(Not evaluated in time: {', '.join(timed_out)})"
+    prompt = [
+        SystemMessage(content="You are a final evaluation expert and Based on the following feedback, provide an overall feedback."),
+        HumanMessage(content=feedback)
+    ]
+    response = await llm.ainvoke(prompt)
+
+    scores = state.get('individual_scores', [])
+    return {'overall_feedback': response.content, 'overall_score': sum(scores) / len(scores) if scores else None}
+
+
+def build_graph(timeouts: Optional[Dict[str, float]] = None, models: Optional[Dict[str, object]] = None,
+                llms: Optional[Dict[str, object]] = None):
+    '''
+    `timeouts` / `models` / `llms` override the deadline / chat model / structured LLM per branch
+    ("language", "analysis", "thought").
+    '''
+    timeouts, models, llms = timeouts or {}, models or {}, llms or {}
+    graph = StateGraph(UPSEState)
+    for branch in BRANCHES:
+        node = make_evaluator(branch, models.get(branch), timeouts.get(branch, DEFAULT_TIMEOUT), llms.get(branch))
+        graph.add_node(node.__name__, node)
+        graph.add_edge(START, node.__name__)
+        graph.add_edge(node.__name__, 'final_evaluation')
+    graph.add_node('final_evaluation', final_evaluation)
+    graph.add_edge('final_evaluation', END)
+    return graph.compile()
+
+
+app = build_graph()
@@ -0,0 +1,112 @@
+# ============================================================
+# Parallel Workflow — Hedged Evaluator Benchmark
+# ============================================================
+# Runs the same essays through `essay_graph` twice:
+#
+#   baseline   each evaluator makes one structured LLM call
+#   hedged     each evaluator calls through its own `Hedge`
+#              (utils/hedging.py): past the p95 of its recent
+#              latencies it sends a duplicate, first reply wins
+#
+# One straggler among the three branches holds up
+# `final_evaluation`, so the run's tail latency is the branches'
+# tail. With the fake LLM, `--straggler-rate` of calls are
+# `--straggler-factor` times slower (FAKE_LLM_STRAGGLER_*). Keep
+# that rate below 100 - `--percentile`: if more than 5% of recent
+# calls are stragglers, their p95 IS the straggler latency and
+# hedging at it no longer helps.
+#
+# Each mode first runs `--warmup` unmeasured essays, so every Hedge
+# has the `min_samples` latencies it needs before it starts hedging.
+#
+# Report: p50 / p90 / p99 run latency for both modes, the p99
+# improvement, and per-node hedge rate, hedge wins and budget
+# denials.
+#
+# Usage:
+#   LLM_BACKEND=fake python "Parallel Workflow/essay_hedging.py" --runs 300
+#   LLM_BACKEND=fake python "Parallel Workflow/essay_hedging.py" --runs 300 --percentile 90 --max-hedge-rate 0.05
+# ============================================================
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from utils.hedging import percentile
+from utils.llm import FakeChatModel, llm_backend
+from essay_graph import BRANCHES, ESSAY, build_graph, hedged_llms
+
+
+async def run_all(app, runs: int, concurrency: int) -> list:
+    '''
+    Latency of each run, `concurrency` runs in flight.
+    '''
+    latencies = []
+    if not runs:
+        return latencies
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i: int):
+        async with semaphore:
+            start = time.perf_counter()
+            # A different essay per run, so fake replies (and scores) vary
+            await app.ainvoke({"essay": f"{ESSAY}\n(essay {i})"})
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(one(i) for i in range(runs)))
+    return latencies
+
+
+def fake_models(args) -> dict:
+    return {branch: FakeChatModel(jitter=args.jitter, straggler_rate=args.straggler_rate,
+                                  straggler_factor=args.straggler_factor, seed=n)
+            for n, branch in enumerate(BRANCHES)}
+
+
+async def main(args):
+    if llm_backend() != "fake":
+        print("note: real LLM backend, straggler options are ignored")
+    results = {}
+
+    models = fake_models(args) if llm_backend() == "fake" else {}
+    baseline = build_graph(models=models)
+    await run_all(baseline, args.warmup, args.concurrency)
+    results["baseline"] = await run_all(baseline, args.runs, args.concurrency)
+
+    models = fake_models(args) if llm_backend() == "fake" else {}
+    hedges = hedged_llms(models, percentile=args.percentile, max_hedge_rate=args.max_hedge_rate)
+    hedged = build_graph(llms=hedges)
+    await run_all(hedged, args.warmup, args.concurrency)
+    results["hedged"] = await run_all(hedged, args.runs, args.concurrency)
+
+    print(f"{args.runs} runs per mode after {args.warmup} warm-up runs, concurrency {args.concurrency}\n")
+    print(f"{'mode':<9} | {'p50 (s)':>8} | {'p90 (s)':>8} | {'p99 (s)':>8} | {'max (s)':>8}")
+    print("-" * 52)
+    for mode, latencies in results.items():
+        p50, p90, p99 = (percentile(latencies, q) for q in (50, 90, 99))
+        print(f"{mode:<9} | {p50:>8.3f} | {p90:>8.3f} | {p99:>8.3f} | {max(latencies):>8.3f}")
+    base, hedged = percentile(results["baseline"], 99), percentile(results["hedged"], 99)
+    print(f"\np99 improvement: {base - hedged:.3f}s ({(1 - hedged / base) * 100:.0f}%)\n")
+
+    for hedge in hedges.values():
+        s = hedge.stats()
+        print(f"{s['name']:<18} hedge rate {s['hedge_rate']:.3f} · hedged {s['hedged']}/{s['calls']} · "
+              f"hedge wins {s['hedge_wins']} · budget denied {s['budget_denied']} · delay {s['delay_s']}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Hedged vs plain evaluator calls in the essay fan-out")
+    parser.add_argument("--runs", type=int, default=300)
+    parser.add_argument("--warmup", type=int, default=50, help="unmeasured runs before each mode")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--percentile", type=float, default=95.0, help="hedge after this latency percentile")
+    parser.add_argument("--max-hedge-rate", type=float, default=0.1, help="duplicates as a fraction of calls")
+    parser.add_argument("--straggler-rate", type=float, default=0.02)
+    parser.add_argument("--straggler-factor", type=float, default=8.0)
+    parser.add_argument("--jitter", type=float, default=0.2)
+    args = parser.parse_args()
+
+    asyncio.run(main(args))
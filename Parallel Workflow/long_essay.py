@@ -0,0 +1,284 @@
+# ============================================================
+# Parallel Workflow — Chunked Evaluation of Long Essays
+# ============================================================
+# The evaluators in `Parallel Workflow 2.py` put the WHOLE essay in
+# each of their three prompts. A long submission can overflow the
+# context window, and every call gets slower as the prompt grows.
+# This graph splits the essay first:
+#
+#   START → split_essay ──Send × (chunk, criterion)──→ evaluate_chunk ─→ final_evaluation → END
+#
+#   - `split_essay` packs paragraphs (blank-line separated) into
+#     chunks of at most `chunk_chars` characters (ESSAY_CHUNK_CHARS,
+#     default 4000). A paragraph longer than that is split between
+#     sentences, and a sentence longer than that between words (a
+#     single over-long word is cut).
+#   - Every chunk is evaluated for every criterion in parallel, up
+#     to `concurrency` calls in flight (ESSAY_CONCURRENCY, default
+#     16). As in essay_batch.py, every LLM call also goes through a
+#     shared `RateLimiter` (GROQ_RPM / GROQ_TPM) and is retried
+#     with `with_backoff` on 429 / 5xx, so a very long essay does
+#     not fire hundreds of requests at once. Below that cap latency
+#     depends on the chunk size, not on the essay length.
+#   - An empty (or whitespace-only) essay skips the evaluators:
+#     every score is 0.0 and the feedback says the essay is empty.
+#   - Chunk results are merged by the `merge_scores` reducer instead
+#     of `operator.add` on `individual_scores`. For each criterion
+#     it keeps Σ score × chunk length and Σ chunk length, so the
+#     final score is a LENGTH-WEIGHTED mean (a short closing
+#     paragraph does not count as much as the body). Chunk feedback
+#     is kept in essay order.
+#   - `final_evaluation` writes the per-criterion scores into
+#     `individual_scores` and the merged feedback into the usual
+#     feedback keys. For the overall-feedback prompt, each
+#     criterion's feedback is cut to `FINAL_FEEDBACK_CHARS` (shared
+#     out between the parts), so that prompt does not grow with the
+#     essay either.
+#
+# The benchmark compares this graph with `essay_graph.app` (whole
+# essay per prompt) as the essay grows. The fake LLM's latency only
+# depends on prompt length when FAKE_LLM_PREFILL_TPS is set.
+#
+# Usage (the fake LLM has no rate limits, so lift them):
+#   LLM_BACKEND=fake FAKE_LLM_PREFILL_TPS=2000 python "Parallel Workflow/long_essay.py" --rpm 60000 --tpm 100000000
+#   LLM_BACKEND=fake FAKE_LLM_PREFILL_TPS=2000 python "Parallel Workflow/long_essay.py" --paragraphs 1 8 32 --chunk-chars 2000 --rpm 60000 --tpm 100000000
+# ============================================================
+
+import argparse
+import asyncio
+import os
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Annotated, Dict, List, Optional, Tuple, TypedDict, Union
+
+from langchain_core.messages import HumanMessage, SystemMessage
+from langgraph.graph import StateGraph, START, END
+from langgraph.types import Send
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from utils.llm import llm_backend
+from utils.rate_limit import RateLimiter, with_backoff
+from essay_graph import BRANCHES, ESSAY, ResponseState, app as whole_essay_app, llm
+from essay_batch import DEFAULT_RPM, DEFAULT_TPM, ESTIMATED_REPLY_TOKENS, FINAL_SYSTEM
+
+DEFAULT_CHUNK_CHARS = int(os.getenv("ESSAY_CHUNK_CHARS", "4000"))
+DEFAULT_CONCURRENCY = int(os.getenv("ESSAY_CONCURRENCY", "16"))
+FINAL_FEEDBACK_CHARS = 1200
+EMPTY_FEEDBACK = "The essay is empty; there is nothing to evaluate."
+LABELS = {"language": "Language", "analysis": "Analysis", "thought": "Clarity of Thought"}
+
+
+# ============================================================
+# SPLITTING
+# ============================================================
+
+def _pack(parts: List[str], max_chars: int, separator: str) -> List[str]:
+    chunks, current = [], ""
+    for part in parts:
+        if current and len(current) + len(separator) + len(part) > max_chars:
+            chunks.append(current)
+            current = part
+        else:
+            current = f"{current}{separator}{part}" if current else part
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _split_sentence(sentence: str, max_chars: int) -> List[str]:
+    words = [word[i:i + max_chars] for word in sentence.split() for i in range(0, len(word), max_chars)]
+    return _pack(words, max_chars, " ")
+
+
+def split_essay(essay: str, max_chars: int = DEFAULT_CHUNK_CHARS) -> List[str]:
+    '''
+    Paragraphs packed into chunks of at most `max_chars`; oversized paragraphs are split
+    between sentences, oversized sentences between words. No chunk is longer than `max_chars`.
+    '''
+    pieces = []
+    for paragraph in (p.strip() for p in re.split(r"\n\s*\n", essay)):
+        if len(paragraph) <= max_chars:
+            pieces.extend([paragraph] if paragraph else [])
+            continue
+        sentences = []
+        for sentence in re.split(r"(?<=[.!?])\s+", paragraph):
+            sentences.extend([sentence] if len(sentence) <= max_chars else _split_sentence(sentence, max_chars))
+        pieces.extend(_pack(sentences, max_chars, " "))
+    return _pack(pieces, max_chars, "\n\n")
+
+
+def digest(parts: List[tuple], budget: int = FINAL_FEEDBACK_CHARS) -> str:
+    '''
+    Part feedback joined in essay order; each part cut to an equal share of `budget` if needed.
+    '''
+    if len(parts) == 1:
+        return parts[0][1][:budget]
+    share = max(1, budget // len(parts))
+    return "\n".join(f"Part {i + 1}: {feedback if len(feedback) <= share else feedback[:share] + '…'}"
+                     for i, feedback in parts)
+
+
+# ============================================================
+# STATE — length-weighted reducer
+# ============================================================
+
+def merge_scores(current: Optional[Dict[str, dict]], update: Dict[str, dict]) -> Dict[str, dict]:
+    '''
+    Per criterion: Σ score × chars, Σ chars, and (chunk index, feedback) pairs. Order-independent.
+    '''
+    merged = dict(current or {})
+    for branch, part in update.items():
+        total = merged.get(branch, {"weighted": 0.0, "chars": 0, "feedback": []})
+        merged[branch] = {
+            "weighted": total["weighted"] + part["weighted"],
+            "chars": total["chars"] + part["chars"],
+            "feedback": sorted(total["feedback"] + part["feedback"]),
+        }
+    return merged
+
+
+class LongEssayState(TypedDict):
+    essay: str
+    chunks: List[str]
+    criteria: Annotated[Dict[str, dict], merge_scores]
+    language_feedback: str
+    analysis_feedback: str
+    clarity_feedback: str
+    individual_scores: List[float]
+    overall_feedback: str
+    overall_score: float
+
+
+class ChunkTask(TypedDict):
+    branch: str
+    index: int
+    total: int
+    text: str
+
+
+# ============================================================
+# GRAPH
+# ============================================================
+
+def dispatch_chunks(state: LongEssayState) -> Union[List[Send], str]:
+    chunks = state["chunks"]
+    if not chunks:
+        return "final_evaluation"
+    return [Send("evaluate_chunk", {"branch": branch, "index": i, "total": len(chunks), "text": text})
+            for i, text in enumerate(chunks) for branch in BRANCHES]
+
+
+def build_graph(chunk_chars: int = DEFAULT_CHUNK_CHARS, model=None, limiter: Optional[RateLimiter] = None,
+                concurrency: int = DEFAULT_CONCURRENCY):
+    '''
+    `model` overrides the chat model of the chunk evaluators. Every LLM call goes
+    through a `concurrency` semaphore and `limiter` (default GROQ_RPM / GROQ_TPM).
+    '''
+    structured_llm = (model or llm).with_structured_output(schema=ResponseState, include_raw=True)
+    limiter = limiter or RateLimiter(DEFAULT_RPM, DEFAULT_TPM)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def call_llm(runnable, messages) -> Tuple[object, dict]:
+        estimate = sum(len(m.content) for m in messages) // 4 + ESTIMATED_REPLY_TOKENS
+
+        async def call():
+            async with semaphore:
+                await limiter.acquire(estimate)
+                try:
+                    response = await runnable.ainvoke(messages)
+                except Exception:
+                    # A rejected request used no tokens; keep the request slot spent
+                    limiter.settle(estimate, 0)
+                    raise
+            raw = response["raw"] if isinstance(response, dict) else response
+            limiter.settle(estimate, (raw.usage_metadata or {}).get("total_tokens"))
+            return response
+
+        return await with_backoff(call)
+
+    def split(state: LongEssayState) -> dict:
+        return {"chunks": split_essay(state["essay"], chunk_chars)}
+
+    async def evaluate_chunk(task: ChunkTask) -> dict:
+        system, _ = BRANCHES[task["branch"]]
+        if task["total"] > 1:
+            system += (f" This is part {task['index'] + 1} of {task['total']} of a longer essay; "
+                       "evaluate this part only.")
+        response = await call_llm(structured_llm, [SystemMessage(content=system),
+                                                   HumanMessage(content=f"Essay: {task['text']}")])
+        if response["parsed"] is None:
+            raise ValueError(f"unparsable {task['branch']} evaluation: {response['parsing_error']}")
+        chars = len(task["text"])
+        return {"criteria": {task["branch"]: {"weighted": response["parsed"].score * chars, "chars": chars,
+                                              "feedback": [(task["index"], response["parsed"].feedback)]}}}
+
+    async def final_evaluation(state: LongEssayState) -> dict:
+        if not state["chunks"]:
+            return {**{key: EMPTY_FEEDBACK for _, key in BRANCHES.values()},
+                    "individual_scores": [0.0] * len(BRANCHES), "overall_feedback": EMPTY_FEEDBACK,
+                    "overall_score": 0.0}
+        update, scores, summary = {}, [], []
+        for branch, (_, key) in BRANCHES.items():
+            criterion = state["criteria"][branch]
+            parts = criterion["feedback"]
+            update[key] = digest(parts, budget=sys.maxsize)
+            summary.append(f"{LABELS[branch]} Feedback: {digest(parts)}")
+            scores.append(round(criterion["weighted"] / criterion["chars"], 2))
+        response = await call_llm(llm, [SystemMessage(content=FINAL_SYSTEM), HumanMessage(content="\n".join(summary))])
+        return {**update, "individual_scores": scores, "overall_feedback": response.content,
+                "overall_score": sum(scores) / len(scores)}
+
+    graph = StateGraph(LongEssayState)
+    graph.add_node("split_essay", split)
+    graph.add_node("evaluate_chunk", evaluate_chunk)
+    graph.add_node("final_evaluation", final_evaluation)
+    graph.add_edge(START, "split_essay")
+    graph.add_conditional_edges("split_essay", dispatch_chunks, ["evaluate_chunk", "final_evaluation"])
+    # Runs once, after every (chunk, criterion) task has merged its score
+    graph.add_edge("evaluate_chunk", "final_evaluation")
+    graph.add_edge("final_evaluation", END)
+    return graph.compile()
+
+
+app = build_graph()
+
+
+# ============================================================
+# BENCHMARK — whole-essay prompts vs chunked, as the essay grows
+# ============================================================
+
+def long_essay(paragraphs: int) -> str:
+    return "\n\n".join(f"{ESSAY.strip()} (Paragraph {i + 1}.)" for i in range(paragraphs))
+
+
+async def main(args):
+    if llm_backend() == "fake" and not float(os.getenv("FAKE_LLM_PREFILL_TPS", "0")):
+        print("note: FAKE_LLM_PREFILL_TPS is not set, so the fake LLM ignores prompt length\n")
+    chunked_app = build_graph(args.chunk_chars, limiter=RateLimiter(args.rpm, args.tpm), concurrency=args.concurrency)
+
+    print(f"{'paragraphs':>10} | {'chars':>7} | {'chunks':>6} | {'whole (s)':>9} | {'chunked (s)':>11} | scores (chunked)")
+    print("-" * 80)
+    for paragraphs in args.paragraphs:
+        essay = long_essay(paragraphs)
+        start = time.perf_counter()
+        await whole_essay_app.ainvoke({"essay": essay})
+        whole = time.perf_counter() - start
+        start = time.perf_counter()
+        result = await chunked_app.ainvoke({"essay": essay})
+        chunked = time.perf_counter() - start
+        print(f"{paragraphs:>10} | {len(essay):>7,} | {len(result['chunks']):>6} | {whole:>9.3f} | "
+              f"{chunked:>11.3f} | {result['individual_scores']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Whole-essay vs chunked parallel evaluation of long essays")
+    parser.add_argument("--paragraphs", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--chunk-chars", type=int, default=DEFAULT_CHUNK_CHARS)
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="chunk evaluations in flight")
+    parser.add_argument("--rpm", type=float, default=DEFAULT_RPM, help="requests per minute")
+    parser.add_argument("--tpm", type=float, default=DEFAULT_TPM, help="tokens per minute")
+    args = parser.parse_args()
+
+    asyncio.run(main(args))
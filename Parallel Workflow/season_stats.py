@@ -0,0 +1,245 @@
+# ============================================================
+# Parallel Workflow — Streaming Season Stats from Delivery Logs
+# ============================================================
+# `Parallel Workflow.py` computes strike rate, balls per boundary
+# and boundary percentage from ONE set of pre-summed totals. This
+# module builds those totals from ball-by-ball delivery logs of a
+# whole season and keeps them up to date as deliveries stream in:
+#
+#   delivery log (batter, runs off the bat, wide) — chunked
+#        │
+#        ▼  SeasonAggregator.update(chunk)
+#   per-player arrays   runs | balls | fours | sixes     (int32)
+#   derived arrays      sr   | bpb   | bp                (float64)
+#        │
+#        ▼  on demand
+#   summary(player) → the graph's `player_summary` node
+#
+#   - Totals are indexed by player id, so a chunk is added with
+#     `np.bincount` (no Python loop per delivery).
+#   - After each chunk the derived metrics are recomputed for the
+#     players in that chunk only.
+#   - Wides are not balls faced. A zero denominator (no balls, no
+#     boundaries, no runs) gives NaN, shown as "-" in summaries,
+#     instead of a ZeroDivisionError.
+#
+# Input: structured .npy (memory-mapped) or CSV with `batter`,
+# `runs`, `wide` columns, read through utils/chunked_pipeline.py.
+#
+# Usage:
+#   python "Parallel Workflow/season_stats.py" --demo 5000000 --player 0 --player 1999
+#   python "Parallel Workflow/season_stats.py" deliveries.npy --player 17 --output season.csv
+# ============================================================
+
+import argparse
+import csv
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from utils.chunked_pipeline import READERS, peak_rss_mb
+from cricket_pipeline import player_summary, ratio
+
+DELIVERY_DTYPE = np.dtype([("batter", "i4"), ("runs", "i1"), ("wide", "?")])
+DELIVERY_COLUMNS = ["batter", "runs", "wide"]
+TOTALS = ["runs", "balls", "fours", "sixes"]
+METRICS = ["sr", "bpb", "bp"]
+
+
+class SeasonAggregator:
+    '''
+    Running per-player totals and derived metrics, updated one chunk of deliveries at a time.
+    '''
+
+    def __init__(self, capacity: int = 1024):
+        self.deliveries = 0
+        self.totals = {name: np.zeros(capacity, dtype=np.int32) for name in TOTALS}
+        self.metrics = {name: np.full(capacity, np.nan) for name in METRICS}
+
+    @property
+    def capacity(self) -> int:
+        return len(self.totals["runs"])
+
+    def _grow(self, size: int):
+        capacity = max(size, 2 * self.capacity)
+        for name, values in self.totals.items():
+            self.totals[name] = np.concatenate([values, np.zeros(capacity - len(values), dtype=values.dtype)])
+        for name, values in self.metrics.items():
+            self.metrics[name] = np.concatenate([values, np.full(capacity - len(values), np.nan)])
+
+    def update(self, batter, runs, wide=None):
+        '''
+        Adds one chunk of deliveries and refreshes the metrics of the players in it.
+        '''
+        batter = np.asarray(batter, dtype=np.int64)
+        if not len(batter):
+            return
+        runs = np.asarray(runs, dtype=np.int64)
+        legal = ~np.asarray(wide, dtype=bool) if wide is not None else np.ones(len(batter), dtype=bool)
+        size = int(batter.max()) + 1
+        if size > self.capacity:
+            self._grow(size)
+
+        t = self.totals
+        t["runs"][:size] += np.bincount(batter, weights=runs, minlength=size).astype(np.int32)
+        t["balls"][:size] += np.bincount(batter[legal], minlength=size).astype(np.int32)
+        t["fours"][:size] += np.bincount(batter[runs == 4], minlength=size).astype(np.int32)
+        t["sixes"][:size] += np.bincount(batter[runs == 6], minlength=size).astype(np.int32)
+        self.deliveries += len(batter)
+        self._derive(np.flatnonzero(np.bincount(batter, minlength=size)))
+
+    def _derive(self, players: np.ndarray):
+        '''
+        Same formulas as the graph's three parallel nodes; NaN where the denominator is zero.
+        '''
+        runs = self.totals["runs"][players].astype(np.float64)
+        balls = self.totals["balls"][players].astype(np.float64)
+        boundaries = (self.totals["fours"][players] + self.totals["sixes"][players]).astype(np.float64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.metrics["sr"][players] = np.where(balls > 0, runs / balls * 100, np.nan)
+            self.metrics["bpb"][players] = np.where(boundaries > 0, balls / boundaries, np.nan)
+            self.metrics["bp"][players] = np.where(runs > 0, boundaries / runs * 100, np.nan)
+
+    def player(self, player_id: int) -> dict:
+        '''
+        `PlayerState` values for one player (None for undefined metrics).
+        '''
+        if not 0 <= player_id < self.capacity:
+            state = {name: 0 for name in TOTALS}
+            state.update({name: None for name in METRICS})
+            return state
+        state = {name: int(self.totals[name][player_id]) for name in TOTALS}
+        for name in METRICS:
+            value = float(self.metrics[name][player_id])
+            state[name] = None if np.isnan(value) else value
+        return state
+
+    def summary(self, player_id: int) -> str:
+        return player_summary(self.player(player_id))["summary"]
+
+    def active_players(self) -> np.ndarray:
+        return np.flatnonzero((self.totals["balls"] > 0) | (self.totals["runs"] > 0))
+
+    def write_csv(self, path: str):
+        players = self.active_players()
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["player"] + TOTALS + METRICS)
+            columns = [players] + [self.totals[n][players] for n in TOTALS] + [self.metrics[n][players] for n in METRICS]
+            for row in zip(*[c.tolist() for c in columns]):
+                writer.writerow(["" if isinstance(v, float) and v != v else v for v in row])
+
+
+def aggregate_log(path: str, chunk_rows: int = 1_000_000, aggregator: Optional[SeasonAggregator] = None,
+                  watch=(), verbose: bool = True) -> SeasonAggregator:
+    '''
+    Streams a delivery log through the aggregator; prints watched players after every chunk.
+    '''
+    aggregator = aggregator or SeasonAggregator()
+    extension = os.path.splitext(path)[1].lower()
+    for columns, _ in READERS[extension](path, DELIVERY_COLUMNS, chunk_rows):
+        aggregator.update(columns["batter"], columns["runs"], columns["wide"])
+        if verbose and watch:
+            for player_id in watch:
+                print(f"  {aggregator.deliveries:>12,} deliveries · player {player_id}: {aggregator.summary(player_id)}")
+    return aggregator
+
+
+def loop_aggregate(deliveries: np.ndarray) -> dict:
+    '''
+    Baseline: one Python update per delivery, metrics recomputed for that player each time.
+    '''
+    players = {}
+    for batter, runs, wide in deliveries.tolist():
+        p = players.setdefault(batter, {"runs": 0, "balls": 0, "fours": 0, "sixes": 0})
+        p["runs"] += runs
+        p["balls"] += not wide
+        p["fours"] += runs == 4
+        p["sixes"] += runs == 6
+        p["sr"] = ratio(p["runs"], p["balls"], 100)
+        p["bpb"] = ratio(p["balls"], p["fours"] + p["sixes"])
+        p["bp"] = ratio(p["fours"] + p["sixes"], p["runs"], 100)
+    return players
+
+
+def make_log(path: str, n: int, players: int = 2000, seed: int = 0, chunk_rows: int = 1_000_000):
+    '''
+    Synthetic season: batter ids skewed towards low ids (tail players barely bat).
+    '''
+    rng = np.random.default_rng(seed)
+    log = np.lib.format.open_memmap(path, mode="w+", dtype=DELIVERY_DTYPE, shape=(n,))
+    for start in range(0, n, chunk_rows):
+        size = min(chunk_rows, n - start)
+        block = np.empty(size, dtype=DELIVERY_DTYPE)
+        batter = rng.zipf(1.3, size) - 1
+        tail = batter >= players
+        batter[tail] = rng.integers(0, players, int(tail.sum()))
+        block["batter"] = batter
+        block["wide"] = rng.random(size) < 0.03
+        block["runs"] = np.where(block["wide"], 0, rng.choice([0, 1, 2, 3, 4, 6], size=size,
+                                                              p=[0.4, 0.3, 0.08, 0.01, 0.15, 0.06]))
+        log[start:start + size] = block
+    log.flush()
+    del log
+
+
+def check(aggregator: SeasonAggregator, expected: dict):
+    for player_id, p in expected.items():
+        got = aggregator.player(player_id)
+        for name in TOTALS:
+            assert got[name] == p[name], (player_id, name, got[name], p[name])
+        for name in METRICS:
+            assert (got[name] is None) == (p[name] is None), (player_id, name)
+            assert got[name] is None or abs(got[name] - p[name]) < 1e-9, (player_id, name)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Streaming per-player season stats from delivery logs")
+    parser.add_argument("log", nargs="?", help="delivery log (.npy structured or CSV: batter, runs, wide)")
+    parser.add_argument("--demo", type=int, help="generate a synthetic log of N deliveries and benchmark it")
+    parser.add_argument("--players", type=int, default=2000, help="players in the synthetic log")
+    parser.add_argument("--chunk-rows", type=int, default=1_000_000)
+    parser.add_argument("--player", type=int, action="append", default=[], help="print this player's summary")
+    parser.add_argument("--watch", action="store_true", help="print --player summaries after every chunk")
+    parser.add_argument("--output", help="write the season table (CSV)")
+    parser.add_argument("--loop-sample", type=int, default=200_000, help="deliveries for the per-delivery baseline")
+    args = parser.parse_args()
+    if not args.log and not args.demo:
+        parser.error("give a delivery log or --demo N")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.log
+        if args.demo:
+            path = os.path.join(tmp, "deliveries.npy")
+            start = time.perf_counter()
+            make_log(path, args.demo, args.players)
+            print(f"generated {args.demo:,} deliveries in {time.perf_counter() - start:.2f}s")
+
+        start = time.perf_counter()
+        season = aggregate_log(path, args.chunk_rows, watch=args.player if args.watch else ())
+        elapsed = time.perf_counter() - start
+        print(f"aggregated {season.deliveries:,} deliveries for {len(season.active_players()):,} players in "
+              f"{elapsed:.2f}s · {season.deliveries / elapsed:,.0f} deliveries/s · peak RSS {peak_rss_mb():,.1f} MB")
+
+        if args.demo and args.loop_sample:
+            sample = np.load(path, mmap_mode="r")[:args.loop_sample]
+            start = time.perf_counter()
+            expected = loop_aggregate(sample)
+            loop_rate = len(sample) / (time.perf_counter() - start)
+            sample_season = SeasonAggregator()
+            sample_season.update(sample["batter"], sample["runs"], sample["wide"])
+            check(sample_season, expected)
+            print(f"per-delivery loop: {loop_rate:,.0f} deliveries/s "
+                  f"(aggregator {season.deliveries / elapsed / loop_rate:,.0f}x faster, same totals and metrics)")
+
+    for player_id in args.player:
+        print(f"player {player_id}: {season.summary(player_id)}  {season.player(player_id)}")
+    if args.output:
+        season.write_csv(args.output)
+        print(f"season table written to {args.output}")
@@ -17,7 +17,11 @@
 from langchain_core.messages import BaseMessage, SystemMessage, HumanMessage
 from langgraph.graph import StateGraph, START, END
 from langgraph.graph.message import add_messages
-from langchain_groq import ChatGroq
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from utils.llm import get_llm
+from utils.node_cache import NodeCache
 from typing import TypedDict, Annotated, List
 from langgraph.checkpoint.memory import MemorySaver, InMemorySaver
 import os
@@ -27,7 +31,11 @@ import operator
 
 dotenv.load_dotenv()
 
-llm = ChatGroq(model="llama-3.3-70b-versatile", api_key=os.getenv("GROQ_API_KEY"))
+llm = get_llm(model="llama-3.3-70b-versatile", api_key=os.getenv("GROQ_API_KEY"))
+
+# Set NODE_CACHE_PATH=node_cache.db to keep finished node outputs on disk, so a rerun
+# after `generate_explanation` fails does not call the LLM for `generate_joke` again.
+node_cache = NodeCache.from_env()
 
 class JokeState(TypedDict):
     topic: str
@@ -44,8 +52,8 @@ def generate_explanation(state: JokeState):
     return {"explaination": llm.invoke(f"Explain the joke {joke}").content}
 
 graph = StateGraph(JokeState)
-graph.add_node("generate_joke", generate_joke)
-graph.add_node("generate_explanation", generate_explanation)
+graph.add_node("generate_joke", node_cache.cached(generate_joke, inputs=["topic"], llm=llm))
+graph.add_node("generate_explanation", node_cache.cached(generate_explanation, inputs=["joke"], llm=llm))
 
 graph.add_edge(START, "generate_joke")
 graph.add_edge("generate_joke", "generate_explanation")
@@ -74,5 +82,7 @@ print('\n')
 print(app.get_state(config))
 print('\n')
 print(list(app.get_state_history(config)))
+if node_cache.enabled:
+    print(node_cache.stats())
 
 
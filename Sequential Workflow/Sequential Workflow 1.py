@@ -1,5 +1,8 @@
 from langgraph.graph import StateGraph, START, END
-from langchain_groq import ChatGroq
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from utils.llm import get_llm
 from langgraph.graph.message import add_messages
 from langchain_core.messages import HumanMessage, BaseMessage, SystemMessage
 from typing import TypedDict, Annotated
@@ -8,7 +11,7 @@ import dotenv
 
 dotenv.load_dotenv()
 
-llm = ChatGroq(model="llama-3.3-70b-versatile", api_key=os.getenv("GROQ_API_KEY"))
+llm = get_llm(model="llama-3.3-70b-versatile", api_key=os.getenv("GROQ_API_KEY"))
 
 class LLMState(TypedDict):
     query: str
@@ -1,5 +1,9 @@
 from langgraph.graph import StateGraph, START, END
-from langchain_groq import ChatGroq
+import sys
+from pathlib import Path
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from utils.llm import get_llm
+from utils.node_cache import NodeCache
 from langgraph.graph.message import add_messages
 from langchain_core.messages import HumanMessage, BaseMessage, SystemMessage
 from typing import TypedDict, Annotated
@@ -8,7 +12,10 @@ import dotenv
 
 dotenv.load_dotenv()
 
-llm = ChatGroq(model="llama-3.3-70b-versatile", api_key=os.getenv("GROQ_API_KEY"))
+llm = get_llm(model="llama-3.3-70b-versatile", api_key=os.getenv("GROQ_API_KEY"))
+
+# Set NODE_CACHE_PATH=node_cache.db to reuse finished stages when a run is retried
+node_cache = NodeCache.from_env()
 
 # ============================================================
 # Prompt Chaining Workflow
@@ -88,9 +95,9 @@ def polish_and_summarize(state: BlogState) -> BlogState:
 graph = StateGraph(BlogState)
 
 # Add nodes
-graph.add_node("generate_outline", generate_outline)
-graph.add_node("write_draft", write_draft)
-graph.add_node("polish_and_summarize", polish_and_summarize)
+graph.add_node("generate_outline", node_cache.cached(generate_outline, inputs=["topic"], llm=llm))
+graph.add_node("write_draft", node_cache.cached(write_draft, inputs=["outline"], llm=llm))
+graph.add_node("polish_and_summarize", node_cache.cached(polish_and_summarize, inputs=["draft"], llm=llm))
 
 # Chain the edges: START → outline → draft → polish → END
 graph.add_edge(START, "generate_outline")
@@ -107,4 +114,7 @@ result = app.invoke({"topic": "Why Epstein files are very scary?"})
 print("\n" + "=" * 50)
 print("FINAL RESULT")
 print("=" * 50)
-print(result['final_post'])
\ No newline at end of file
+print(result['final_post'])
+
+if node_cache.enabled:
+    print(node_cache.stats())
\ No newline at end of file
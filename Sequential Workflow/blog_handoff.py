@@ -0,0 +1,345 @@
+# ============================================================
+# Sequential Workflow — Streaming Handoff Between Chain Stages
+# ============================================================
+# In `Sequential Workflow 2.py` each stage waits for the previous
+# one to return its FULL text:
+#
+#   |--- outline ---|--- draft ---|--- polish ---|
+#
+# Opt-in handoff mode streams the outline and hands each outline
+# section downstream the moment it is complete:
+#
+#   |--- outline (streaming) ---|
+#       |-- draft §1 --|-- polish §1 --|
+#             |-- draft §2 --|-- polish §2 --|
+#                   |-- draft §3 --|-- polish §3 --|
+#                                  |-- summary --|
+#
+#   - A section is complete when the NEXT section heading starts
+#     (numbered / markdown / bold / roman-numeral lines) or the
+#     stream ends.
+#   - Each section is drafted and then polished on its own. The
+#     prompt asks for about SECTION_WORDS (60) words, so a typical
+#     5-section outline adds up to the plain chain's ~300-word post.
+#     There is no `max_tokens` cap, so no section is cut off
+#     mid-sentence; sections are short because there is less to
+#     write per call, and the last one finishes soon after the
+#     outline does.
+#   - The 2-3 sentence summary is written from the drafts while
+#     the last sections are still being polished.
+#   - SPECULATIVE: sections are launched from the partial stream.
+#     When the outline finishes it is re-split; any section whose
+#     final text differs from what was launched is cancelled and
+#     restarted (counted as a restart / wasted call).
+#
+# `--compare` counts output tokens (usage_metadata) for both modes,
+# so the gain is measured at EQUAL output length. The fake LLM
+# cannot follow a word count, so there every section call (also
+# with --handoff) gets a model that writes one outline line's share of a whole reply
+# (FAKE_LLM_LINE_TOKENS): 4 sections × 75 = the 300 tokens of a
+# whole stage.
+#
+# Usage (fake LLM: long replies with 4 sections of 75 tokens):
+#   LLM_BACKEND=fake FAKE_LLM_TOKENS=300 FAKE_LLM_LINE_TOKENS=75 FAKE_LLM_TPS=150 \
+#       python "Sequential Workflow/blog_handoff.py" --compare 5
+#   python "Sequential Workflow/blog_handoff.py" "Why sleep matters" --handoff
+# ============================================================
+
+import argparse
+import asyncio
+import os
+import re
+import sys
+import time
+from pathlib import Path
+from typing import List, TypedDict
+
+from langchain_core.messages import HumanMessage, SystemMessage
+from langgraph.graph import StateGraph, START, END
+import dotenv
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from utils.llm import FakeChatModel, get_llm, llm_backend
+
+dotenv.load_dotenv()
+
+llm = get_llm(model="llama-3.3-70b-versatile", api_key=os.getenv("GROQ_API_KEY"))
+
+SECTION_WORDS = 60       # length asked of one drafted section (~300 words over 5 sections)
+
+
+class BlogState(TypedDict):
+    topic: str
+    outline: str
+    draft: str
+    final_post: str
+
+
+# --- Prompts (same wording as Sequential Workflow 2.py) ---
+
+def outline_messages(topic: str):
+    return [
+        SystemMessage(content="You are an expert content strategist. Generate a clear, structured outline for a blog post."),
+        HumanMessage(content=f'Create a detailed outline for a blog post on: {topic}')
+    ]
+
+
+def draft_messages(outline: str):
+    return [
+        SystemMessage(content="You are a skilled blog writer. Write a compelling blog post based on the given outline. Keep it concise (around 300 words)."),
+        HumanMessage(content=f'Write a blog post based on this outline:\n\n{outline}')
+    ]
+
+
+def polish_messages(draft: str):
+    return [
+        SystemMessage(content="You are a professional editor. Polish the given blog draft for clarity, grammar, and flow. Then add a 2-3 sentence summary at the end."),
+        HumanMessage(content=f'Polish and summarize this blog draft:\n\n{draft}')
+    ]
+
+
+# --- Baseline graph: each stage waits for the previous one ---
+
+async def generate_outline(state: BlogState) -> dict:
+    return {"outline": (await llm.ainvoke(outline_messages(state["topic"]))).content}
+
+
+async def write_draft(state: BlogState) -> dict:
+    return {"draft": (await llm.ainvoke(draft_messages(state["outline"]))).content}
+
+
+async def polish_and_summarize(state: BlogState) -> dict:
+    return {"final_post": (await llm.ainvoke(polish_messages(state["draft"]))).content}
+
+
+graph = StateGraph(BlogState)
+graph.add_node("generate_outline", generate_outline)
+graph.add_node("write_draft", write_draft)
+graph.add_node("polish_and_summarize", polish_and_summarize)
+graph.add_edge(START, "generate_outline")
+graph.add_edge("generate_outline", "write_draft")
+graph.add_edge("write_draft", "polish_and_summarize")
+graph.add_edge("polish_and_summarize", END)
+app = graph.compile()
+
+
+# ============================================================
+# SECTION DETECTION ON A TOKEN STREAM
+# ============================================================
+
+HEADING = re.compile(r"^\s*(#{1,6}\s|\*\*|\d+[.)]\s|[IVXLC]+\.\s)")
+
+
+def split_sections(text: str) -> List[str]:
+    '''
+    Splits an outline into sections, each starting at a heading line.
+    Text before the first heading stays with the first section.
+    '''
+    sections, current = [], []
+    for line in text.split("\n"):
+        if HEADING.match(line) and any(l.strip() for l in current) and any(HEADING.match(l) for l in current):
+            sections.append("\n".join(current).strip())
+            current = []
+        current.append(line)
+    if any(l.strip() for l in current):
+        sections.append("\n".join(current).strip())
+    return sections
+
+
+class SectionStream:
+    '''
+    Feed streamed text in; get back sections as soon as they are complete.
+    '''
+
+    def __init__(self):
+        self.text = ""
+        self.emitted = 0
+
+    def feed(self, chunk: str) -> List[str]:
+        self.text += chunk
+        # Only complete lines can start a new heading
+        complete = self.text[:self.text.rfind("\n") + 1]
+        sections = split_sections(complete)
+        # The last section may still be growing
+        return self._take(sections[:-1])
+
+    def close(self) -> List[str]:
+        return self._take(split_sections(self.text))
+
+    def _take(self, sections: List[str]) -> List[str]:
+        new = sections[self.emitted:]
+        self.emitted = max(self.emitted, len(sections))
+        return new
+
+
+# ============================================================
+# HANDOFF RUNNER
+# ============================================================
+
+def output_tokens(message) -> int:
+    return (getattr(message, "usage_metadata", None) or {}).get("output_tokens", 0)
+
+
+async def _call(model, messages, stats: dict) -> str:
+    response = await model.ainvoke(messages)
+    stats["calls"] += 1
+    stats["output_tokens"] += output_tokens(response)
+    return response.content
+
+
+async def draft_and_polish(topic: str, section: str, model, stats: dict):
+    '''
+    Drafts one outline section, then polishes it. Returns (draft, polished).
+    '''
+    draft = await _call(model, [
+        SystemMessage(content=f"You are a skilled blog writer. Write ONE part of a blog post. Keep it to about {SECTION_WORDS} words, no heading, no introduction or conclusion unless the section asks for it."),
+        HumanMessage(content=f'Blog topic: {topic}\n\nWrite the part of the post covering this outline section:\n\n{section}')
+    ], stats)
+    polished = await _call(model, [
+        SystemMessage(content="You are a professional editor. Polish this part of a blog post for clarity, grammar, and flow. Return only the polished text."),
+        HumanMessage(content=draft)
+    ], stats)
+    return draft, polished
+
+
+async def run_handoff(topic: str, section_model=None) -> dict:
+    '''
+    Streaming-handoff version of `app.ainvoke({"topic": topic})`.
+    `section_model` (default: the same LLM) writes the sections and the summary.
+    '''
+    section_model = section_model or llm
+    stats = {"calls": 1, "output_tokens": 0, "sections": 0, "restarts": 0, "first_section_s": None}
+    start = time.perf_counter()
+    launched = []   # (section text, task)
+    started = []    # every task, cleaned up in `finally`
+
+    def spawn(coro) -> asyncio.Task:
+        task = asyncio.create_task(coro)
+        started.append(task)
+        return task
+
+    def launch(section: str):
+        if stats["first_section_s"] is None:
+            stats["first_section_s"] = round(time.perf_counter() - start, 3)
+        launched.append((section, spawn(draft_and_polish(topic, section, section_model, stats))))
+
+    try:
+        stream = SectionStream()
+        async for chunk in llm.astream(outline_messages(topic)):
+            stats["output_tokens"] += output_tokens(chunk)
+            for section in stream.feed(chunk.content):
+                launch(section)
+        for section in stream.close():
+            launch(section)
+        outline = stream.text
+        outline_s = time.perf_counter() - start
+
+        # Validate the speculation against the final outline
+        final_sections = split_sections(outline) or [outline]
+        tasks = []
+        for i, section in enumerate(final_sections):
+            if i < len(launched) and launched[i][0] == section:
+                tasks.append(launched[i][1])
+            else:
+                if i < len(launched):
+                    launched[i][1].cancel()
+                stats["restarts"] += 1
+                tasks.append(spawn(draft_and_polish(topic, section, section_model, stats)))
+        for _, task in launched[len(final_sections):]:
+            task.cancel()
+            stats["restarts"] += 1
+        stats["sections"] = len(final_sections)
+
+        # Summary from the drafts, while the polish calls finish
+        async def summarize():
+            drafts = []
+            for task in tasks:
+                drafts.append((await asyncio.shield(task))[0])
+            return await _call(section_model, [
+                SystemMessage(content="Write a 2-3 sentence summary of this blog post."),
+                HumanMessage(content="\n\n".join(drafts))
+            ], stats)
+
+        summary_task = spawn(summarize())
+        parts = await asyncio.gather(*tasks)
+        summary = await summary_task
+    finally:
+        # On a failed section (or outline), nothing else is left running or unretrieved
+        for task in started:
+            task.cancel()
+        await asyncio.gather(*started, return_exceptions=True)
+
+    draft = "\n\n".join(d for d, _ in parts)
+    final_post = "\n\n".join(p for _, p in parts) + f"\n\nSummary: {summary}"
+    stats.update(outline_s=round(outline_s, 3), total_s=round(time.perf_counter() - start, 3))
+    return {"topic": topic, "outline": outline, "draft": draft, "final_post": final_post, "handoff_stats": stats}
+
+
+async def run_baseline(topic: str) -> dict:
+    '''
+    Times each stage of the unmodified chain (same prompts as its nodes) and counts output tokens.
+    '''
+    stages, texts, tokens, text = {}, [], 0, topic
+    for name, messages in (("generate_outline", outline_messages), ("write_draft", draft_messages),
+                           ("polish_and_summarize", polish_messages)):
+        t = time.perf_counter()
+        response = await llm.ainvoke(messages(text))
+        stages[name] = round(time.perf_counter() - t, 3)
+        tokens += output_tokens(response)
+        text = response.content
+        texts.append(text)
+    return {"topic": topic, "outline": texts[0], "draft": texts[1], "final_post": texts[2],
+            "stage_s": stages, "total_s": round(sum(stages.values()), 3), "output_tokens": tokens}
+
+
+def fake_section_model():
+    '''
+    The fake LLM ignores the word count in the section prompt; give its section calls one
+    outline line's share of a whole reply, so both modes write the same amount.
+    '''
+    if llm_backend() != "fake":
+        return None
+    return FakeChatModel(model_name=llm.model_name, reply_tokens=llm.line_tokens)
+
+
+async def compare(n: int):
+    topics = [f"Topic {i}: lessons from {['AI', 'cricket', 'medicine', 'history'][i % 4]}" for i in range(n)]
+    section_model = fake_section_model()
+    base_total, hand_total, base_tokens, hand_tokens, restarts, calls = 0.0, 0.0, 0, 0, 0, 0
+    print(f"{'topic':>5} | {'sequential (s)':>14} | {'handoff (s)':>11} | {'1st section (s)':>15} | "
+          f"{'tokens seq / handoff':>20} | sections | restarts")
+    for i, topic in enumerate(topics):
+        base = await run_baseline(topic)
+        hand = await run_handoff(topic, section_model)
+        s = hand["handoff_stats"]
+        base_total += base["total_s"]
+        hand_total += s["total_s"]
+        base_tokens += base["output_tokens"]
+        hand_tokens += s["output_tokens"]
+        restarts += s["restarts"]
+        calls += s["calls"]
+        tokens = f"{base['output_tokens']} / {s['output_tokens']}"
+        print(f"{i:>5} | {base['total_s']:>14.3f} | {s['total_s']:>11.3f} | {s['first_section_s']:>15.3f} | "
+              f"{tokens:>20} | {s['sections']:>8} | {s['restarts']:>8}")
+    print(f"\nmean sequential {base_total / n:.3f}s · mean handoff {hand_total / n:.3f}s · "
+          f"saved {100 * (1 - hand_total / base_total):.1f}%")
+    print(f"output tokens per post {base_tokens / n:.0f} sequential vs {hand_tokens / n:.0f} handoff · "
+          f"LLM calls per post {calls / n:.1f} (vs 3) · restarts {restarts}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Blog chain with streaming handoff between stages")
+    parser.add_argument("topic", nargs="?", default="Why Epstein files are very scary?")
+    parser.add_argument("--handoff", action="store_true", help="use the streaming handoff runner")
+    parser.add_argument("--compare", type=int, metavar="N", help="time sequential vs handoff on N topics")
+    args = parser.parse_args()
+
+    if args.compare:
+        asyncio.run(compare(args.compare))
+    elif args.handoff:
+        result = asyncio.run(run_handoff(args.topic, fake_section_model()))
+        print(result["final_post"])
+        print(result["handoff_stats"])
+    else:
+        result = asyncio.run(app.ainvoke({"topic": args.topic}))
+        print(result["final_post"])
@@ -0,0 +1,261 @@
+# ============================================================
+# Sequential Workflow — Stage-Pipelined Blog Prompt Chain
+# ============================================================
+# `Sequential Workflow 2.py` runs one topic through
+#   generate_outline → write_draft → polish_and_summarize
+# and every stage waits while the others work. For hundreds of
+# topics we pipeline the chain like an assembly line:
+#
+#   topics ─→ [queue] ─→ outline workers ─→ [queue] ─→ draft workers ─→ [queue] ─→ polish workers ─→ results
+#
+#   - Each stage has its own bounded asyncio.Queue and worker pool.
+#   - Topic B's outline is generated while topic A is drafted.
+#   - Bounded queues give backpressure: a fast stage blocks on
+#     `put()` instead of piling up work for a slow one.
+#   - Throughput approaches the rate of the SLOWEST stage
+#     (workers / stage latency) instead of 1 / (sum of stages).
+#
+# Metrics per stage: processed, avg / max queue depth, queue wait
+# and service latency (p50 / p95), and worker utilization.
+#
+# Usage:
+#   LLM_BACKEND=fake python "Sequential Workflow/blog_pipeline.py" --demo 50 --workers 4 4 4 --baseline
+#   python "Sequential Workflow/blog_pipeline.py" topics.txt --output posts.jsonl
+# ============================================================
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List, TypedDict
+
+from langchain_core.messages import HumanMessage, SystemMessage
+from langgraph.graph import StateGraph, START, END
+import dotenv
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from utils.llm import get_llm
+
+dotenv.load_dotenv()
+
+llm = get_llm(model="llama-3.3-70b-versatile", api_key=os.getenv("GROQ_API_KEY"))
+
+
+class BlogState(TypedDict):
+    topic: str
+    outline: str
+    draft: str
+    final_post: str
+
+
+# --- Same three prompts as Sequential Workflow 2.py (prints removed) ---
+
+async def generate_outline(state: BlogState) -> dict:
+    response = await llm.ainvoke([
+        SystemMessage(content="You are an expert content strategist. Generate a clear, structured outline for a blog post."),
+        HumanMessage(content=f'Create a detailed outline for a blog post on: {state["topic"]}')
+    ])
+    return {"outline": response.content}
+
+
+async def write_draft(state: BlogState) -> dict:
+    response = await llm.ainvoke([
+        SystemMessage(content="You are a skilled blog writer. Write a compelling blog post based on the given outline. Keep it concise (around 300 words)."),
+        HumanMessage(content=f'Write a blog post based on this outline:\n\n{state["outline"]}')
+    ])
+    return {"draft": response.content}
+
+
+async def polish_and_summarize(state: BlogState) -> dict:
+    response = await llm.ainvoke([
+        SystemMessage(content="You are a professional editor. Polish the given blog draft for clarity, grammar, and flow. Then add a 2-3 sentence summary at the end."),
+        HumanMessage(content=f'Polish and summarize this blog draft:\n\n{state["draft"]}')
+    ])
+    return {"final_post": response.content}
+
+
+STAGES = [generate_outline, write_draft, polish_and_summarize]
+
+
+# --- The unpipelined graph, used as the baseline ---
+graph = StateGraph(BlogState)
+graph.add_node("generate_outline", generate_outline)
+graph.add_node("write_draft", write_draft)
+graph.add_node("polish_and_summarize", polish_and_summarize)
+graph.add_edge(START, "generate_outline")
+graph.add_edge("generate_outline", "write_draft")
+graph.add_edge("write_draft", "polish_and_summarize")
+graph.add_edge("polish_and_summarize", END)
+app = graph.compile()
+
+
+# ============================================================
+# PIPELINE
+# ============================================================
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))]
+
+
+class Stage:
+    '''
+    One step of the chain: a bounded input queue and a pool of workers.
+    '''
+
+    def __init__(self, fn: Callable, workers: int, queue_size: int):
+        self.name = fn.__name__
+        self.fn = fn
+        self.workers = workers
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.processed = 0
+        self.failed = 0
+        self.depth_samples = []
+        self.wait_times = []
+        self.service_times = []
+
+    async def put(self, item):
+        self.depth_samples.append(self.queue.qsize())
+        await self.queue.put((time.perf_counter(), item))
+
+    def report(self, elapsed: float) -> dict:
+        busy = sum(self.service_times)
+        return {
+            "stage": self.name,
+            "workers": self.workers,
+            "processed": self.processed,
+            "failed": self.failed,
+            "avg_queue_depth": round(sum(self.depth_samples) / len(self.depth_samples), 2) if self.depth_samples else 0.0,
+            "max_queue_depth": max(self.depth_samples, default=0),
+            "wait_p50_s": round(percentile(self.wait_times, 50), 3),
+            "wait_p95_s": round(percentile(self.wait_times, 95), 3),
+            "service_p50_s": round(percentile(self.service_times, 50), 3),
+            "service_p95_s": round(percentile(self.service_times, 95), 3),
+            "utilization": round(busy / (elapsed * self.workers), 2) if elapsed else 0.0,
+        }
+
+
+_DONE = object()
+
+
+async def run_pipeline(topics: List[str], workers=(4, 4, 4), queue_size: int = 8, on_result=None) -> dict:
+    '''
+    Pushes every topic through the three stages concurrently.
+
+    `on_result(state)` is called as each post finishes (completion order),
+    including failed posts, which carry an "error" key.
+    Returns {"results": [...], "stages": [...], "seconds": ..., "posts_per_min": ...}.
+    '''
+    stages = [Stage(fn, n, queue_size) for fn, n in zip(STAGES, workers)]
+    results = []
+
+    async def worker(index: int):
+        stage = stages[index]
+        while True:
+            enqueued_at, state = await stage.queue.get()
+            if state is _DONE:
+                return
+            stage.wait_times.append(time.perf_counter() - enqueued_at)
+            start = time.perf_counter()
+            try:
+                state = {**state, **await stage.fn(state)}
+            except Exception as e:
+                # A failed post leaves the pipeline here instead of stalling it
+                stage.failed += 1
+                failed = {**state, "error": f"{stage.name}: {type(e).__name__}: {e}"}
+                results.append(failed)
+                if on_result:
+                    on_result(failed)
+                continue
+            finally:
+                stage.service_times.append(time.perf_counter() - start)
+            stage.processed += 1
+
+            if index + 1 < len(stages):
+                await stages[index + 1].put(state)
+            else:
+                results.append(state)
+                if on_result:
+                    on_result(state)
+
+    start = time.perf_counter()
+    pools = [[asyncio.create_task(worker(i)) for _ in range(stage.workers)] for i, stage in enumerate(stages)]
+
+    for topic in topics:
+        await stages[0].put({"topic": topic})
+
+    # Drain stage by stage: once a stage's workers exit, nothing more reaches the next one
+    for stage, pool in zip(stages, pools):
+        for _ in pool:
+            await stage.queue.put((time.perf_counter(), _DONE))
+        await asyncio.gather(*pool)
+
+    elapsed = time.perf_counter() - start
+    return {
+        "results": results,
+        "stages": [stage.report(elapsed) for stage in stages],
+        "seconds": round(elapsed, 3),
+        "posts_per_min": round(len(topics) / elapsed * 60, 1) if elapsed else 0.0,
+    }
+
+
+async def run_baseline(topics: List[str]) -> float:
+    '''
+    One `app.ainvoke()` per topic, strictly in sequence.
+    '''
+    start = time.perf_counter()
+    for topic in topics:
+        await app.ainvoke({"topic": topic})
+    return time.perf_counter() - start
+
+
+async def main(args):
+    if args.demo:
+        topics = [f"Topic {i}: the future of {['AI', 'cricket', 'healthcare', 'education'][i % 4]}" for i in range(args.demo)]
+    else:
+        with open(args.topics) as f:
+            topics = [line.strip() for line in f if line.strip()]
+
+    out = open(args.output, "w") if args.output else None
+
+    def write(state):
+        if out:
+            out.write(json.dumps(state) + "\n")
+            out.flush()
+
+    report = await run_pipeline(topics, workers=args.workers, queue_size=args.queue_size, on_result=write)
+    if out:
+        out.close()
+
+    failed = sum("error" in r for r in report["results"])
+    print(f"\nPipelined: {len(topics)} posts in {report['seconds']}s ({report['posts_per_min']} posts/min), "
+          f"{failed} failed")
+    for stage in report["stages"]:
+        print("  ", stage)
+
+    if args.baseline:
+        sample = topics[:args.baseline_sample]
+        seconds = await run_baseline(sample) * len(topics) / len(sample)
+        note = "" if len(sample) == len(topics) else f" (extrapolated from {len(sample)})"
+        print(f"Sequential: {seconds:.2f}s{note} → pipelined speedup {seconds / report['seconds']:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pipelined blog generation for many topics")
+    parser.add_argument("topics", nargs="?", help="text file with one topic per line")
+    parser.add_argument("--demo", type=int, help="generate N demo topics instead of reading a file")
+    parser.add_argument("--output", help="JSONL file, one finished post per line")
+    parser.add_argument("--workers", type=int, nargs=3, default=[4, 4, 4], metavar=("OUTLINE", "DRAFT", "POLISH"))
+    parser.add_argument("--queue-size", type=int, default=8)
+    parser.add_argument("--baseline", action="store_true", help="also time the unpipelined graph")
+    parser.add_argument("--baseline-sample", type=int, default=10)
+    args = parser.parse_args()
+    if not args.topics and not args.demo:
+        parser.error("give a topics file or --demo N")
+
+    asyncio.run(main(args))
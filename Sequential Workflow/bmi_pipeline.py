@@ -0,0 +1,63 @@
+# ============================================================
+# Sequential Workflow — Chunked BMI Ingestion Pipeline
+# ============================================================
+# Streams a CSV / Parquet / .npy file with `weight` and `height`
+# columns through the vectorized `calculate_bmi → label_bmi`
+# graph from `bmi_batch.py`, one chunk at a time, and appends
+# `bmi` + `category` to an output CSV. Memory stays flat no
+# matter how large the input is, and an interrupted run resumes
+# from the last completed chunk (see utils/chunked_pipeline.py).
+#
+# Usage:
+#   python "Sequential Workflow/bmi_pipeline.py" --make-sample 5000000 people.csv
+#   python "Sequential Workflow/bmi_pipeline.py" people.csv people_bmi.csv --chunk-rows 200000 --mmap
+# ============================================================
+
+import argparse
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from utils.chunked_pipeline import run_pipeline
+
+from bmi_batch import CATEGORIES, make_population, score_bmi
+
+INPUT_COLUMNS = ["weight", "height"]
+
+
+def process_chunk(columns: dict) -> dict:
+    result = score_bmi(columns["weight"], columns["height"])
+    return {"bmi": np.round(result["bmi"], 4), "category": CATEGORIES[result["category_code"]]}
+
+
+def make_sample(path: str, rows: int, chunk_rows: int = 1_000_000):
+    '''
+    Writes a synthetic population CSV without holding it all in memory.
+    '''
+    with open(path, "w") as f:
+        f.write("weight,height\n")
+        for seed, start in enumerate(range(0, rows, chunk_rows)):
+            weight, height = make_population(min(chunk_rows, rows - start), seed=seed)
+            np.savetxt(f, np.column_stack([weight, height]), delimiter=",", fmt="%.3f")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Chunked BMI scoring for large files")
+    parser.add_argument("input")
+    parser.add_argument("output", nargs="?", help="output CSV (not needed with --make-sample)")
+    parser.add_argument("--chunk-rows", type=int, default=100_000)
+    parser.add_argument("--mmap", action="store_true", help="memory-map the input file")
+    parser.add_argument("--no-resume", action="store_true", help="start over instead of resuming")
+    parser.add_argument("--make-sample", type=int, metavar="ROWS", help="write a synthetic input CSV and exit")
+    args = parser.parse_args()
+
+    if args.make_sample:
+        make_sample(args.input, args.make_sample)
+    else:
+        if not args.output:
+            parser.error("give an OUTPUT path (only --make-sample runs without one)")
+        stats = run_pipeline(args.input, args.output, process_chunk, INPUT_COLUMNS,
+                             chunk_rows=args.chunk_rows, mmap_input=args.mmap, resume=not args.no_resume)
+        print(stats)
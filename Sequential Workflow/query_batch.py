@@ -0,0 +1,217 @@
+# ============================================================
+# Sequential Workflow — Rate-Limited Batch Runner for llm_query
+# ============================================================
+# `Sequential Workflow 1.py` answers ONE query per `app.invoke`.
+# This runner pushes thousands of queries through the same
+# single-node graph:
+#
+#   queries ─→ [bounded queue] ─→ N async workers ─→ app.ainvoke ─→ output (completion order)
+#                                        │
+#                                        └─ RateLimiter: requests/min + tokens/min
+#
+#   - At most `--concurrency` queries are in flight.
+#   - Before every LLM call the limiter reserves 1 request and an
+#     ESTIMATED token count (prompt chars / 4 + `--max-tokens`);
+#     after the call the estimate is corrected from the real usage.
+#   - HTTP 429 (and 5xx) errors are retried with exponential
+#     backoff + full jitter (Retry-After is honoured).
+#   - Each finished query is appended to the output JSONL as soon
+#     as it completes, so a long job can be watched with `tail -f`.
+#
+# Report: achieved QPS, latency p50 / p95 / p99 (queue → answer),
+# retries, failures, and seconds spent throttled by the limiter.
+#
+# Usage:
+#   LLM_BACKEND=fake FAKE_LLM_ERROR_RATE=0.05 \
+#       python "Sequential Workflow/query_batch.py" --demo 200 --rpm 600 --tpm 60000
+#   python "Sequential Workflow/query_batch.py" queries.txt --output answers.jsonl
+# ============================================================
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Iterable, List, Optional, TypedDict
+
+from langchain_core.messages import HumanMessage, SystemMessage
+from langgraph.graph import StateGraph, START, END
+import dotenv
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from utils.llm import get_llm
+from utils.rate_limit import RateLimiter, with_backoff
+
+dotenv.load_dotenv()
+
+llm = get_llm(model="llama-3.3-70b-versatile", api_key=os.getenv("GROQ_API_KEY"))
+
+# Groq free-tier limits for llama-3.3-70b-versatile; override per account
+DEFAULT_RPM = float(os.getenv("GROQ_RPM", "30"))
+DEFAULT_TPM = float(os.getenv("GROQ_TPM", "12000"))
+DEFAULT_MAX_TOKENS = 512
+
+
+class LLMState(TypedDict):
+    query: str
+    response: str
+    tokens: int
+    attempts: int
+
+
+def build_app(limiter: RateLimiter, max_tokens: int = DEFAULT_MAX_TOKENS, stats: Optional[dict] = None):
+    '''
+    Same graph as `Sequential Workflow 1.py`, with the LLM call behind the limiter.
+    '''
+    model = llm.bind(max_tokens=max_tokens)
+    stats = stats if stats is not None else {}
+
+    async def llm_query(state: LLMState) -> dict:
+        messages = [SystemMessage(content="You are a helpful assistant."), HumanMessage(content=state["query"])]
+        estimate = sum(len(m.content) for m in messages) // 4 + max_tokens
+        attempts = 0
+
+        async def call():
+            nonlocal attempts
+            attempts += 1
+            await limiter.acquire(estimate)
+            try:
+                response = await model.ainvoke(messages)
+            except Exception:
+                # A rejected request used no tokens; keep the request slot spent
+                limiter.settle(estimate, 0)
+                raise
+            usage = response.usage_metadata or {}
+            limiter.settle(estimate, usage.get("total_tokens"))
+            return response
+
+        def on_retry(error, delay):
+            stats["retries"] = stats.get("retries", 0) + 1
+
+        response = await with_backoff(call, on_retry=on_retry)
+        usage = response.usage_metadata or {}
+        return {"response": response.content, "tokens": usage.get("total_tokens", 0), "attempts": attempts}
+
+    graph = StateGraph(LLMState)
+    graph.add_node("llm_query", llm_query)
+    graph.add_edge(START, "llm_query")
+    graph.add_edge("llm_query", END)
+    return graph.compile()
+
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))]
+
+
+_DONE = object()
+
+
+async def run_batch(queries: Iterable[str], output: Optional[str] = None, concurrency: int = 8,
+                    rpm: float = DEFAULT_RPM, tpm: float = DEFAULT_TPM,
+                    max_tokens: int = DEFAULT_MAX_TOKENS, verbose: bool = True) -> dict:
+    '''
+    Answers every query with at most `concurrency` in flight, within `rpm` / `tpm`.
+
+    Results are written to `output` (JSONL) in completion order.
+    '''
+    limiter = RateLimiter(rpm, tpm)
+    stats = {"retries": 0}
+    batch_app = build_app(limiter, max_tokens, stats)
+    queue = asyncio.Queue(maxsize=concurrency * 2)
+    latencies, failed, tokens, done = [], 0, 0, 0
+    out = open(output, "w") if output else None
+
+    async def worker():
+        nonlocal failed, tokens, done
+        while True:
+            item = await queue.get()
+            if item is _DONE:
+                return
+            index, query, enqueued_at = item
+            record = {"index": index, "query": query}
+            try:
+                result = await batch_app.ainvoke({"query": query})
+                record.update(response=result["response"], tokens=result["tokens"], attempts=result["attempts"])
+                tokens += result["tokens"]
+            except Exception as e:
+                failed += 1
+                record["error"] = f"{type(e).__name__}: {e}"
+            latency = time.perf_counter() - enqueued_at
+            latencies.append(latency)
+            record["latency_s"] = round(latency, 3)
+            done += 1
+            if out:
+                out.write(json.dumps(record) + "\n")
+                out.flush()
+            if verbose and done % 100 == 0:
+                print(f"  {done} done · {done / (time.perf_counter() - start):.2f} QPS · "
+                      f"throttled {limiter.throttled_seconds:.1f}s")
+
+    start = time.perf_counter()
+    workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+    total = 0
+    for index, query in enumerate(queries):
+        await queue.put((index, query, time.perf_counter()))
+        total += 1
+    for _ in workers:
+        await queue.put(_DONE)
+    await asyncio.gather(*workers)
+    elapsed = time.perf_counter() - start
+    if out:
+        out.close()
+
+    return {
+        "queries": total,
+        "failed": failed,
+        "retries": stats["retries"],
+        "tokens": tokens,
+        "seconds": round(elapsed, 3),
+        "qps": round(total / elapsed, 2) if elapsed else 0.0,
+        "latency_p50_s": round(percentile(latencies, 50), 3),
+        "latency_p95_s": round(percentile(latencies, 95), 3),
+        "latency_p99_s": round(percentile(latencies, 99), 3),
+        "throttled_s": round(limiter.throttled_seconds, 3),
+        "throttled_requests_s": round(limiter.requests.throttled_seconds, 3),
+        "throttled_tokens_s": round(limiter.tokens.throttled_seconds, 3),
+    }
+
+
+def read_queries(path: str):
+    '''
+    One query per line; JSONL lines with a "query" field also work.
+    '''
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith("{"):
+                line = json.loads(line)["query"]
+            yield line
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rate-limited batch runner for the llm_query graph")
+    parser.add_argument("queries", nargs="?", help="text / JSONL file with one query per line")
+    parser.add_argument("--demo", type=int, help="generate N demo queries instead of reading a file")
+    parser.add_argument("--output", default="answers.jsonl", help="JSONL output, one answer per line")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--rpm", type=float, default=DEFAULT_RPM, help="requests per minute")
+    parser.add_argument("--tpm", type=float, default=DEFAULT_TPM, help="tokens per minute")
+    parser.add_argument("--max-tokens", type=int, default=DEFAULT_MAX_TOKENS, help="completion cap per query")
+    args = parser.parse_args()
+    if not args.queries and not args.demo:
+        parser.error("give a queries file or --demo N")
+
+    if args.demo:
+        queries = (f"What is the capital of country #{i}?" for i in range(args.demo))
+    else:
+        queries = read_queries(args.queries)
+
+    report = asyncio.run(run_batch(queries, args.output, args.concurrency, args.rpm, args.tpm, args.max_tokens))
+    print(json.dumps(report, indent=2))
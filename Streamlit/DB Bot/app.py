@@ -1,9 +1,9 @@
 import os
+import sys
 from pathlib import Path
 from langgraph.graph import StateGraph, START, END
 from typing import List, TypedDict, Annotated
 from langchain_core.messages import BaseMessage, HumanMessage, AIMessage
-from langchain_groq import ChatGroq
 from langgraph.graph.message import add_messages
 from langgraph.checkpoint.sqlite import SqliteSaver
 from dotenv import load_dotenv
@@ -13,18 +13,27 @@ import sqlite3
 env_path = Path(__file__).resolve().parent.parent.parent / ".env"
 load_dotenv(dotenv_path=env_path)
 
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
+from utils.llm import get_llm
+from utils.history import make_summarize_node, with_summary
+from utils.response_cache import ResponseCache
+
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 
-llm = ChatGroq(model="llama-3.3-70b-versatile", temperature=0.2, api_key=GROQ_API_KEY)
+llm = get_llm(model="llama-3.3-70b-versatile", temperature=0.2, api_key=GROQ_API_KEY)
+
+# Memory tier + a `response_cache` table inside chatbot.db
+response_cache = ResponseCache(sqlite_path="chatbot.db")
 
 class ChatBot(TypedDict):
     messages: Annotated[List[BaseMessage], add_messages]
+    summary: str
     
     
 def chat_node(state: ChatBot) -> ChatBot:
-    messages = state["messages"]
+    messages = with_summary(state["messages"], state.get("summary", ""))
     
-    response = llm.invoke(messages)
+    response = response_cache.invoke(llm, messages)
     
     return {
         "messages": [response]
@@ -37,9 +46,11 @@ checkpointer = SqliteSaver(conn=conn)
 
 graph = StateGraph(ChatBot)
 
+graph.add_node('summarize_history', make_summarize_node(llm))
 graph.add_node('chat_node', chat_node)
 
-graph.add_edge(START, 'chat_node')
+graph.add_edge(START, 'summarize_history')
+graph.add_edge('summarize_history', 'chat_node')
 graph.add_edge('chat_node', END)
 
 app = graph.compile(checkpointer=checkpointer)
@@ -196,8 +196,8 @@ if user_input:
                 config=CONFIG,
                 stream_mode="messages"
             ):
-                if isinstance(message_chunk, AIMessage):
-                    # yield only assistant tokens
+                if isinstance(message_chunk, AIMessage) and metadata["langgraph_node"] == "chat_node":
+                    # yield only assistant tokens (skip the history summarizer)
                     yield message_chunk.content
 
         ai_message = st.write_stream(ai_only_stream())
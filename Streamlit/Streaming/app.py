@@ -1,6 +1,6 @@
 import streamlit as st
 from langchain_core.messages import HumanMessage, AIMessage
-from Bot import app
+from Bot import app, response_cache
 import uuid
 
 # ─────────────────────────────────────────────
@@ -177,6 +177,10 @@ with st.sidebar:
         <div class="label">Messages in Thread</div>
         <div class="value">💬 {len(st.session_state.chat_history)}</div>
     </div>
+    <div class="info-card">
+        <div class="label">Response Cache (hits / misses)</div>
+        <div class="value">⚡ {response_cache.hits} / {response_cache.misses} · {response_cache.saved_seconds:.1f}s saved</div>
+    </div>
     """, unsafe_allow_html=True)
 
     st.markdown("---")
@@ -0,0 +1,10 @@
+# ============================================================
+# Shared helpers used by the workflow scripts in this repo.
+# ============================================================
+# Scripts live in folders with spaces in their names, so they
+# cannot import each other. Anything reused across folders goes
+# here instead; scripts add the repo root to `sys.path` first:
+#
+#   sys.path.append(str(Path(__file__).resolve().parent.parent))
+#   from utils.history import make_summarize_node
+# ============================================================
@@ -0,0 +1,182 @@
+# ============================================================
+# Cheap-First Cascade for LLM Classifier Nodes
+# ============================================================
+# A node like `find_sentiment` spends a full structured-LLM round
+# trip choosing one label, even for reports whose label is
+# obvious. A cascade puts a LOCAL classifier (no network) in front:
+#
+#   label, confidence = local(state)
+#   confidence >= threshold → use the local label       (no LLM call)
+#   confidence <  threshold → ESCALATE: run the LLM node (original)
+#
+#   find_sentiment = Cascade(LexicalSentimentClassifier(), find_sentiment,
+#                            key="sentiment", threshold=0.75)
+#
+# Recorded in `stats()`:
+#   escalation_rate  share of calls that still needed the LLM
+#   agreement        how often the local guess matched the LLM, on
+#                    escalations and on an optional AUDIT sample of
+#                    confident calls (`audit_rate`) that are also
+#                    sent to the LLM, so the threshold can be tuned
+#                    from data
+#   llm / local seconds
+#
+# `LexicalSentimentClassifier` scores weighted medical cue phrases
+# ("chest pain", "within normal limits", ...), flips cues that
+# follow a negation ("no evidence of tumor"), and turns the margin
+# between positive and negative evidence into a confidence.
+# ============================================================
+
+import asyncio
+import os
+import random
+import re
+import threading
+import time
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+DEFAULT_THRESHOLD = float(os.getenv("CASCADE_THRESHOLD", "0.75"))
+DEFAULT_AUDIT_RATE = float(os.getenv("CASCADE_AUDIT_RATE", "0.0"))
+
+NEGATIVE_CUES = {
+    "pain": 1.0, "chest pain": 1.5, "shortness of breath": 1.5, "elevated": 0.8, "abnormal": 1.0,
+    "disease": 1.0, "tumor": 2.0, "tumour": 2.0, "malignant": 2.5, "carcinoma": 2.5, "cancer": 2.5,
+    "metasta": 2.5, "fracture": 1.5, "infection": 1.0, "severe": 1.5, "acute": 1.0, "deteriorat": 1.5,
+    "worsen": 1.5, "critical": 2.0, "lesion": 1.0, "hypertensi": 1.0, "diabet": 1.0, "pre-diabetic": 1.0,
+    "hyperlipidemia": 1.0, "failure": 1.5, "emergency": 1.5, "urgent": 1.5, "immediate": 1.0, "bleeding": 1.5,
+    "st-segment depression": 1.5, "ischemi": 2.0, "stroke": 2.5, "pneumonia": 1.5, "anemi": 1.0,
+    "inflammation": 1.0, "swelling": 0.8, "fever": 0.8, "high risk": 1.5, "poor": 1.0, "complication": 1.5,
+}
+POSITIVE_CUES = {
+    "normal": 1.0, "within normal limits": 2.0, "healthy": 1.5, "unremarkable": 1.5, "improved": 1.5,
+    "improving": 1.5, "recovered": 1.5, "recovery": 1.0, "resolved": 1.5, "stable": 0.8, "excellent": 1.5,
+    "good": 0.8, "clear": 0.8, "benign": 1.5, "discharged": 1.0, "no abnormalit": 2.0, "fit": 0.8,
+    "well-controlled": 1.5, "well controlled": 1.5, "no significant": 1.5, "negative for": 1.0,
+}
+NEGATIONS = re.compile(r"\b(no|not|without|denies|negative for|free of|absence of|ruled out)\b(\W+\w+){0,3}\W*$")
+
+
+class LexicalSentimentClassifier:
+    '''
+    Weighted cue phrases → (label, confidence), with simple negation handling.
+    '''
+
+    def __init__(self, negative: Dict[str, float] = NEGATIVE_CUES, positive: Dict[str, float] = POSITIVE_CUES,
+                 min_evidence: float = 1.0):
+        self.negative = negative
+        self.positive = positive
+        self.min_evidence = min_evidence
+        self.patterns = [(re.compile(r"\b" + re.escape(cue)), cue, weight, polarity)
+                         for polarity, cues in ((-1, negative), (1, positive)) for cue, weight in cues.items()]
+
+    def scores(self, text: str) -> Tuple[float, float]:
+        text = text.lower()
+        pos = neg = 0.0
+        for pattern, cue, weight, polarity in self.patterns:
+            for match in pattern.finditer(text):
+                negated = NEGATIONS.search(text[max(0, match.start() - 40):match.start()])
+                # A negated negative cue ("no tumor") is mild positive evidence, and vice versa
+                sign, w = polarity, weight
+                if negated and cue not in ("negative for", "no abnormalit", "no significant"):
+                    sign, w = -polarity, weight * 0.5
+                if sign > 0:
+                    pos += w
+                else:
+                    neg += w
+        return pos, neg
+
+    def __call__(self, text: str) -> Tuple[str, float]:
+        pos, neg = self.scores(text)
+        evidence, margin = pos + neg, pos - neg
+        if evidence < self.min_evidence:
+            # Nothing clinical either way: a weak "neutral"
+            return "neutral", 0.5
+        confidence = abs(margin) / (evidence + 1.0)
+        if confidence < 0.25:
+            # Strong evidence on both sides: mixed report
+            return "neutral", 0.5 + (0.25 - confidence)
+        return ("positive" if margin > 0 else "negative"), round(confidence, 3)
+
+
+class Cascade:
+    '''
+    Node wrapper: local classifier first, the original LLM node only when unsure.
+    '''
+
+    def __init__(self, classifier: Callable[[str], Tuple[str, float]], llm_node: Callable[[dict], dict],
+                 key: str, text_key: str = "review", threshold: float = DEFAULT_THRESHOLD,
+                 audit_rate: float = DEFAULT_AUDIT_RATE, seed: Optional[int] = None,
+                 allm_node: Optional[Callable[[dict], Awaitable[dict]]] = None):
+        self.classifier = classifier
+        self.llm_node = llm_node
+        self.allm_node = allm_node
+        self.key = key
+        self.text_key = text_key
+        self.threshold = threshold
+        self.audit_rate = audit_rate
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.__name__ = getattr(llm_node, "__name__", "cascade")
+        self.counts = {"calls": 0, "local": 0, "escalated": 0, "audited": 0, "compared": 0, "agreed": 0}
+        self.seconds = {"local_seconds": 0.0, "llm_seconds": 0.0}
+
+    def _record(self, **deltas):
+        with self.lock:
+            for name, delta in deltas.items():
+                if name in self.seconds:
+                    self.seconds[name] += delta
+                else:
+                    self.counts[name] += delta
+
+    def _decide(self, state: dict) -> Tuple[str, bool, bool]:
+        '''
+        Runs the local classifier; returns (label, confident, audit).
+        '''
+        start = time.perf_counter()
+        label, confidence = self.classifier(state[self.text_key])
+        self._record(calls=1, local_seconds=time.perf_counter() - start)
+        confident = confidence >= self.threshold
+        audit = confident and self.audit_rate > 0 and self.rng.random() < self.audit_rate
+        if confident and not audit:
+            self._record(local=1)
+        return label, confident, audit
+
+    def _finish(self, label: str, confident: bool, audit: bool, result: dict, seconds: float) -> dict:
+        self._record(llm_seconds=seconds, compared=1, agreed=int(result[self.key] == label),
+                     escalated=int(not confident), audited=int(audit), local=int(audit))
+        # An audited call keeps the local label, so the audit never changes routing
+        return {self.key: label} if audit else result
+
+    def __call__(self, state: dict) -> dict:
+        label, confident, audit = self._decide(state)
+        if confident and not audit:
+            return {self.key: label}
+        start = time.perf_counter()
+        result = self.llm_node(state)
+        return self._finish(label, confident, audit, result, time.perf_counter() - start)
+
+    async def acall(self, state: dict) -> dict:
+        '''
+        Async version; escalates to `allm_node` (or `llm_node` in a thread).
+        '''
+        label, confident, audit = self._decide(state)
+        if confident and not audit:
+            return {self.key: label}
+        start = time.perf_counter()
+        if self.allm_node is not None:
+            result = await self.allm_node(state)
+        else:
+            result = await asyncio.to_thread(self.llm_node, state)
+        return self._finish(label, confident, audit, result, time.perf_counter() - start)
+
+    def stats(self) -> dict:
+        with self.lock:
+            c, s = dict(self.counts), dict(self.seconds)
+        return {
+            **c,
+            "threshold": self.threshold,
+            "escalation_rate": round(c["escalated"] / c["calls"], 3) if c["calls"] else 0.0,
+            "agreement": round(c["agreed"] / c["compared"], 3) if c["compared"] else None,
+            "local_seconds": round(s["local_seconds"], 4),
+            "llm_seconds": round(s["llm_seconds"], 3),
+        }
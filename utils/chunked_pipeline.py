@@ -0,0 +1,229 @@
+# ============================================================
+# Chunked Streaming Ingestion for Pure-Compute Graphs
+# ============================================================
+# Feeds a CSV / Parquet / .npy file of ANY size through a graph
+# without ever loading it whole:
+#
+#   read chunk (generator) → process_chunk(columns) → append to CSV
+#          ↑                                               │
+#          └──────── progress file (resume point) ─────────┘
+#
+#   - Input is read `chunk_rows` rows at a time, so peak memory
+#     depends on the chunk size, not on the file size.
+#   - `mmap_input=True` memory-maps CSV / .npy input instead of
+#     reading through a buffered file.
+#   - After every chunk the output is flushed + fsync'ed and
+#     `<output>.progress` records: chunks done, rows done, input
+#     byte offset and output byte size. On restart the output is
+#     truncated back to that size (dropping any half-written
+#     chunk) and reading resumes at the recorded offset.
+#
+# `process_chunk` takes {column: np.ndarray} and returns
+# {column: array-like}. Use a vectorized graph directly (see
+# `bmi_pipeline.py`), or wrap a per-row graph with
+# `graph_batch_processor()` (cricket / quadratic pipelines).
+# ============================================================
+
+import csv
+import json
+import mmap
+import os
+import resource
+import sys
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+Columns = Dict[str, np.ndarray]
+
+
+def peak_rss_mb() -> float:
+    '''
+    Peak resident set size of this process in MB.
+    '''
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS reports bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+# ============================================================
+# READERS — each yields (columns, resume_offset)
+# ============================================================
+
+def read_csv_chunks(path: str, columns: List[str], chunk_rows: int,
+                    start_offset: int = 0, mmap_input: bool = False) -> Iterator[Tuple[Columns, int]]:
+    '''
+    Numeric CSV with a header row. The offset is a byte position.
+    '''
+    with open(path, "rb") as f:
+        source = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if mmap_input else f
+        try:
+            header = source.readline().decode("utf-8").strip().split(",")
+            index = [header.index(c) for c in columns]
+            if start_offset:
+                source.seek(start_offset)
+
+            while True:
+                lines = []
+                for _ in range(chunk_rows):
+                    line = source.readline()
+                    if not line:
+                        break
+                    if line.strip():
+                        lines.append(line.decode("utf-8"))
+                if not lines:
+                    return
+                data = np.loadtxt(lines, delimiter=",", dtype=np.float64, ndmin=2, usecols=index)
+                yield {c: data[:, i] for i, c in enumerate(columns)}, source.tell()
+        finally:
+            if mmap_input:
+                source.close()
+
+
+def read_npy_chunks(path: str, columns: List[str], chunk_rows: int,
+                    start_offset: int = 0, mmap_input: bool = True) -> Iterator[Tuple[Columns, int]]:
+    '''
+    Structured .npy array (named fields). The offset is a row index.
+    '''
+    data = np.load(path, mmap_mode="r" if mmap_input else None)
+    for start in range(start_offset, len(data), chunk_rows):
+        block = data[start:start + chunk_rows]
+        yield {c: np.asarray(block[c], dtype=np.float64) for c in columns}, start + len(block)
+
+
+def read_parquet_chunks(path: str, columns: List[str], chunk_rows: int,
+                        start_offset: int = 0, mmap_input: bool = False) -> Iterator[Tuple[Columns, int]]:
+    '''
+    Parquet via pyarrow (optional dependency). The offset is a row index.
+    '''
+    try:
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("Reading Parquet needs pyarrow: pip install pyarrow") from e
+
+    parquet = pq.ParquetFile(path, memory_map=mmap_input)
+    rows_seen = 0
+    for batch in parquet.iter_batches(batch_size=chunk_rows, columns=columns):
+        rows_seen += batch.num_rows
+        if rows_seen <= start_offset:
+            continue
+        skip = max(0, start_offset - (rows_seen - batch.num_rows))
+        yield {c: batch.column(c).to_numpy(zero_copy_only=False)[skip:].astype(np.float64)
+               for c in columns}, rows_seen
+
+
+READERS = {
+    ".csv": read_csv_chunks,
+    ".npy": read_npy_chunks,
+    ".parquet": read_parquet_chunks,
+}
+
+
+# ============================================================
+# PROCESSOR for per-row graphs
+# ============================================================
+
+def graph_batch_processor(app, input_columns: List[str], output_columns: List[str],
+                          max_concurrency: Optional[int] = None) -> Callable[[Columns], Columns]:
+    '''
+    Runs a scalar graph once per row via `app.batch()`. Rows whose graph run
+    raises get empty outputs and the error text in an `error` column.
+    '''
+    def process_chunk(columns: Columns) -> Columns:
+        n = len(columns[input_columns[0]])
+        rows = [{c: columns[c][i].item() for c in input_columns} for i in range(n)]
+        results = app.batch(rows, config={"max_concurrency": max_concurrency}, return_exceptions=True)
+
+        out = {c: [] for c in output_columns}
+        out["error"] = []
+        for result in results:
+            failed = isinstance(result, Exception)
+            for c in output_columns:
+                out[c].append("" if failed else result.get(c, ""))
+            out["error"].append(f"{type(result).__name__}: {result}" if failed else "")
+        return out
+
+    return process_chunk
+
+
+# ============================================================
+# DRIVER
+# ============================================================
+
+def _load_progress(path: Optional[str]) -> dict:
+    if path and os.path.exists(path):
+        with open(path) as f:
+            return json.load(f)
+    return {"chunks": 0, "rows": 0, "input_offset": 0, "output_bytes": 0}
+
+
+def _save_progress(path: str, progress: dict):
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(progress, f)
+    os.replace(tmp, path)
+
+
+def run_pipeline(input_path: str, output_path: str, process_chunk: Callable[[Columns], Columns],
+                 input_columns: List[str], chunk_rows: int = 100_000, mmap_input: bool = False,
+                 resume: bool = True, verbose: bool = True) -> dict:
+    '''
+    Streams `input_path` through `process_chunk` into `output_path` (CSV).
+
+    Returns stats: rows, chunks, seconds, rows_per_sec, peak_rss_mb, resumed_from.
+    '''
+    extension = os.path.splitext(input_path)[1].lower()
+    if extension not in READERS:
+        raise ValueError(f"Unsupported input format '{extension}', expected one of {sorted(READERS)}")
+
+    progress_path = output_path + ".progress"
+    if not (resume and os.path.exists(output_path)):
+        progress = _load_progress(None)
+        open(output_path, "w").close()
+    else:
+        progress = _load_progress(progress_path)
+    resumed_from = progress["chunks"]
+
+    start = time.perf_counter()
+    rows_this_run = 0
+
+    with open(output_path, "r+", newline="", encoding="utf-8") as out:
+        # Drop anything written after the last completed chunk
+        out.truncate(progress["output_bytes"])
+        out.seek(progress["output_bytes"])
+        writer = csv.writer(out)
+        chunks = READERS[extension](input_path, input_columns, chunk_rows,
+                                    start_offset=progress["input_offset"], mmap_input=mmap_input)
+
+        for columns, offset in chunks:
+            result = process_chunk(columns)
+            names = list(input_columns) + [c for c in result if c not in input_columns]
+            if progress["chunks"] == 0:
+                writer.writerow(names)
+
+            values = [columns[c] if c in columns else result[c] for c in names]
+            writer.writerows(zip(*[v.tolist() if isinstance(v, np.ndarray) else v for v in values]))
+            out.flush()
+            os.fsync(out.fileno())
+
+            n = len(columns[input_columns[0]])
+            rows_this_run += n
+            progress.update(chunks=progress["chunks"] + 1, rows=progress["rows"] + n,
+                            input_offset=offset, output_bytes=os.fstat(out.fileno()).st_size)
+            _save_progress(progress_path, progress)
+
+            if verbose:
+                elapsed = time.perf_counter() - start
+                print(f"chunk {progress['chunks']:>5} | rows {progress['rows']:>12,} | "
+                      f"{rows_this_run / elapsed:>12,.0f} rows/s | peak RSS {peak_rss_mb():,.1f} MB")
+
+    elapsed = time.perf_counter() - start
+    return {
+        "rows": progress["rows"],
+        "chunks": progress["chunks"],
+        "resumed_from_chunk": resumed_from,
+        "seconds": round(elapsed, 3),
+        "rows_per_sec": round(rows_this_run / elapsed, 1) if elapsed else 0.0,
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+    }
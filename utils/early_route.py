@@ -0,0 +1,321 @@
+# ============================================================
+# Early Routing on Partially Streamed Structured Output
+# ============================================================
+# A structured-output node (`llm.with_structured_output(schema)`)
+# returns only after the WHOLE object has been generated and
+# parsed, so a conditional edge waits for every field even when it
+# only reads one:
+#
+#   {"evaluation": "approved", "feedback": "<200 more tokens>"}
+#                            ↑ the router could fire here
+#
+# `EarlyRoute` streams the raw response instead, parses the JSON
+# incrementally (`PartialJSONObject`) and returns from the node as
+# soon as the ROUTE FIELDS are complete. The rest of the object
+# keeps streaming in the background:
+#
+#   evaluate = EarlyRoute(llm, Evaluation, evaluation_messages,
+#                         route_on=("evaluation",))
+#   graph.add_node("evaluate", evaluate)                   # sync graph
+#   graph.add_node("optimize", evaluate.join(optimize))    # needs feedback
+#
+# The early update carries a token under `pending_key` (add it to
+# the state schema). A node wrapped with `join(node)` / `ajoin(node)`
+# waits for the remaining fields, passes them to the node and
+# merges them into state. `join()` with no node is a plain merge
+# node, for routes that end the graph but still want the fields.
+# When the route fields are the whole schema nothing is pending.
+#
+# A finished object leaves `pending` as soon as its stream ends.
+# Graphs (or routes) without a join never collect theirs, so only
+# the newest `keep_completed` unjoined objects are kept for a late
+# join; older ones are dropped.
+#
+# Works with the fake model (JSON text chunks) and with providers
+# that stream tool-call argument chunks (ChatGroq's default).
+#
+# `stats()`: mean seconds to route vs to the complete object, and
+# how long join() calls blocked.
+# ============================================================
+
+import asyncio
+import contextvars
+import itertools
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Callable, Dict, Iterable, Optional
+
+
+class PartialJSONObject:
+    '''
+    Incremental parser: feed text chunks, get top-level fields as soon as each value is complete.
+    '''
+
+    def __init__(self):
+        self.buffer = ""
+        self.pos = 0
+        self.depth = 0
+        self.in_string = False
+        self.escape = False
+        self.expect = "key"
+        self.key = None
+        self.start = None
+        self.fields = {}
+        self.done = False
+
+    def _complete(self, end: int, completed: dict):
+        value = json.loads(self.buffer[self.start:end])
+        self.fields[self.key] = completed[self.key] = value
+        self.key, self.start, self.expect = None, None, "key"
+
+    def feed(self, text: str) -> dict:
+        '''
+        Returns the fields completed by this chunk.
+        '''
+        self.buffer += text
+        completed = {}
+        while self.pos < len(self.buffer) and not self.done:
+            ch = self.buffer[self.pos]
+            if self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif ch == "\\":
+                    self.escape = True
+                elif ch == '"':
+                    self.in_string = False
+                    if self.depth == 1 and self.expect == "key":
+                        self.key, self.start = json.loads(self.buffer[self.start:self.pos + 1]), None
+                    elif self.depth == 1:
+                        self._complete(self.pos + 1, completed)
+            elif self.depth == 0:
+                # Anything before the object (a code fence, whitespace) is skipped
+                if ch == "{":
+                    self.depth = 1
+            elif ch == '"':
+                self.in_string = True
+                if self.depth == 1:
+                    self.start = self.pos
+            elif ch in "{[":
+                if self.depth == 1:
+                    self.start = self.pos
+                self.depth += 1
+            elif ch in "}]":
+                self.depth -= 1
+                if self.depth == 1:
+                    self._complete(self.pos + 1, completed)
+                elif self.depth == 0:
+                    if self.start is not None:
+                        self._complete(self.pos, completed)
+                    self.done = True
+            elif self.depth == 1:
+                if ch == ":":
+                    self.expect = "value"
+                elif ch == ",":
+                    if self.start is not None:
+                        self._complete(self.pos, completed)
+                elif self.start is None and self.expect == "value" and not ch.isspace():
+                    # number / true / false / null: complete at the next ',' or '}'
+                    self.start = self.pos
+            self.pos += 1
+        return completed
+
+
+def _raw_model(structured_llm):
+    '''
+    The chat model (with its tool / schema binding) in front of the output parser.
+    '''
+    steps = getattr(structured_llm, "steps", None)
+    return steps[0] if steps else structured_llm
+
+
+def _fragment(chunk) -> str:
+    for call in getattr(chunk, "tool_call_chunks", None) or []:
+        if call.get("args"):
+            return call["args"]
+    return chunk.content if isinstance(chunk.content, str) else ""
+
+
+class EarlyRoute:
+    '''
+    Structured-output node that returns once its route fields are parsed.
+    '''
+
+    def __init__(self, llm, schema, build_input: Callable[[dict], object], route_on: Iterable[str],
+                 to_update: Optional[Callable[[dict], dict]] = None, pending_key: str = "pending",
+                 keep_completed: int = 256):
+        self.schema = schema
+        self.model = _raw_model(llm.with_structured_output(schema=schema))
+        self.build_input = build_input
+        self.route_on = tuple(route_on)
+        self.to_update = to_update or dict
+        self.pending_key = pending_key
+        self.partial = not set(schema.model_fields) <= set(self.route_on)
+        self.__name__ = getattr(build_input, "__name__", "early_route")
+        self.pending: Dict[str, Future] = {}
+        self.completed: "OrderedDict[str, Future]" = OrderedDict()
+        self.keep_completed = keep_completed
+        self.tasks = set()
+        self.ids = itertools.count()
+        self.lock = threading.Lock()
+        self.totals = {"routed": 0, "completed": 0, "route_seconds": 0.0, "complete_seconds": 0.0,
+                       "joins": 0, "join_wait_seconds": 0.0}
+
+    def _record(self, **deltas):
+        with self.lock:
+            for name, delta in deltas.items():
+                self.totals[name] += delta
+
+    # --- parsing the stream ------------------------------------------------
+
+    def _feed(self, parser: PartialJSONObject, chunk, early: Future, start: float):
+        parser.feed(_fragment(chunk))
+        if not early.done() and all(f in parser.fields for f in self.route_on):
+            self._record(routed=1, route_seconds=time.perf_counter() - start)
+            early.set_result({f: parser.fields[f] for f in self.route_on})
+
+    def _finish(self, parser: PartialJSONObject, early: Future, rest: Future, start: float):
+        values = self.schema.model_validate(parser.fields).model_dump()
+        self._record(completed=1, complete_seconds=time.perf_counter() - start)
+        if not early.done():
+            # The stream ended without the route fields showing up early (e.g. no streaming)
+            self._record(routed=1, route_seconds=time.perf_counter() - start)
+            early.set_result({f: values[f] for f in self.route_on})
+        rest.set_result(values)
+
+    @staticmethod
+    def _fail(error: BaseException, *futures: Future):
+        for future in futures:
+            if not future.done():
+                future.set_exception(error)
+
+    def _consume(self, state: dict, early: Future, rest: Future):
+        start, parser = time.perf_counter(), PartialJSONObject()
+        try:
+            for chunk in self.model.stream(self.build_input(state)):
+                self._feed(parser, chunk, early, start)
+            self._finish(parser, early, rest, start)
+        except BaseException as error:
+            self._fail(error, early, rest)
+
+    async def _aconsume(self, state: dict, early: Future, rest: Future):
+        start, parser = time.perf_counter(), PartialJSONObject()
+        try:
+            async for chunk in self.model.astream(self.build_input(state)):
+                self._feed(parser, chunk, early, start)
+            self._finish(parser, early, rest, start)
+        except BaseException as error:
+            self._fail(error, early, rest)
+
+    def _early_update(self, fields: dict, rest: Future) -> dict:
+        update = self.to_update(fields)
+        if self.partial:
+            token = f"{self.__name__}-{next(self.ids)}"
+            with self.lock:
+                self.pending[token] = rest
+            rest.add_done_callback(lambda _, token=token: self._resolved(token))
+            update[self.pending_key] = token
+        return update
+
+    def _resolved(self, token: str):
+        '''
+        Moves a finished, not yet joined object out of `pending` (bounded by `keep_completed`).
+        '''
+        with self.lock:
+            future = self.pending.pop(token, None)
+            if future is None:
+                return
+            self.completed[token] = future
+            while len(self.completed) > self.keep_completed:
+                self.completed.popitem(last=False)
+
+    # --- node --------------------------------------------------------------
+
+    def __call__(self, state: dict) -> dict:
+        early, rest = Future(), Future()
+        # Run in a copy of this context so the stream stays a child run of the node (callbacks, tracing)
+        context = contextvars.copy_context()
+        threading.Thread(target=context.run, args=(self._consume, state, early, rest), daemon=True).start()
+        return self._early_update(early.result(), rest)
+
+    async def acall(self, state: dict) -> dict:
+        '''
+        Async version (use in graphs run with `ainvoke` / `astream`).
+        '''
+        early, rest = Future(), Future()
+        task = asyncio.create_task(self._aconsume(state, early, rest))
+        # The event loop only keeps weak references to tasks
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+        return self._early_update(await asyncio.wrap_future(early), rest)
+
+    # --- merging the rest ----------------------------------------------------
+
+    def _take(self, state: dict) -> Optional[Future]:
+        token = state.get(self.pending_key)
+        if not token:
+            return None
+        with self.lock:
+            return self.pending.pop(token, None) or self.completed.pop(token, None)
+
+    def rest(self, state: dict) -> dict:
+        '''
+        Waits for the remaining fields; returns them as a state update ({} if nothing is pending).
+        '''
+        future = self._take(state)
+        if future is None:
+            return {}
+        start = time.perf_counter()
+        values = future.result()
+        self._record(joins=1, join_wait_seconds=time.perf_counter() - start)
+        return {**self.to_update(values), self.pending_key: None}
+
+    async def arest(self, state: dict) -> dict:
+        future = self._take(state)
+        if future is None:
+            return {}
+        start = time.perf_counter()
+        values = await asyncio.wrap_future(future)
+        self._record(joins=1, join_wait_seconds=time.perf_counter() - start)
+        return {**self.to_update(values), self.pending_key: None}
+
+    def join(self, node: Optional[Callable[[dict], dict]] = None):
+        '''
+        Wraps a node that needs the whole object; without a node, a plain merge node.
+        '''
+        def joined(state: dict) -> dict:
+            update = self.rest(state)
+            result = node({**state, **update}) if node is not None else None
+            return {**update, **(result or {})}
+
+        joined.__name__ = getattr(node, "__name__", f"join_{self.__name__}")
+        return joined
+
+    def ajoin(self, node: Optional[Callable[[dict], object]] = None):
+        async def joined(state: dict) -> dict:
+            update = await self.arest(state)
+            result = None
+            if node is not None:
+                result = node({**state, **update})
+                if asyncio.iscoroutine(result):
+                    result = await result
+            return {**update, **(result or {})}
+
+        joined.__name__ = getattr(node, "__name__", f"join_{self.__name__}")
+        return joined
+
+    def stats(self) -> dict:
+        with self.lock:
+            t = dict(self.totals)
+        route_s = t["route_seconds"] / t["routed"] if t["routed"] else 0.0
+        complete_s = t["complete_seconds"] / t["completed"] if t["completed"] else 0.0
+        return {
+            "calls": t["routed"],
+            "route_s": round(route_s, 4),
+            "complete_s": round(complete_s, 4),
+            "saved_per_call_s": round(complete_s - route_s, 4),
+            "joins": t["joins"],
+            "join_wait_s": round(t["join_wait_seconds"] / t["joins"], 4) if t["joins"] else 0.0,
+        }
@@ -0,0 +1,172 @@
+# ============================================================
+# Fast Path — Run a Pure-Python StateGraph Without Pregel
+# ============================================================
+# Graphs like the voter checker, the quadratic solver and the BMI
+# chain do no I/O. For them, LangGraph's per-superstep scheduling,
+# channel writes and state merging cost far more than the nodes.
+#
+# `compile_fast_path(app)` reads the builder of a COMPILED graph
+# and returns ONE plain function that walks the same route:
+#
+#   fast = compile_fast_path(app)
+#   fast({"name": "Asha", "age": 25, ...}) == app.invoke({...})
+#
+#   state = input
+#   node  = successor of START
+#   while node is not END:
+#       state ← merge(state, node(state))      (reducers honoured)
+#       node  ← the fixed edge, or router(state) through its path map
+#
+# Supported graphs: sync function nodes and routers, ONE outgoing
+# edge or ONE conditional router per node, LastValue or reducer
+# channels. Anything else (parallel fan-out, Send / Command, async
+# nodes, retry / cache policies, subgraphs) raises
+# `FastPathUnsupported` at compile time, so callers fall back to
+# `app.invoke`.
+#
+# `verify_fast_path(app, fast, inputs)` asserts both give equal
+# outputs; `benchmark_fast_path(...)` reports invocations/sec.
+# ============================================================
+
+import copy
+import time
+from typing import Callable, Iterable, List
+
+from langgraph.channels.binop import BinaryOperatorAggregate
+from langgraph.channels.last_value import LastValue
+from langgraph.errors import GraphRecursionError
+from langgraph.graph import START, END
+
+MISSING = object()
+
+
+class FastPathUnsupported(ValueError):
+    '''
+    The graph uses a feature the fast path cannot reproduce exactly.
+    '''
+
+
+def _plain_function(runnable, what: str) -> Callable:
+    func = getattr(runnable, "func", None)
+    if func is None or getattr(runnable, "func_accepts", None):
+        raise FastPathUnsupported(f"{what} is not a plain sync function of the state")
+    return func
+
+
+def compile_fast_path(app, recursion_limit: int = 25) -> Callable[[dict], dict]:
+    '''
+    Returns `fast(input) -> state` equivalent to `app.invoke(input)`.
+    '''
+    builder = app.builder
+
+    # --- channels: plain keys or reducers ---
+    reducers, initial = {}, {}
+    for key, channel in builder.channels.items():
+        if isinstance(channel, BinaryOperatorAggregate):
+            reducers[key] = channel.operator
+            if channel.is_available():
+                initial[key] = channel.get()
+        elif not isinstance(channel, LastValue):
+            raise FastPathUnsupported(f"channel '{key}' is a {type(channel).__name__}")
+    keys = set(builder.channels)
+
+    # --- nodes ---
+    nodes = {}
+    for name, spec in builder.nodes.items():
+        if spec.retry_policy or spec.cache_policy or spec.defer or spec.ends:
+            raise FastPathUnsupported(f"node '{name}' uses retry / cache / defer / Command")
+        if spec.input_schema is not builder.state_schema:
+            raise FastPathUnsupported(f"node '{name}' reads a private input schema")
+        nodes[name] = _plain_function(spec.runnable, f"node '{name}'")
+
+    # --- edges: exactly one way out of each node ---
+    if getattr(builder, "waiting_edges", None):
+        raise FastPathUnsupported("join edges (waiting on several nodes) are not supported")
+    successor = {}
+    for source, target in builder.edges:
+        if source in successor:
+            raise FastPathUnsupported(f"'{source}' fans out to several nodes")
+        successor[source] = target
+    routers = {}
+    for source, branches in builder.branches.items():
+        if source in successor or len(branches) > 1:
+            raise FastPathUnsupported(f"'{source}' has several outgoing edges")
+        (branch,) = branches.values()
+        routers[source] = (_plain_function(branch.path, f"router of '{source}'"), branch.ends)
+
+    def merge(state: dict, update):
+        if update is None:
+            return
+        if not isinstance(update, dict):
+            raise FastPathUnsupported(f"node returned {type(update).__name__}, expected a dict")
+        for key, value in update.items():
+            if key not in keys:
+                continue
+            if key in reducers:
+                current = state[key] if key in state else copy.copy(initial.get(key, MISSING))
+                state[key] = value if current is MISSING else reducers[key](current, value)
+            else:
+                state[key] = value
+
+    def next_node(node: str, state: dict) -> str:
+        if node in successor:
+            return successor[node]
+        if node in routers:
+            router, path_map = routers[node]
+            target = router(dict(state))
+            if not isinstance(target, str):
+                raise FastPathUnsupported(f"router of '{node}' returned {target!r}; only one destination is supported")
+            return path_map[target] if path_map else target
+        return END
+
+    def fast(inputs: dict) -> dict:
+        state = {}
+        merge(state, inputs)
+        node = next_node(START, state)
+        steps = 0
+        while node != END:
+            steps += 1
+            if steps > recursion_limit:
+                raise GraphRecursionError(f"Recursion limit of {recursion_limit} reached")
+            # Nodes get their own copy, as under Pregel, so in-place edits don't leak
+            merge(state, nodes[node](dict(state)))
+            node = next_node(node, state)
+        return state
+
+    fast.__name__ = f"fast_{builder.state_schema.__name__}"
+    return fast
+
+
+def verify_fast_path(app, fast: Callable, inputs: Iterable[dict]) -> int:
+    '''
+    Asserts `fast(x) == app.invoke(x)` for every input; returns how many were checked.
+    '''
+    checked = 0
+    for x in inputs:
+        expected, got = app.invoke(dict(x)), fast(dict(x))
+        if expected != got:
+            raise AssertionError(f"fast path differs for {x}:\n  invoke: {expected}\n  fast:   {got}")
+        checked += 1
+    return checked
+
+
+def benchmark_fast_path(app, fast: Callable, inputs: List[dict], min_seconds: float = 1.0) -> dict:
+    '''
+    Invocations/sec of `app.invoke` and of the fast path over the same inputs.
+    '''
+    def rate(fn):
+        calls, start = 0, time.perf_counter()
+        while True:
+            for x in inputs:
+                fn(dict(x))
+            calls += len(inputs)
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_seconds:
+                return calls / elapsed
+
+    invoke_rate, fast_rate = rate(app.invoke), rate(fast)
+    return {
+        "invoke_per_s": round(invoke_rate, 1),
+        "fast_per_s": round(fast_rate, 1),
+        "speedup": round(fast_rate / invoke_rate, 1),
+    }
@@ -0,0 +1,196 @@
+# ============================================================
+# Hedged LLM Calls for Straggler Branches
+# ============================================================
+# In a fan-out graph the join node waits for the SLOWEST branch, so
+# one slow response sets the latency of the whole run. `Hedge`
+# wraps the runnable a branch calls and sends a second, duplicate
+# request when the first one is slower than usual:
+#
+#   t=0        primary request ───────────────────────?
+#   t=delay    still running → hedge request ──────┐
+#              first one to return wins; the other is cancelled
+#
+#   structured_llm = llm.with_structured_output(schema=ResponseState)
+#   language_llm = Hedge(structured_llm, name="evaluate_language")
+#   response = language_llm.invoke(prompt)          # or await .ainvoke(prompt)
+#
+#   - `delay` ADAPTS: it is the `percentile` (default p95) of the
+#     last `window` request latencies seen by this Hedge, each timed
+#     from when THAT request was sent (a hedge that wins counts from
+#     its own start, so hedging does not push the delay up). Use one
+#     Hedge per node, so each node hedges against its own history.
+#   - Nothing is hedged until `min_samples` calls have completed,
+#     unless `initial_delay` is given.
+#   - The BUDGET caps duplicates at `max_hedge_rate` (default 10%)
+#     of calls plus `burst`, so a slow provider is not hit with
+#     twice the load.
+#   - A primary that FAILS is not hedged; errors are for the retry
+#     logic in utils/rate_limit.py.
+#
+# The sync `invoke` runs both requests in worker threads. A losing
+# thread cannot be cancelled, so it finishes in the background and
+# its result is dropped. The async `ainvoke` cancels the loser.
+#
+# `stats()`: calls, hedged, hedge_rate, hedge_wins, budget_denied,
+# the current delay, and p50 / p99 of the latency the caller saw
+# (primary start → first reply).
+# ============================================================
+
+import asyncio
+import concurrent.futures
+import contextvars
+import math
+import threading
+import time
+from collections import deque
+from typing import Any, Optional
+
+# Sized for several branches each holding a primary and a hedge (or a loser still running)
+_EXECUTOR = concurrent.futures.ThreadPoolExecutor(max_workers=32, thread_name_prefix="hedge")
+
+
+def percentile(values, q: float) -> Optional[float]:
+    '''
+    Nearest-rank percentile (q in 0..100) of `values`; None when empty.
+    '''
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class Hedge:
+    '''
+    Wraps a runnable; duplicates calls that run past the adaptive latency percentile.
+    '''
+
+    def __init__(self, runnable, name: Optional[str] = None, percentile: float = 95.0, window: int = 200,
+                 min_samples: int = 20, initial_delay: Optional[float] = None, max_hedge_rate: float = 0.1,
+                 burst: int = 1):
+        self.runnable = runnable
+        self.name = name or getattr(runnable, "name", None) or "hedge"
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.initial_delay = initial_delay
+        self.max_hedge_rate = max_hedge_rate
+        self.burst = burst
+        self.latencies = deque(maxlen=window)
+        self.observed = deque(maxlen=window)
+        self.lock = threading.Lock()
+        self.counts = {"calls": 0, "hedged": 0, "hedge_wins": 0, "budget_denied": 0, "failed": 0}
+
+    # --- policy -----------------------------------------------------------
+
+    def delay(self) -> Optional[float]:
+        '''
+        Seconds to wait before hedging; None while there is too little history.
+        '''
+        with self.lock:
+            if len(self.latencies) < self.min_samples:
+                return self.initial_delay
+            return percentile(self.latencies, self.percentile)
+
+    def _start(self):
+        with self.lock:
+            self.counts["calls"] += 1
+
+    def _allow_hedge(self) -> bool:
+        with self.lock:
+            if self.counts["hedged"] + 1 > self.max_hedge_rate * self.counts["calls"] + self.burst:
+                self.counts["budget_denied"] += 1
+                return False
+            self.counts["hedged"] += 1
+            return True
+
+    def _finish(self, started: dict, winner=None):
+        '''
+        `started` maps each request to its send time; `winner` is None on failure.
+        '''
+        end = time.perf_counter()
+        with self.lock:
+            if winner is None:
+                self.counts["failed"] += 1
+                return
+            self.latencies.append(end - started[winner])
+            self.observed.append(end - min(started.values()))
+            self.counts["hedge_wins"] += winner is not next(iter(started))
+
+    # --- calls ------------------------------------------------------------
+
+    def invoke(self, input: Any, config=None, **kwargs) -> Any:
+        self._start()
+        started = {}
+
+        def submit():
+            context = contextvars.copy_context()
+            future = _EXECUTOR.submit(context.run, self.runnable.invoke, input, config, **kwargs)
+            started[future] = time.perf_counter()
+            return future
+
+        primary = submit()
+        pending, winner = {primary}, None
+        try:
+            delay = self.delay()
+            if delay is not None:
+                concurrent.futures.wait(pending, timeout=delay)
+                if not primary.done() and self._allow_hedge():
+                    pending.add(submit())
+            while True:
+                done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                winner = next((f for f in done if f.exception() is None), None)
+                if winner is not None or not pending:
+                    break
+            result = (winner or next(iter(done))).result()
+        finally:
+            for future in pending:
+                future.cancel()
+            self._finish(started, winner)
+        return result
+
+    async def ainvoke(self, input: Any, config=None, **kwargs) -> Any:
+        self._start()
+        started = {}
+
+        def submit():
+            task = asyncio.create_task(self.runnable.ainvoke(input, config, **kwargs))
+            started[task] = time.perf_counter()
+            return task
+
+        primary = submit()
+        pending, winner = {primary}, None
+        try:
+            delay = self.delay()
+            if delay is not None:
+                await asyncio.wait(pending, timeout=delay)
+                if not primary.done() and self._allow_hedge():
+                    pending.add(submit())
+            while True:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                winner = next((t for t in done if t.exception() is None), None)
+                if winner is not None or not pending:
+                    break
+            result = (winner or next(iter(done))).result()
+        finally:
+            # Also runs when the caller cancels us (e.g. a branch deadline)
+            for task in pending:
+                task.cancel()
+            self._finish(started, winner)
+        return result
+
+    # --- metrics ----------------------------------------------------------
+
+    def stats(self) -> dict:
+        with self.lock:
+            counts = dict(self.counts)
+            observed = list(self.observed)
+        delay = self.delay()
+        p50, p99 = percentile(observed, 50), percentile(observed, 99)
+        return {
+            "name": self.name,
+            **counts,
+            "hedge_rate": round(counts["hedged"] / counts["calls"], 3) if counts["calls"] else 0.0,
+            "delay_s": round(delay, 3) if delay is not None else None,
+            "p50_s": round(p50, 3) if p50 is not None else None,
+            "p99_s": round(p99, 3) if p99 is not None else None,
+        }
@@ -0,0 +1,111 @@
+# ============================================================
+# Rolling History Summarization for Chat Graphs
+# ============================================================
+# With the `add_messages` reducer the `messages` list grows on
+# every turn, so every call to the LLM re-sends the whole chat.
+#
+# `make_summarize_node()` builds a node that runs BEFORE
+# `chat_node` and keeps the history under a token budget:
+#   - the newest turns that fit in the budget are kept as-is
+#   - older turns are folded into a running `summary` string
+#   - folded messages are deleted from state with RemoveMessage
+#
+# The summary is INCREMENTAL: only the newly folded messages are
+# sent to the LLM together with the previous summary, never the
+# whole conversation. Because `summary` is a normal state key it
+# is saved by the checkpointer, so a resumed thread does not pay
+# for compaction again.
+#
+# Flow:
+#   START → summarize_history → chat_node → END
+# ============================================================
+
+import os
+from typing import List
+
+from langchain_core.messages import (
+    BaseMessage,
+    HumanMessage,
+    RemoveMessage,
+    SystemMessage,
+)
+from langchain_core.messages.utils import count_tokens_approximately
+
+# Token budget for the raw history sent to the LLM on each turn
+DEFAULT_TOKEN_BUDGET = int(os.getenv("CHAT_HISTORY_TOKEN_BUDGET", "2000"))
+
+SUMMARY_PROMPT = (
+    "You maintain a running summary of a conversation between a user and an AI assistant. "
+    "Extend the existing summary with the new messages below. Keep names, facts, decisions "
+    "and open questions; drop small talk. Reply with the updated summary only."
+)
+
+
+def count_tokens(messages: List[BaseMessage]) -> int:
+    '''
+    Cheap, offline token estimate (~4 characters per token).
+    '''
+    return count_tokens_approximately(messages)
+
+
+def split_history(messages: List[BaseMessage], token_budget: int):
+    '''
+    Splits the history into (to_fold, to_keep).
+
+    Walks backwards from the newest message and keeps as many as fit in
+    `token_budget`. The kept part always starts on a HumanMessage so a
+    question is never separated from its answer, and the latest message
+    is always kept even if it alone exceeds the budget.
+    '''
+    if count_tokens(messages) <= token_budget:
+        return [], list(messages)
+
+    cut = len(messages) - 1
+    used = count_tokens([messages[cut]])
+    while cut > 0:
+        cost = count_tokens([messages[cut - 1]])
+        if used + cost > token_budget:
+            break
+        used += cost
+        cut -= 1
+
+    # Move the cut forward to the start of a user turn
+    while cut < len(messages) - 1 and not isinstance(messages[cut], HumanMessage):
+        cut += 1
+
+    return list(messages[:cut]), list(messages[cut:])
+
+
+def with_summary(messages: List[BaseMessage], summary: str) -> List[BaseMessage]:
+    '''
+    Prepends the running summary (if any) as a system message.
+    '''
+    if not summary:
+        return list(messages)
+    return [SystemMessage(content=f"Summary of the earlier conversation:\n{summary}")] + list(messages)
+
+
+def make_summarize_node(llm, token_budget: int = DEFAULT_TOKEN_BUDGET):
+    '''
+    Returns a `summarize_history` node bound to `llm` and `token_budget`.
+
+    The state must have `messages` (with the `add_messages` reducer) and
+    a `summary: str` key.
+    '''
+    def summarize_history(state: dict) -> dict:
+        to_fold, _ = split_history(state["messages"], token_budget)
+        if not to_fold:
+            return {}
+
+        transcript = "\n".join(f"{m.type}: {m.content}" for m in to_fold)
+        response = llm.invoke([
+            SystemMessage(content=SUMMARY_PROMPT),
+            HumanMessage(content=f"Existing summary:\n{state.get('summary') or '(none)'}\n\nNew messages:\n{transcript}"),
+        ])
+
+        return {
+            "summary": response.content,
+            "messages": [RemoveMessage(id=m.id) for m in to_fold],
+        }
+
+    return summarize_history
@@ -0,0 +1,281 @@
+# ============================================================
+# LLM Factory — Groq or an Offline Fake Chat Model
+# ============================================================
+# Every script used to build `ChatGroq(...)` directly, so nothing
+# could run without network access and a GROQ_API_KEY. Scripts
+# now call `get_llm(...)` with the SAME arguments:
+#
+#   llm = get_llm(model="llama-3.3-70b-versatile", api_key=...)
+#
+#   LLM_BACKEND=groq (default) → ChatGroq(**kwargs)
+#   LLM_BACKEND=fake           → FakeChatModel (no network)
+#
+# The fake model is a real LangChain chat model, so `invoke`,
+# `stream`, `ainvoke`, `astream`, `batch` and LangGraph's
+# `stream_mode="messages"` all work. Its outputs are
+# DETERMINISTIC (derived from a hash of the prompt) while its
+# timing is configurable, which lets us measure graph overhead
+# separately from model latency:
+#
+#   FAKE_LLM_TTFT        seconds before the first token   (0.2)
+#   FAKE_LLM_PREFILL_TPS prompt tokens per second added   (0 = off)
+#                        to that, so long prompts are slower
+#   FAKE_LLM_TPS         tokens per second after that     (200)
+#   FAKE_LLM_TOKENS      tokens in a plain text reply     (40)
+#                        (capped by a bound `max_tokens`)
+#   FAKE_LLM_LINE_TOKENS tokens per numbered reply line   (10)
+#   FAKE_LLM_JITTER      ± fraction applied to latency    (0.0)
+#   FAKE_LLM_ERROR_RATE  probability a call raises        (0.0)
+#   FAKE_LLM_ERROR_STATUS status code on that error       (429)
+#   FAKE_LLM_STRAGGLER_RATE   probability a call is slow  (0.0)
+#   FAKE_LLM_STRAGGLER_FACTOR latency multiplier if so    (10)
+#   FAKE_LLM_SEED        seed for jitter / error draws    (0)
+#
+# `with_structured_output(schema)` returns JSON for any pydantic
+# schema used in this repo (Literal, int with ge/le, str, float,
+# bool fields), parsed into the schema like the Groq version.
+# ============================================================
+
+import asyncio
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from typing import Any, List, Literal, Optional, get_args, get_origin
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.output_parsers import PydanticOutputParser
+from langchain_core.runnables import RunnableMap, RunnablePassthrough
+from pydantic import BaseModel, PrivateAttr
+
+FILLER = (
+    "this is a deterministic offline reply generated without calling any model so that "
+    "graph overhead can be measured separately from real network and inference latency"
+).split()
+
+
+class FakeLLMError(Exception):
+    '''
+    Injected failure; `status_code` mimics the HTTP error a provider would return.
+    '''
+
+    def __init__(self, status_code: int = 429):
+        super().__init__(f"Fake LLM injected error ({status_code})")
+        self.status_code = status_code
+
+
+def _digest(*parts: str) -> int:
+    return int(hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()[:12], 16)
+
+
+def _prompt_text(messages: List[BaseMessage]) -> str:
+    return "\n".join(f"{m.type}: {m.content}" for m in messages)
+
+
+def _fake_value(annotation, metadata, seed: int):
+    '''
+    Deterministic value for one pydantic field.
+    '''
+    if get_origin(annotation) is Literal:
+        options = get_args(annotation)
+        return options[seed % len(options)]
+    if annotation is bool:
+        return bool(seed % 2)
+    if annotation in (int, float):
+        low, high = 0, 10
+        for constraint in metadata:
+            low = getattr(constraint, "ge", getattr(constraint, "gt", low))
+            high = getattr(constraint, "le", getattr(constraint, "lt", high))
+        value = low + seed % (int(high - low) + 1)
+        return annotation(value)
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return fake_structured(annotation, str(seed))
+    if get_origin(annotation) in (list, List):
+        return []
+    if get_origin(annotation) is dict or annotation is dict:
+        return {}
+    return " ".join(FILLER[(seed + i) % len(FILLER)] for i in range(12))
+
+
+def fake_structured(schema, prompt: str) -> dict:
+    '''
+    Deterministic field values for `schema`, derived from the prompt.
+    '''
+    values = {}
+    for name, field in schema.model_fields.items():
+        values[name] = _fake_value(field.annotation, field.metadata, _digest(prompt, name))
+    return values
+
+
+class FakeChatModel(BaseChatModel):
+    '''
+    Offline stand-in for ChatGroq with latency, throughput and error injection.
+    '''
+
+    model_name: str = "fake-llama-3.3-70b-versatile"
+    temperature: Optional[float] = None
+    ttft: float = float(os.getenv("FAKE_LLM_TTFT", "0.2"))
+    prefill_tps: float = float(os.getenv("FAKE_LLM_PREFILL_TPS", "0"))
+    tokens_per_second: float = float(os.getenv("FAKE_LLM_TPS", "200"))
+    reply_tokens: int = int(os.getenv("FAKE_LLM_TOKENS", "40"))
+    line_tokens: int = int(os.getenv("FAKE_LLM_LINE_TOKENS", "10"))
+    jitter: float = float(os.getenv("FAKE_LLM_JITTER", "0.0"))
+    error_rate: float = float(os.getenv("FAKE_LLM_ERROR_RATE", "0.0"))
+    error_status: int = int(os.getenv("FAKE_LLM_ERROR_STATUS", "429"))
+    straggler_rate: float = float(os.getenv("FAKE_LLM_STRAGGLER_RATE", "0.0"))
+    straggler_factor: float = float(os.getenv("FAKE_LLM_STRAGGLER_FACTOR", "10"))
+    seed: int = int(os.getenv("FAKE_LLM_SEED", "0"))
+
+    _rng: random.Random = PrivateAttr()
+    _rng_lock: threading.Lock = PrivateAttr()
+
+    def model_post_init(self, __context: Any) -> None:
+        self._rng = random.Random(self.seed)
+        self._rng_lock = threading.Lock()
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat-model"
+
+    @property
+    def _identifying_params(self) -> dict:
+        return {"model_name": self.model_name, "temperature": self.temperature}
+
+    # --- deterministic content -------------------------------------------
+
+    def _reply_tokens(self, messages: List[BaseMessage], schema=None, max_tokens=None) -> List[str]:
+        prompt = _prompt_text(messages)
+        if schema is not None:
+            text = json.dumps(fake_structured(schema, prompt))
+            # ~4 characters per streamed chunk, like a real tokenizer
+            return [text[i:i + 4] for i in range(0, len(text), 4)]
+        start = _digest(self.model_name, prompt)
+        length = min(self.reply_tokens, max_tokens or self.reply_tokens)
+        words = [FILLER[(start + i) % len(FILLER)] for i in range(length)]
+        # Numbered lines of `line_tokens` words, so replies have outline-like structure
+        tokens = []
+        for i, word in enumerate(words):
+            if i % self.line_tokens == 0:
+                prefix = "" if i == 0 else "\n"
+                tokens.append(f"{prefix}{i // self.line_tokens + 1}. {word}")
+            else:
+                tokens.append(" " + word)
+        return tokens
+
+    def _usage(self, messages: List[BaseMessage], tokens: List[str]) -> dict:
+        input_tokens = max(1, len(_prompt_text(messages)) // 4)
+        return {"input_tokens": input_tokens, "output_tokens": len(tokens),
+                "total_tokens": input_tokens + len(tokens)}
+
+    # --- latency / error injection ---------------------------------------
+
+    def _draw(self):
+        '''
+        Returns (latency scale, should_fail) from the seeded RNG.
+        '''
+        with self._rng_lock:
+            scale = 1.0 + self.jitter * (2 * self._rng.random() - 1)
+            fail = self._rng.random() < self.error_rate
+            # Only drawn when enabled, so existing seeds replay the same timings
+            if self.straggler_rate and self._rng.random() < self.straggler_rate:
+                scale *= self.straggler_factor
+        return max(scale, 0.0), fail
+
+    def _timings(self, messages: List[BaseMessage]):
+        scale, fail = self._draw()
+        per_token = 1.0 / self.tokens_per_second if self.tokens_per_second > 0 else 0.0
+        prefill = self._usage(messages, [])["input_tokens"] / self.prefill_tps if self.prefill_tps > 0 else 0.0
+        return (self.ttft + prefill) * scale, per_token * scale, fail
+
+    # --- LangChain chat-model hooks --------------------------------------
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        tokens = self._reply_tokens(messages, kwargs.get("structured_schema"), kwargs.get("max_tokens"))
+        first, per_token, fail = self._timings(messages)
+        time.sleep(first + per_token * len(tokens))
+        if fail:
+            raise FakeLLMError(self.error_status)
+        message = AIMessage(content="".join(tokens), usage_metadata=self._usage(messages, tokens),
+                            response_metadata={"model_name": self.model_name})
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs) -> ChatResult:
+        tokens = self._reply_tokens(messages, kwargs.get("structured_schema"), kwargs.get("max_tokens"))
+        first, per_token, fail = self._timings(messages)
+        await asyncio.sleep(first + per_token * len(tokens))
+        if fail:
+            raise FakeLLMError(self.error_status)
+        message = AIMessage(content="".join(tokens), usage_metadata=self._usage(messages, tokens),
+                            response_metadata={"model_name": self.model_name})
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(self, messages, stop=None, run_manager=None, **kwargs):
+        tokens = self._reply_tokens(messages, kwargs.get("structured_schema"), kwargs.get("max_tokens"))
+        first, per_token, fail = self._timings(messages)
+        time.sleep(first)
+        if fail:
+            raise FakeLLMError(self.error_status)
+        for i, token in enumerate(tokens):
+            if i:
+                time.sleep(per_token)
+            usage = self._usage(messages, tokens) if i == len(tokens) - 1 else None
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token, usage_metadata=usage))
+            if run_manager:
+                run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        tokens = self._reply_tokens(messages, kwargs.get("structured_schema"), kwargs.get("max_tokens"))
+        first, per_token, fail = self._timings(messages)
+        await asyncio.sleep(first)
+        if fail:
+            raise FakeLLMError(self.error_status)
+        for i, token in enumerate(tokens):
+            if i:
+                await asyncio.sleep(per_token)
+            usage = self._usage(messages, tokens) if i == len(tokens) - 1 else None
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=token, usage_metadata=usage))
+            if run_manager:
+                await run_manager.on_llm_new_token(token, chunk=chunk)
+            yield chunk
+
+    def with_structured_output(self, schema, *, include_raw: bool = False, **kwargs):
+        '''
+        JSON reply for `schema`, parsed back into the pydantic model.
+
+        `include_raw=True` returns {"raw", "parsed", "parsing_error"} like ChatGroq, so
+        callers can read `raw.usage_metadata`. As there, a reply that does not parse gives
+        `parsed=None` and the exception in `parsing_error` instead of raising.
+        '''
+        parser = PydanticOutputParser(pydantic_object=schema)
+        if not include_raw:
+            return self.bind(structured_schema=schema) | parser
+        parsed = RunnablePassthrough.assign(parsed=lambda x: parser.invoke(x["raw"]), parsing_error=lambda _: None)
+        unparsed = RunnablePassthrough.assign(parsed=lambda _: None)
+        return RunnableMap(raw=self.bind(structured_schema=schema)) | parsed.with_fallbacks(
+            [unparsed], exception_key="parsing_error")
+
+
+def llm_backend() -> str:
+    return os.getenv("LLM_BACKEND", "groq").lower()
+
+
+def get_llm(**kwargs):
+    '''
+    Builds the chat model for the selected backend.
+
+    Accepts the same keyword arguments as `ChatGroq` (`model` / `model_name`,
+    `temperature`, `api_key`, ...); the fake backend keeps only the model name
+    and temperature.
+    '''
+    if llm_backend() == "fake":
+        model = kwargs.get("model") or kwargs.get("model_name") or "llama-3.3-70b-versatile"
+        return FakeChatModel(model_name=f"fake-{model}", temperature=kwargs.get("temperature"))
+
+    from langchain_groq import ChatGroq
+
+    return ChatGroq(**kwargs)
@@ -0,0 +1,210 @@
+# ============================================================
+# Durable Node-Output Cache (SQLite)
+# ============================================================
+# If the last node of a chain fails, rerunning the script repeats
+# every earlier LLM call. `NodeCache` stores each node's OUTPUT on
+# disk, content-addressed by:
+#
+#   node name
+#   + hash of the state keys the node reads   (`inputs=[...]`)
+#   + hash of the prompt                       (the node's source
+#                                               code by default, so
+#                                               editing a prompt
+#                                               invalidates it)
+#   + model config                             (model, temperature)
+#
+# Opt a node in when adding it to the graph:
+#
+#   node_cache = NodeCache("node_cache.db")
+#   graph.add_node("generate_joke",
+#                  node_cache.cached(generate_joke, inputs=["topic"], llm=llm))
+#
+# On a rerun, completed nodes return their stored output without
+# calling the LLM; only the failed node and those after it run.
+#
+# Eviction: entries older than `max_age_seconds` are dropped, and
+# the least recently used entries are dropped once the total size
+# exceeds `max_bytes`. `stats()` reports hits, misses and size.
+#
+# `NodeCache.from_env()` returns a cache only when NODE_CACHE_PATH
+# is set; `cached()` on a disabled cache returns the node as-is.
+# ============================================================
+
+import functools
+import hashlib
+import inspect
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, List, Optional
+
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+
+DEFAULT_MAX_BYTES = int(os.getenv("NODE_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+DEFAULT_MAX_AGE = float(os.getenv("NODE_CACHE_MAX_AGE", str(7 * 24 * 3600)))
+
+
+def _hash(value) -> str:
+    blob = json.dumps(value, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def _model_config(llm) -> dict:
+    if llm is None:
+        return {}
+    return {
+        "model": getattr(llm, "model_name", None) or getattr(llm, "model", None),
+        "temperature": getattr(llm, "temperature", None),
+    }
+
+
+class NodeCache:
+    '''
+    Content-addressed, size- and age-bounded store of node outputs.
+    '''
+
+    def __init__(self, path: Optional[str], max_bytes: int = DEFAULT_MAX_BYTES,
+                 max_age_seconds: float = DEFAULT_MAX_AGE):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.serde = JsonPlusSerializer()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.per_node = {}
+
+        self.conn = None
+        if path:
+            self.conn = sqlite3.connect(path, check_same_thread=False)
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS node_cache ("
+                "key TEXT PRIMARY KEY, node TEXT, type TEXT, value BLOB, size INTEGER, "
+                "created_at REAL, accessed_at REAL)"
+            )
+            self.conn.commit()
+            self.evict()
+
+    @classmethod
+    def from_env(cls) -> "NodeCache":
+        return cls(os.getenv("NODE_CACHE_PATH"))
+
+    @property
+    def enabled(self) -> bool:
+        return self.conn is not None
+
+    def make_key(self, node: str, state: dict, inputs: List[str], prompt: str, llm) -> str:
+        return _hash({
+            "node": node,
+            "inputs": {k: state.get(k) for k in inputs},
+            "prompt": hashlib.sha256(prompt.encode("utf-8")).hexdigest(),
+            "model": _model_config(llm),
+        })
+
+    def get(self, key: str):
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT type, value, created_at FROM node_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if time.time() - row[2] > self.max_age_seconds:
+                self.conn.execute("DELETE FROM node_cache WHERE key = ?", (key,))
+                self.conn.commit()
+                return None
+            self.conn.execute("UPDATE node_cache SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            self.conn.commit()
+        return self.serde.loads_typed((row[0], row[1]))
+
+    def put(self, key: str, node: str, value: dict):
+        kind, blob = self.serde.dumps_typed(value)
+        now = time.time()
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO node_cache (key, node, type, value, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, node, kind, blob, len(blob), now, now),
+            )
+            self.conn.commit()
+        self.evict()
+
+    def evict(self):
+        '''
+        Drops expired entries, then least-recently-used ones above `max_bytes`.
+        '''
+        with self.lock:
+            self.conn.execute("DELETE FROM node_cache WHERE created_at < ?", (time.time() - self.max_age_seconds,))
+            total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM node_cache").fetchone()[0]
+            if total > self.max_bytes:
+                for key, size in self.conn.execute(
+                    "SELECT key, size FROM node_cache ORDER BY accessed_at ASC"
+                ).fetchall():
+                    self.conn.execute("DELETE FROM node_cache WHERE key = ?", (key,))
+                    total -= size
+                    if total <= self.max_bytes:
+                        break
+            self.conn.commit()
+
+    def _count(self, node: str, hit: bool):
+        counts = self.per_node.setdefault(node, {"hits": 0, "misses": 0})
+        if hit:
+            self.hits += 1
+            counts["hits"] += 1
+        else:
+            self.misses += 1
+            counts["misses"] += 1
+
+    def cached(self, fn: Callable, inputs: List[str], llm=None, prompt: Optional[str] = None,
+               name: Optional[str] = None) -> Callable:
+        '''
+        Wraps a (sync or async) node so its output is served from the cache.
+
+        `inputs` are the state keys the node reads. `prompt` defaults to the
+        node's source code, so any prompt edit produces a new key.
+        '''
+        if not self.enabled:
+            return fn
+
+        node = name or fn.__name__
+        prompt_text = prompt if prompt is not None else inspect.getsource(fn)
+
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(state):
+                key = self.make_key(node, state, inputs, prompt_text, llm)
+                value = self.get(key)
+                self._count(node, value is not None)
+                if value is None:
+                    value = await fn(state)
+                    self.put(key, node, value)
+                return value
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(state):
+            key = self.make_key(node, state, inputs, prompt_text, llm)
+            value = self.get(key)
+            self._count(node, value is not None)
+            if value is None:
+                value = fn(state)
+                self.put(key, node, value)
+            return value
+        return wrapper
+
+    def stats(self) -> dict:
+        if not self.enabled:
+            return {"enabled": False}
+        with self.lock:
+            entries, size = self.conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM node_cache"
+            ).fetchone()
+        return {
+            "enabled": True,
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": entries,
+            "bytes": size,
+            "per_node": self.per_node,
+        }
@@ -0,0 +1,136 @@
+# ============================================================
+# Rate Limiting + Retry for Batch LLM Jobs
+# ============================================================
+# Providers like Groq enforce TWO limits per model:
+#   - requests per minute (RPM)
+#   - tokens per minute   (TPM)
+#
+# `RateLimiter` keeps one token bucket for each. A bucket holds up
+# to one minute's allowance and refills continuously, so short
+# bursts are allowed but the average never exceeds the limit.
+# Buckets start EMPTY: a full bucket plus a minute of refill would
+# let the first minute send about twice the limit. The limiter
+# credits one request's worth up front, so the first call still
+# goes out at once.
+#
+#   await limiter.acquire(estimated_tokens)   # waits if needed
+#   ... call the LLM ...
+#   limiter.settle(estimated_tokens, actual_tokens)
+#
+# `settle()` corrects the TPM bucket once the real usage is known
+# (the estimate is made before the call).
+#
+# `with_backoff()` retries a call on HTTP 429 (and 5xx) with
+# exponential backoff + full jitter, honouring Retry-After when the
+# error carries one.
+# ============================================================
+
+import asyncio
+import random
+import time
+from typing import Awaitable, Callable, Optional
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    '''
+    Async token bucket: `capacity` tokens, refilled at `capacity / period` per second.
+    Starts with `initial` tokens (empty by default).
+    '''
+
+    def __init__(self, capacity: float, period: float = 60.0, initial: float = 0.0):
+        self.capacity = capacity
+        self.rate = capacity / period
+        self.tokens = min(initial, capacity)
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+        self.throttled_seconds = 0.0
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, amount: float = 1.0):
+        amount = min(amount, self.capacity)
+        # One waiter at a time, so callers are served in arrival order
+        async with self.lock:
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                wait = (amount - self.tokens) / self.rate
+                self.throttled_seconds += wait
+                await asyncio.sleep(wait)
+
+    def adjust(self, delta: float):
+        '''
+        Positive delta takes extra tokens (may go negative = debt), negative refunds.
+        '''
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens - delta)
+
+
+class RateLimiter:
+    '''
+    Requests-per-minute and tokens-per-minute limits for one model.
+    '''
+
+    def __init__(self, rpm: float, tpm: float):
+        self.requests = TokenBucket(rpm, initial=1)
+        self.tokens = TokenBucket(tpm)
+        self.started = False
+
+    async def acquire(self, estimated_tokens: float):
+        if not self.started:
+            # One request's worth of tokens, so the first call is not throttled
+            self.started = True
+            self.tokens.adjust(-estimated_tokens)
+        await self.requests.acquire(1)
+        await self.tokens.acquire(estimated_tokens)
+
+    def settle(self, estimated_tokens: float, actual_tokens: Optional[float]):
+        if actual_tokens is not None:
+            self.tokens.adjust(actual_tokens - estimated_tokens)
+
+    @property
+    def throttled_seconds(self) -> float:
+        return self.requests.throttled_seconds + self.tokens.throttled_seconds
+
+
+def status_code(error: Exception) -> Optional[int]:
+    '''
+    HTTP status of a provider error (groq / openai style or FakeLLMError).
+    '''
+    code = getattr(error, "status_code", None)
+    if code is None and getattr(error, "response", None) is not None:
+        code = getattr(error.response, "status_code", None)
+    return code
+
+
+def retry_after(error: Exception) -> Optional[float]:
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+async def with_backoff(call: Callable[[], Awaitable], max_retries: int = 6, base: float = 1.0,
+                       cap: float = 60.0, on_retry: Optional[Callable[[Exception, float], None]] = None):
+    '''
+    Awaits `call()`, retrying retryable errors with exponential backoff + full jitter.
+    '''
+    for attempt in range(max_retries + 1):
+        try:
+            return await call()
+        except Exception as e:
+            if status_code(e) not in RETRYABLE_STATUS or attempt == max_retries:
+                raise
+            delay = retry_after(e) or random.uniform(0, min(cap, base * 2 ** attempt))
+            if on_retry:
+                on_retry(e, delay)
+            await asyncio.sleep(delay)
@@ -0,0 +1,195 @@
+# ============================================================
+# Response Cache for chat_node
+# ============================================================
+# Many users open with almost the same question, and each one
+# costs a full LLM round-trip. `ResponseCache` sits in front of
+# `llm.invoke()`:
+#
+#   key = sha256( system prompt + last N messages + model params )
+#
+#   1. In-memory LRU with a TTL (fast, per process)
+#   2. Optional SQLite tier (survives restarts, shared between
+#      processes that point at the same file, e.g. chatbot.db)
+#
+# Messages are normalized before hashing (case + whitespace), so
+# "What is Python?" and "what is  python ?" share an entry.
+#
+# The key only covers the last N messages, so threads that are
+# LONGER than N skip the cache — an answer written for one
+# history is never replayed into a different one.
+# ============================================================
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Optional
+
+from langchain_core.messages import AIMessage, BaseMessage, SystemMessage
+
+DEFAULT_TTL_SECONDS = float(os.getenv("CHAT_CACHE_TTL", "3600"))
+DEFAULT_MAX_ENTRIES = int(os.getenv("CHAT_CACHE_SIZE", "1024"))
+DEFAULT_LAST_N = int(os.getenv("CHAT_CACHE_LAST_N", "1"))
+
+
+def normalize(text: str) -> str:
+    '''
+    Lower-cases and collapses whitespace so trivial differences share a key.
+    '''
+    text = re.sub(r"\s+", " ", str(text).strip().lower())
+    return re.sub(r"\s+([?.!,])", r"\1", text)
+
+
+def model_params(llm) -> dict:
+    '''
+    The model settings that change the answer.
+    '''
+    return {
+        "model": getattr(llm, "model_name", None) or getattr(llm, "model", None),
+        "temperature": getattr(llm, "temperature", None),
+    }
+
+
+class ResponseCache:
+    '''
+    LRU + TTL cache of chat replies with an optional SQLite tier.
+    '''
+
+    def __init__(self, ttl: float = DEFAULT_TTL_SECONDS, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 last_n: int = DEFAULT_LAST_N, sqlite_path: Optional[str] = None):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.last_n = last_n
+        self.entries = OrderedDict()   # key -> (content, created_at, latency)
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.saved_seconds = 0.0
+
+        self.conn = None
+        if sqlite_path:
+            self.conn = sqlite3.connect(sqlite_path, check_same_thread=False)
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS response_cache ("
+                "key TEXT PRIMARY KEY, content TEXT, created_at REAL, latency REAL)"
+            )
+            self.conn.commit()
+
+    def make_key(self, messages: List[BaseMessage], llm) -> Optional[str]:
+        '''
+        Canonical hash of the context, or None if the thread is too long to cache.
+        '''
+        system = [m for m in messages if isinstance(m, SystemMessage)]
+        turns = [m for m in messages if not isinstance(m, SystemMessage)]
+        if not turns or len(turns) > self.last_n:
+            return None
+
+        payload = {
+            "system": [normalize(m.content) for m in system],
+            "messages": [[m.type, normalize(m.content)] for m in turns[-self.last_n:]],
+            "params": model_params(llm),
+        }
+        blob = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+    def get(self, key: str):
+        '''
+        Returns (content, original_latency) or None.
+        '''
+        now = time.time()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry and now - entry[1] <= self.ttl:
+                self.entries.move_to_end(key)
+                return entry[0], entry[2]
+            self.entries.pop(key, None)
+
+            if self.conn is None:
+                return None
+            row = self.conn.execute(
+                "SELECT content, created_at, latency FROM response_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if now - row[1] > self.ttl:
+                self.conn.execute("DELETE FROM response_cache WHERE key = ?", (key,))
+                self.conn.commit()
+                return None
+            # Promote to the memory tier
+            self._remember(key, row[0], row[1], row[2])
+            return row[0], row[2]
+
+    def put(self, key: str, content: str, latency: float):
+        now = time.time()
+        with self.lock:
+            self._remember(key, content, now, latency)
+            if self.conn is not None:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO response_cache (key, content, created_at, latency) VALUES (?, ?, ?, ?)",
+                    (key, content, now, latency),
+                )
+                self.conn.commit()
+
+    def _remember(self, key, content, created_at, latency):
+        self.entries[key] = (content, created_at, latency)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def invoke(self, llm, messages: List[BaseMessage]) -> BaseMessage:
+        '''
+        Drop-in replacement for `llm.invoke(messages)` with caching.
+        '''
+        key = self.make_key(messages, llm)
+        if key is None:
+            self.bypassed += 1
+            return llm.invoke(messages)
+
+        cached = self.get(key)
+        if cached is not None:
+            self.hits += 1
+            self.saved_seconds += cached[1]
+            return AIMessage(content=cached[0], response_metadata={"cache_hit": True})
+
+        self.misses += 1
+        start = time.perf_counter()
+        response = llm.invoke(messages)
+        self.put(key, response.content, time.perf_counter() - start)
+        return response
+
+    async def ainvoke(self, llm, messages: List[BaseMessage]) -> BaseMessage:
+        '''
+        Async version of `invoke()`.
+        '''
+        key = self.make_key(messages, llm)
+        if key is None:
+            self.bypassed += 1
+            return await llm.ainvoke(messages)
+
+        cached = self.get(key)
+        if cached is not None:
+            self.hits += 1
+            self.saved_seconds += cached[1]
+            return AIMessage(content=cached[0], response_metadata={"cache_hit": True})
+
+        self.misses += 1
+        start = time.perf_counter()
+        response = await llm.ainvoke(messages)
+        self.put(key, response.content, time.perf_counter() - start)
+        return response
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "bypassed": self.bypassed,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "saved_seconds": round(self.saved_seconds, 3),
+            "entries": len(self.entries),
+        }
@@ -0,0 +1,106 @@
+# ============================================================
+# Speculative Node Execution
+# ============================================================
+# In a conditional chain like
+#
+#   find_sentiment ──(negative)──→ run_diagnosis → negative_report
+#
+# the second LLM call can only START once the first has returned
+# and been routed. `Speculate` runs both at once inside one node:
+#
+#   t=0   primary (find_sentiment) ──────────┐
+#   t=0   speculative (run_diagnosis) ─────────┐
+#         primary done → use_if(result)?
+#            yes → await the speculative result and merge both updates
+#            no  → cancel it (if its request already started, that is
+#                  one WASTED call)
+#
+#   node = Speculate(afind_sentiment, arun_diagnosis,
+#                    use_if=lambda r: r["sentiment"] == "negative")
+#
+# The router then sees `diagnosis` already in state and can skip
+# the run_diagnosis hop.
+#
+# `should_speculate(state)` (optional) gates speculation with a
+# cheap prior, e.g. only when a local classifier leans negative.
+#
+# `stats()`: speculated / used / discarded / wasted calls, and the
+# latency saved = Σ min(primary time, speculative time) over used
+# speculations (sequential t_p + t_s vs speculative max(t_p, t_s)).
+# ============================================================
+
+import asyncio
+import threading
+import time
+from typing import Awaitable, Callable, Optional
+
+
+class Speculate:
+    '''
+    Async node: primary node plus a speculatively started follow-up node.
+    '''
+
+    def __init__(self, primary: Callable[[dict], Awaitable[dict]], speculative: Callable[[dict], Awaitable[dict]],
+                 use_if: Callable[[dict], bool], should_speculate: Optional[Callable[[dict], bool]] = None):
+        self.primary = primary
+        self.speculative = speculative
+        self.use_if = use_if
+        self.should_speculate = should_speculate
+        self.__name__ = getattr(primary, "__name__", "speculate")
+        self.lock = threading.Lock()
+        self.counts = {"calls": 0, "speculated": 0, "used": 0, "discarded": 0, "wasted_calls": 0}
+        self.saved_seconds = 0.0
+
+    def _record(self, saved: float = 0.0, **deltas):
+        with self.lock:
+            self.saved_seconds += saved
+            for name, delta in deltas.items():
+                self.counts[name] += delta
+
+    @staticmethod
+    def _discard(task: asyncio.Task):
+        # cancel() is a no-op on a task that already failed; reading its exception
+        # keeps asyncio from logging "Task exception was never retrieved"
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        task.cancel()
+
+    async def __call__(self, state: dict) -> dict:
+        self._record(calls=1)
+        if self.should_speculate is not None and not self.should_speculate(state):
+            return await self.primary(state)
+
+        started = {}
+
+        async def run_speculative():
+            started["at"] = time.perf_counter()
+            result = await self.speculative(state)
+            started["seconds"] = time.perf_counter() - started["at"]
+            return result
+
+        start = time.perf_counter()
+        task = asyncio.create_task(run_speculative())
+        try:
+            result = await self.primary(state)
+        except BaseException:
+            self._discard(task)
+            raise
+        primary_seconds = time.perf_counter() - start
+
+        if self.use_if(result):
+            extra = await task
+            self._record(speculated=1, used=1, saved=min(primary_seconds, started["seconds"]))
+            return {**result, **extra}
+
+        self._discard(task)
+        self._record(speculated=1, discarded=1, wasted_calls=int("at" in started))
+        return result
+
+    def stats(self) -> dict:
+        with self.lock:
+            c, saved = dict(self.counts), self.saved_seconds
+        return {
+            **c,
+            "saved_seconds": round(saved, 3),
+            "saved_per_use_s": round(saved / c["used"], 3) if c["used"] else 0.0,
+            "waste_rate": round(c["wasted_calls"] / c["speculated"], 3) if c["speculated"] else 0.0,
+        }
@@ -0,0 +1,305 @@
+# ============================================================
+# Per-Node Timing Spans + Chrome Trace Export
+# ============================================================
+# LangGraph reports every node, conditional router and LLM call
+# as a callback run. `GraphTracer` is a callback handler that turns
+# those runs into SPANS:
+#
+#   node    wall time, CPU time, LLM time vs local time, state
+#           size in / out (JSON bytes)
+#   router  wall time and the branch it returned
+#   llm     every chat-model call, attributed to its node
+#
+#   tracer = GraphTracer()
+#   with tracing(tracer):              # every graph run in this block
+#       app.invoke(state)
+#   print(tracer.summary())
+#   tracer.export_chrome("trace.json") # open in ui.perfetto.dev / chrome://tracing
+#
+# (or pass it per call: `app.invoke(state, config={"callbacks": [tracer]})`)
+#
+# Nodes that run at the same time are drawn on separate LANES, so
+# the trace shows whether parallel branches really overlap; the
+# summary reports node time / graph wall time per run.
+#
+# CPU time is the running thread's CPU time (`time.thread_time`).
+# For async nodes that thread is the event loop, so it includes
+# other coroutines running at the same time.
+#
+# Disabled (outside `tracing()` and without the callback) the hook
+# is a single context-variable read per graph run.
+#
+# Any workflow script, unchanged:
+#   LLM_BACKEND=fake python -m utils.tracing "Parallel Workflow/Parallel Workflow 2.py" --trace trace.json
+# ============================================================
+
+import argparse
+import json
+import os
+import runpy
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.tracers.context import register_configure_hook
+
+_active_tracer: ContextVar[Optional["GraphTracer"]] = ContextVar("graph_tracer", default=None)
+register_configure_hook(_active_tracer, inheritable=True)
+
+
+def state_bytes(value: Any) -> int:
+    try:
+        return len(json.dumps(value, default=str))
+    except (TypeError, ValueError):
+        return 0
+
+
+def _step(tags: Optional[List[str]], prefix: str) -> Optional[int]:
+    for tag in tags or []:
+        if tag.startswith(prefix):
+            return int(tag[len(prefix):])
+    return None
+
+
+class GraphTracer(BaseCallbackHandler):
+    '''
+    Callback handler recording node / router / LLM spans of LangGraph runs.
+    '''
+
+    # Called on the thread running the node, also for async runs
+    run_inline = True
+
+    def __init__(self):
+        self.t0 = time.perf_counter()
+        self.lock = threading.Lock()
+        self.open: Dict[Any, dict] = {}
+        self.parents: Dict[Any, Any] = {}
+        self.kinds: Dict[Any, str] = {}
+        self.node_spans: Dict[Any, dict] = {}
+        self.spans: List[dict] = []
+        self.free_lanes: List[int] = []
+        self.lanes = 0
+
+    # --- bookkeeping -------------------------------------------------------
+
+    def _node_of(self, run_id) -> Optional[Any]:
+        while run_id is not None and self.kinds.get(run_id) != "node":
+            run_id = self.parents.get(run_id)
+        return run_id
+
+    def _root_of(self, run_id) -> Any:
+        while self.parents.get(run_id) is not None:
+            run_id = self.parents[run_id]
+        return run_id
+
+    def _lane(self) -> int:
+        if self.free_lanes:
+            self.free_lanes.sort()
+            return self.free_lanes.pop(0)
+        self.lanes += 1
+        return self.lanes - 1
+
+    def _start(self, run_id, parent_run_id, kind: str, name: str, data: Any = None, node_name: str = None):
+        with self.lock:
+            self.parents[run_id] = parent_run_id
+            self.kinds[run_id] = kind
+            if kind == "other":
+                return
+            node = run_id if kind == "node" else self._node_of(parent_run_id)
+            lane = self._lane() if kind in ("node", "graph") else self.open.get(node, {}).get("lane", 0)
+            self.open[run_id] = {
+                "kind": kind, "name": name, "node": node_name, "node_run": node, "root": self._root_of(run_id),
+                "lane": lane, "start": time.perf_counter(), "thread": threading.get_ident(),
+                "cpu": time.thread_time(), "bytes_in": state_bytes(data) if kind == "node" else None,
+            }
+
+    def _end(self, run_id, output: Any = None, error: Optional[BaseException] = None):
+        end, cpu = time.perf_counter(), time.thread_time()
+        with self.lock:
+            span = self.open.pop(run_id, None)
+            if span is None:
+                return
+            span["end"] = end
+            span["cpu"] = cpu - span["cpu"] if span["thread"] == threading.get_ident() else None
+            if error is not None:
+                span["error"] = f"{type(error).__name__}: {error}"
+            if span["kind"] in ("node", "graph"):
+                self.free_lanes.append(span["lane"])
+            if span["kind"] == "node":
+                span["bytes_out"] = state_bytes(output)
+                span["llm"] = span.get("llm", 0.0)
+                self.node_spans[run_id] = span
+            elif span["kind"] == "router":
+                span["branch"] = output if isinstance(output, str) else json.dumps(output, default=str)
+            elif span["kind"] == "llm" and span["node_run"] is not None:
+                # An LLM call may outlive its node (background streaming); attribute it anyway
+                owner = self.node_spans.get(span["node_run"]) or self.open.get(span["node_run"])
+                if owner is not None:
+                    owner["llm"] = owner.get("llm", 0.0) + end - span["start"]
+            self.spans.append(span)
+
+    # --- LangChain callbacks -------------------------------------------------
+
+    def on_chain_start(self, serialized, inputs, *, run_id, parent_run_id=None, tags=None, metadata=None, **kwargs):
+        name = kwargs.get("name") or (serialized or {}).get("name", "chain")
+        node = (metadata or {}).get("langgraph_node")
+        if node is None and parent_run_id not in self.kinds:
+            kind = "graph"
+        elif node == name and _step(tags, "graph:step:") is not None:
+            kind = "node"
+        elif self.kinds.get(parent_run_id) == "node" and (_step(tags, "seq:step:") or 0) >= 2:
+            kind = "router"
+        else:
+            kind = "other"
+        self._start(run_id, parent_run_id, kind, name, inputs, node)
+
+    def on_chain_end(self, outputs, *, run_id, **kwargs):
+        self._end(run_id, outputs)
+
+    def on_chain_error(self, error, *, run_id, **kwargs):
+        self._end(run_id, error=error)
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, parent_run_id=None, metadata=None, **kwargs):
+        model = (metadata or {}).get("ls_model_name") or kwargs.get("name") or "llm"
+        self._start(run_id, parent_run_id, "llm", model, node_name=(metadata or {}).get("langgraph_node"))
+
+    def on_llm_start(self, serialized, prompts, *, run_id, parent_run_id=None, metadata=None, **kwargs):
+        self.on_chat_model_start(serialized, prompts, run_id=run_id, parent_run_id=parent_run_id,
+                                 metadata=metadata, **kwargs)
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        self._end(run_id)
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        self._end(run_id, error=error)
+
+    # --- reports -----------------------------------------------------------
+
+    def _closed(self) -> List[dict]:
+        with self.lock:
+            return list(self.spans)
+
+    def summary_rows(self) -> List[dict]:
+        '''
+        One row per (kind, name): calls, wall / CPU / LLM / local seconds, state sizes, branches.
+        '''
+        groups = defaultdict(list)
+        for span in self._closed():
+            if span["kind"] != "graph":
+                groups[(span["kind"], span["name"])].append(span)
+        rows = []
+        for (kind, name), spans in groups.items():
+            wall = sum(s["end"] - s["start"] for s in spans)
+            cpu = sum(s["cpu"] or 0.0 for s in spans)
+            llm = sum(s.get("llm", 0.0) for s in spans) if kind == "node" else 0.0
+            row = {"kind": kind, "name": name, "calls": len(spans), "wall_s": wall, "mean_ms": 1000 * wall / len(spans),
+                   "cpu_s": cpu, "llm_s": llm, "local_s": max(0.0, wall - llm) if kind == "node" else None,
+                   "errors": sum("error" in s for s in spans)}
+            if kind == "node":
+                row["in_bytes"] = sum(s["bytes_in"] for s in spans) // len(spans)
+                row["out_bytes"] = sum(s["bytes_out"] for s in spans) // len(spans)
+            if kind == "router":
+                row["branches"] = dict(Counter(s.get("branch") for s in spans))
+            rows.append(row)
+        return sorted(rows, key=lambda r: (r["kind"] != "node", -r["wall_s"]))
+
+    def overlap(self) -> List[dict]:
+        '''
+        Per graph run: wall time, summed node time, their ratio and the max concurrent nodes.
+        '''
+        spans = self._closed()
+        by_root = defaultdict(list)
+        for span in spans:
+            if span["kind"] == "node":
+                by_root[span["root"]].append(span)
+        runs = []
+        for span in spans:
+            if span["kind"] != "graph":
+                continue
+            nodes = by_root.get(span["root"], [])
+            wall = span["end"] - span["start"]
+            edges = sorted([(n["start"], 1) for n in nodes] + [(n["end"], -1) for n in nodes])
+            active = peak = 0
+            for _, delta in edges:
+                active += delta
+                peak = max(peak, active)
+            node_time = sum(n["end"] - n["start"] for n in nodes)
+            runs.append({"name": span["name"], "wall_s": round(wall, 4), "node_s": round(node_time, 4),
+                         "parallelism": round(node_time / wall, 2) if wall else 0.0, "max_concurrent_nodes": peak})
+        return runs
+
+    def summary(self) -> str:
+        lines = [f"{'kind':<7} {'name':<28} {'calls':>5} {'wall s':>8} {'mean ms':>8} {'cpu s':>7} "
+                 f"{'llm s':>7} {'local s':>8} {'in B':>7} {'out B':>7}  branches"]
+        lines.append("-" * len(lines[0]))
+        for r in self.summary_rows():
+            local = f"{r['local_s']:>8.3f}" if r["local_s"] is not None else f"{'':>8}"
+            sizes = f"{r.get('in_bytes', ''):>7} {r.get('out_bytes', ''):>7}"
+            llm = f"{r['llm_s']:>7.3f}" if r["kind"] == "node" else f"{'':>7}"
+            lines.append(f"{r['kind']:<7} {r['name'][:28]:<28} {r['calls']:>5} {r['wall_s']:>8.3f} {r['mean_ms']:>8.1f} "
+                         f"{r['cpu_s']:>7.3f} {llm} {local} {sizes}  {r.get('branches', '')}")
+        for run in self.overlap():
+            lines.append(f"graph run: wall {run['wall_s']:.3f}s · node time {run['node_s']:.3f}s · "
+                         f"parallelism {run['parallelism']:.2f} · max {run['max_concurrent_nodes']} nodes at once")
+        return "\n".join(lines)
+
+    def chrome_trace(self) -> dict:
+        '''
+        Chrome trace / Perfetto JSON (complete "X" events, one lane per concurrent node).
+        '''
+        events = [{"ph": "M", "name": "process_name", "pid": 1, "args": {"name": "LangGraph"}}]
+        lanes = set()
+        for span in self._closed():
+            args = {"cpu_ms": round(1000 * span["cpu"], 3) if span["cpu"] is not None else None}
+            if span["kind"] == "node":
+                args.update(llm_ms=round(1000 * span.get("llm", 0.0), 3), bytes_in=span["bytes_in"],
+                            bytes_out=span["bytes_out"])
+            if "branch" in span:
+                args["branch"] = span["branch"]
+            if span.get("node"):
+                args["node"] = span["node"]
+            if "error" in span:
+                args["error"] = span["error"]
+            lanes.add(span["lane"])
+            events.append({"ph": "X", "name": span["name"], "cat": span["kind"], "pid": 1, "tid": span["lane"],
+                           "ts": round(1e6 * (span["start"] - self.t0), 1),
+                           "dur": round(1e6 * (span["end"] - span["start"]), 1), "args": args})
+        events += [{"ph": "M", "name": "thread_name", "pid": 1, "tid": lane, "args": {"name": f"lane {lane}"}}
+                   for lane in sorted(lanes)]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def export_chrome(self, path: str):
+        with open(path, "w") as f:
+            json.dump(self.chrome_trace(), f)
+
+
+@contextmanager
+def tracing(tracer: Optional[GraphTracer] = None):
+    '''
+    Traces every LangGraph / LangChain run started inside the block.
+    '''
+    tracer = tracer or GraphTracer()
+    token = _active_tracer.set(tracer)
+    try:
+        yield tracer
+    finally:
+        _active_tracer.reset(token)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run a workflow script with per-node tracing")
+    parser.add_argument("script", help="path to any workflow script")
+    parser.add_argument("--trace", default="trace.json", help="Chrome trace / Perfetto JSON output")
+    args = parser.parse_args()
+
+    with tracing() as tracer:
+        try:
+            runpy.run_path(args.script, run_name="__main__")
+        finally:
+            tracer.export_chrome(args.trace)
+            print("\n" + tracer.summary())
+            print(f"\ntrace written to {os.path.abspath(args.trace)}")